@@ -1,4 +1,8 @@
-from functions import uploadImage, showCopyrightClaim, showErrorMessage, loadProfileImage
+from functions import uploadImage, showCopyrightClaim, showErrorMessage, loadProfileImage, clearEntries
+from marks_store import SUBJECTS
+import services
+from virtual_list import VirtualList
+from background_loader import BackgroundLoader
 import json
 from tkinter import messagebox, Toplevel
 
@@ -19,24 +23,38 @@ class AdminAccount:
         account_frame (CTkFrame): Frame that holds account-specific widgets.
         profile_frame (CTkFrame): Frame for displaying the profile picture.
         profile_picture_label (CTkLabel): Label for the profile picture.
+        profile_loading (PendingPhoto): The profile picture being decoded, or None.
         upload_button (CTkButton): Button to upload a profile picture.
         create_class (CTkButton): Button to create a new class.
         create_teacher(CTkButton): Button to create new teacher.
         back_button (CTkButton): Button to navigate back to the main menu.
         classes (CTkButton): Button to display each class.
+        loading_label (CTkLabel): Placeholder shown while the classes load.
+        class_loader (BackgroundLoader): Reads the classes and adds their buttons.
 
     Methods:
         __init__(self, master, ctk, button_font): Initializes the AdminAccount class and sets up the GUI elements.
         backToMain(self): Destroys the current main frame and returns to the main menu.
         loadProfileImage(self): Loads the profile image from 'admin_id.json' if it exists.
-        showExistingClasses(self): Displays existing classes from 'classes.json'.
+        showExistingClasses(self): Displays existing classes from 'classes.json', loading them in the background.
+        onClassesError(self, error): Reports a failure to read the classes.
         addClassButton(self, class_name): Adds a button for each class in the main frame.
         createClass(self): Opens a new window to create a class and saves it to 'classes.json'.
+        buildCreateClassWindow(self, window): Creates the widgets of the create class window.
+        importStudents(self, path=None, skip_invalid=False): Imports students from a CSV or JSONL file in the background.
+        showImportReport(self, path, report): Shows the outcome of an import.
+        onImportError(self, error): Reports an import that could not be read.
+        promoteStudents(self, archive_file=None, confirmed=False): Promotes every class after showing what would change.
+        showPromotionReport(self, report): Asks to confirm a dry run, or shows what a promotion did.
+        onPromotionError(self, error): Reports a promotion that could not be made.
         saveClass(self): Saves the new class to 'classes.json' and updates the GUI.
         openClass(self, c, filename='classes.json'): Opens a window to display and manage students in the selected class.
+        buildClassWindow(self, window): Creates the widgets of the class window.
         createStudent(self, class_name): Opens a window to create a new student for the selected class.
         saveStudent(self, class_name): Saves the new student to the respective class in 'classes.json'.
         createTeacherWindow(self): opens a window and takes teacher's name and id.
+        buildCreateTeacherWindow(self, window): Creates the widgets of the create teacher window.
+        resetCreateTeacherWindow(self, window): Empties the create teacher window when it is opened again.
         addToSelected(self): Adds the selected class to selected variable.
         updateDisplay(self): Updated the display to show selected class
     """
@@ -93,7 +111,7 @@ class AdminAccount:
         self.profile_picture_label.place(relx=0.05, rely=0.01)
 
         # load existing image 
-        loadProfileImage(filename="admin_id.json", label=self.profile_picture_label)
+        self.profile_loading = loadProfileImage(filename="admin_id.json", label=self.profile_picture_label)
 
 
         # Add button to upload photo
@@ -109,6 +127,16 @@ class AdminAccount:
         self.create_teacher = self.ctk.CTkButton(self.account_frame, font=self.button_font, text="Create teacher", width=150, height=35, text_color='white', command=self.createTeacherWindow)
         self.create_teacher.place(relx=0.2, rely=0.45)
 
+        # bulk import students from a file
+        self.student_import = None
+        self.import_button = self.ctk.CTkButton(self.account_frame, font=self.button_font, text="Import Students", width=150, height=35, text_color='white', command=self.importStudents)
+        self.import_button.place(relx=0.2, rely=0.55)
+
+        # end-of-year promotion of every class
+        self.promotion = None
+        self.promote_button = self.ctk.CTkButton(self.account_frame, font=self.button_font, text="Promote Students", width=150, height=35, text_color='white', command=self.promoteStudents)
+        self.promote_button.place(relx=0.2, rely=0.65)
+
 
         # back button
         self.back_button = self.ctk.CTkButton(
@@ -121,7 +149,7 @@ class AdminAccount:
             fg_color="red",  # Ensure visible color
             command=self.backToMain
         )
-        self.back_button.place(relx=0.2, rely=0.55)
+        self.back_button.place(relx=0.2, rely=0.75)
 
         # show existing classes
         self.showExistingClasses()
@@ -130,8 +158,17 @@ class AdminAccount:
 
     def backToMain(self):
         """
-        Handles the back button action. Destroys the current main frame and navigates back to the main menu.
+        Handles the back button action. Destroys the current main frame and the account's windows
+        and navigates back to the main menu.
         """
+        self.class_loader.cancel()
+        if self.student_import is not None:
+            self.student_import.cancel()
+        if self.promotion is not None:
+            self.promotion.cancel()
+        if self.profile_loading is not None:
+            self.profile_loading.cancel()
+        self.master.windows.destroyAll()
         self.main_frame.destroy()
         self.master.create_main_frame()
 
@@ -157,18 +194,37 @@ class AdminAccount:
 
     def showExistingClasses(self):
         """
-        Displays existing classes by reading from 'classes.json'.
+        Displays existing classes by reading from 'classes.json'. The file is read in a
+        background thread and the buttons are added a few at a time, with a placeholder
+        shown until the last one is in.
         """
-        try:
-            with open('classes.json', 'r') as f:
-                data = json.load(f)
-                class_list = data.get("classes", [])
-                for class_data in class_list:
-                    self.addClassButton(class_data["class"])
-        except FileNotFoundError:
+        self.loading_label = self.ctk.CTkLabel(self.main_frame, text="Loading classes...", text_color="white", font=self.button_font)
+        self.loading_label.pack(padx=10, pady=10)
+
+        self.class_loader = BackgroundLoader(
+            self.master,
+            services.classNames,
+            self.addClassButton,
+            on_done=self.loading_label.destroy,
+            on_error=self.onClassesError
+        )
+        self.class_loader.start()
+
+
+    def onClassesError(self, error):
+        """
+        Reports a failure to read the classes and removes the placeholder.
+
+        Args:
+            error (Exception): The exception raised while reading the classes.
+        """
+        self.loading_label.destroy()
+        if isinstance(error, FileNotFoundError):
             print("classes.json not found.")
-        except json.JSONDecodeError:
+        elif isinstance(error, json.JSONDecodeError):
             print("Error decoding JSON from classes.json.")
+        else:
+            raise error
 
 
 
@@ -199,14 +255,26 @@ class AdminAccount:
         self.width = 200
         self.height = 250
 
-        self.window = self.ctk.CTk()
-        self.window.resizable(False, False)
-        self.window.geometry(f"{self.width}x{self.height}")
-        self.window.title("Info")
+        self.master.windows.open(
+            "create_class",
+            self.buildCreateClassWindow,
+            refresh=lambda window: clearEntries(self.class_entry),
+            title="Info",
+            geometry=f"{self.width}x{self.height}",
+            resizable=False
+        )
+
+
+    def buildCreateClassWindow(self, window):
+        """
+        Creates the widgets of the create class window.
 
+        Args:
+            window (CTkToplevel): The window to fill.
+        """
         # labels
         self.class_name_label = self.ctk.CTkLabel(
-            self.window,
+            window,
             text="Class Name",
             text_color='white',
             font=('Arial', 10, 'bold'),
@@ -215,7 +283,7 @@ class AdminAccount:
 
         # entry
         self.class_entry = self.ctk.CTkEntry(
-            self.window,
+            window,
             width=100,
             corner_radius=2,
             placeholder_text='Enter Class (i.e. 7 or 8)',
@@ -224,7 +292,7 @@ class AdminAccount:
 
         # buttons
         self.create_btn = self.ctk.CTkButton(
-            self.window,
+            window,
             text='Create',
             text_color='white',
             width=50,
@@ -234,55 +302,58 @@ class AdminAccount:
         )
         self.create_btn.place(relx=0.5, rely=0.7, anchor='center')
 
-        self.window.mainloop()
-
 
     def createTeacherWindow(self):
         '''Takes name and id of teacher'''
         self.width = 400
         self.height = 500
-        
-        self.window = self.ctk.CTk()
-        self.window.geometry(f"{self.width}x{self.height}")
-        self.window.resizable(False, False)
-        self.window.title("Create Teacher")
-        
+
+        self.master.windows.open(
+            "create_teacher",
+            self.buildCreateTeacherWindow,
+            refresh=self.resetCreateTeacherWindow,
+            title="Create Teacher",
+            geometry=f"{self.width}x{self.height}",
+            resizable=False
+        )
+
+
+    def buildCreateTeacherWindow(self, window):
+        '''Creates the widgets of the create teacher window'''
         # labels
-        self.name_label = self.ctk.CTkLabel(self.window, text="Name:", font=self.button_font)
+        self.name_label = self.ctk.CTkLabel(window, text="Name:", font=self.button_font)
         self.name_label.place(relx=0.1, rely=0.1)
 
-        self.id_label = self.ctk.CTkLabel(self.window, text="ID No:", font=self.button_font)
+        self.id_label = self.ctk.CTkLabel(window, text="ID No:", font=self.button_font)
         self.id_label.place(relx=0.1, rely=0.2)
 
-        self.class_acces_label = self.ctk.CTkLabel(self.window, text="Access:", font=self.button_font)
+        self.class_acces_label = self.ctk.CTkLabel(window, text="Access:", font=self.button_font)
         self.class_acces_label.place(relx=0.1, rely=0.3)
 
-        self.label_selected_cls = self.ctk.CTkLabel(self.window, text="Selected:", font=self.button_font)
+        self.label_selected_cls = self.ctk.CTkLabel(window, text="Selected:", font=self.button_font)
         self.label_selected_cls.place(relx=0.1, rely=0.4)
 
-        self.salary_label = self.ctk.CTkLabel(self.window, text="Salary", font=self.button_font)
+        self.salary_label = self.ctk.CTkLabel(window, text="Salary", font=self.button_font)
         self.salary_label.place(relx=0.1, rely=0.5)
 
         # entry
-        self.name_entry = self.ctk.CTkEntry(self.window, width=200, corner_radius=4, placeholder_text="Enter name")
+        self.name_entry = self.ctk.CTkEntry(window, width=200, corner_radius=4, placeholder_text="Enter name")
         self.name_entry.place(relx=0.3, rely=0.1)
         # self.teacher_name = self.name_entry.get()
 
-        self.id_entry = self.ctk.CTkEntry(self.window, width=200, corner_radius=4, placeholder_text="Enter ID no.")
+        self.id_entry = self.ctk.CTkEntry(window, width=200, corner_radius=4, placeholder_text="Enter ID no.")
         self.id_entry.place(relx=0.3, rely=0.2)
         # self.teacher_id = self.id_entry.get()
 
-        self.salary_entry = self.ctk.CTkEntry(self.window, width=200, corner_radius=4, placeholder_text="Enter Salary amount")
+        self.salary_entry = self.ctk.CTkEntry(window, width=200, corner_radius=4, placeholder_text="Enter Salary amount")
         self.salary_entry.place(relx=0.3, rely=0.5)
 
         # available class 
-        with open("classes.json", 'r') as f:
-            data = json.load(f)
-        options = [class_name['class'] for class_name in data["classes"]]
+        options = services.classNames()
 
         #dropdown menu
         self.class_access = self.ctk.CTkComboBox(
-            self.window,
+            window,
             width=140,
             height=28,
             corner_radius=4,
@@ -298,7 +369,7 @@ class AdminAccount:
 
         # add button to store selected classes 
         self.add_btn = self.ctk.CTkButton(
-            self.window,
+            window,
             width=50,
             height=35,
             text="Add",
@@ -309,7 +380,7 @@ class AdminAccount:
 
         # Create a CTkTextbox widget (text field) for displaying selected options
         self.display = self.ctk.CTkTextbox(
-            self.window,
+            window,
             width=200,
             height=20,
             corner_radius=5,
@@ -321,14 +392,23 @@ class AdminAccount:
         self.display.place(relx=0.3, rely=0.4)
 
         # button
-        self.create_button = self.ctk.CTkButton(self.window, text="Create teacher", text_color="white", width=50, height=35, font=self.button_font, command=self.createTeacher)
+        self.create_button = self.ctk.CTkButton(window, text="Create teacher", text_color="white", width=50, height=35, font=self.button_font, command=self.createTeacher)
         self.create_button.place(relx=0.35, rely=0.7)
 
         #upload profile img
-        self.profile_img = self.ctk.CTkEntry(self.window,  width=200, corner_radius=4, placeholder_text="pic path")
+        self.profile_img = self.ctk.CTkEntry(window,  width=200, corner_radius=4, placeholder_text="pic path")
         self.profile_img.place(relx=0.3, rely=0.6)
 
-        self.window.mainloop()
+
+    def resetCreateTeacherWindow(self, window):
+        '''Empties the create teacher window and reloads the classes it offers'''
+        clearEntries(self.name_entry, self.id_entry, self.salary_entry, self.profile_img)
+        self.class_access.configure(values=services.classNames())
+        self.class_access.set("Select Classes")
+        self.selected.clear()
+        self.display.configure(state="normal")
+        self.display.delete("1.0", self.ctk.END)
+        self.display.configure(state="disabled")
 
 
     # Function to update the text field with selected options
@@ -356,72 +436,154 @@ class AdminAccount:
     
     def createTeacher(self):
         '''Opens a new window to create new teahcer and saves to teacher.json'''
-        filename = 'teachers.json'
-        teacher_id = self.id_entry.get()
-        teacher_name = self.name_entry.get()
-        teacher_salary = self.salary_entry.get()
-
-        if teacher_id and teacher_name:
-            try:
-                with open(filename, 'r') as f:
-                    data = json.load(f)
-            except FileNotFoundError:
-                data = {"teachers": []}
-            
-            id_exists = any(ids["id"] == teacher_id for ids in data["teachers"])
-
-            if not id_exists:
-                new_teachers = {
-                    "Name": teacher_name,
-                    "id": teacher_id,
-                    "accessed class": self.selected,
-                    "Salary": teacher_salary
-                }
-                data["teachers"].append(new_teachers)
-
-                with open("teachers.json", "w") as f:
-                    json.dump(data, f, indent=4)
-
-                self.window.destroy()
-                self.selected.clear()
-            else:
-                showErrorMessage("Teacher already exists!")
-                self.selected.clear()
+        try:
+            services.createTeacher(
+                name=self.name_entry.get(),
+                teacher_id=self.id_entry.get(),
+                accessed_class=self.selected,
+                salary=self.salary_entry.get()
+            )
+            self.master.windows.close("create_teacher")
+        except ValueError as e:
+            showErrorMessage(f"{e}")
+        self.selected.clear()
     
+    def importStudents(self, path=None, skip_invalid=False):
+        """
+        Asks for a CSV or JSONL file of students and adds them all in one batch. The file is
+        read and checked in a background thread; the outcome is shown when it is done.
+
+        Args:
+            path (str): The file to import; asked for if not given.
+            skip_invalid (bool): Save the valid rows even if some rows are bad.
+        """
+        if path is None:
+            from tkinter import filedialog
+            path = filedialog.askopenfilename(filetypes=[("Student lists", "*.csv *.jsonl")])
+            if not path:
+                return
+
+        self.import_button.configure(state="disabled", text="Importing...")
+        self.student_import = BackgroundLoader(
+            self.master,
+            lambda: [services.importStudents(path, skip_invalid=skip_invalid)],
+            lambda report: self.showImportReport(path, report),
+            on_error=self.onImportError
+        )
+        self.student_import.start()
+
+
+    def showImportReport(self, path, report):
+        """
+        Shows what an import did. If bad rows stopped it, lists the first of them and offers
+        to import the valid rows without them.
+
+        Args:
+            path (str): The imported file.
+            report (ImportReport): The outcome of the import.
+        """
+        self.import_button.configure(state="normal", text="Import Students")
+        message = report.summary()
+        if report.errors:
+            message += "\n\n" + "\n".join(f"Line {line}: {error}" for line, error in report.errors[:10])
+            if report.error_count > 10:
+                message += f"\n... and {report.error_count - 10} more"
+
+        if report.saved or not report.error_count:
+            messagebox.showinfo("Import", message)
+        elif report.rows > report.error_count and messagebox.askyesno("Import", message + "\n\nImport the valid rows and skip the rest?"):
+            self.importStudents(path, skip_invalid=True)
+        elif report.rows == report.error_count:
+            messagebox.showerror("Import", message)
+
+
+    def onImportError(self, error):
+        self.import_button.configure(state="normal", text="Import Students")
+        if isinstance(error, (ValueError, FileNotFoundError)):
+            messagebox.showerror("Import", f"{error}")
+        else:
+            raise error
+
+
+    def promoteStudents(self, archive_file=None, confirmed=False):
+        """
+        Promotes every class to the next year in the background. The first call only works
+        out what would change and shows it; the promotion is saved once that is confirmed.
+
+        Args:
+            archive_file (str): New file to keep this year's marks and results in, or None.
+            confirmed (bool): Save the promotion instead of doing a dry run.
+        """
+        self.promote_button.configure(state="disabled", text="Promoting..." if confirmed else "Checking...")
+        self.promotion = BackgroundLoader(
+            self.master,
+            lambda: [services.promoteStudents(dry_run=not confirmed, archive_file=archive_file)],
+            self.showPromotionReport,
+            on_error=self.onPromotionError
+        )
+        self.promotion.start()
+
+
+    def showPromotionReport(self, report):
+        """
+        After a dry run, lists the changes per class and asks where to archive the marks
+        before promoting; after the promotion, shows what was done.
+
+        Args:
+            report (PromotionReport): The outcome of the promotion or dry run.
+        """
+        self.promote_button.configure(state="normal", text="Promote Students")
+        message = "\n".join(
+            f"Class {class_name}: {counts['promoted']} up, {counts['repeated']} repeating, "
+            f"{counts['graduated']} graduating, {counts['students']} students next year"
+            for class_name, counts in report.per_class.items()
+        )
+        if report.saved:
+            messagebox.showinfo("Promote Students", report.summary())
+            if self.master.windows.isOpen("class"):
+                self.openClass(self.open_class)
+            return
+        if not report.per_class:
+            messagebox.showinfo("Promote Students", "There are no classes to promote")
+            return
+        if not messagebox.askyesno("Promote Students", message + "\n\nPromote now? Rolls are renumbered and marks reset to 0."):
+            return
+
+        from tkinter import filedialog
+        archive_file = filedialog.asksaveasfilename(
+            title="Keep this year's marks in", defaultextension=".jsonl", filetypes=[("Marks archive", "*.jsonl")]
+        )
+        if not archive_file:
+            return
+        self.promoteStudents(archive_file, confirmed=True)
+
+
+    def onPromotionError(self, error):
+        self.promote_button.configure(state="normal", text="Promote Students")
+        if isinstance(error, (ValueError, FileNotFoundError)):
+            messagebox.showerror("Promote Students", f"{error}")
+        else:
+            raise error
+
+
     def saveClass(self):
         """
         Saves the new class to 'classes.json' and updates the GUI.
         """
-        class_name = self.class_entry.get()
-        if class_name:
-            try:
-                with open('classes.json', 'r') as f:
-                    data = json.load(f)
-            except FileNotFoundError:
-                data = {"classes": []}
-            
-            class_exists = any(cls["class"] == class_name for cls in data["classes"])
-
-            if not class_exists:
-                new_class = {
-                    "class": class_name,
-                    "students": []
-                }
-                data["classes"].append(new_class)
-                
-                with open('classes.json', 'w') as f:
-                    json.dump(data, f, indent=4)
-
-                self.addClassButton(class_name)
-                self.window.destroy() #destroys create class window
+        try:
+            class_name = services.createClass(self.class_entry.get())
+        except ValueError as e:
+            messagebox.showerror("Error", f"{e}")
+            return
 
-            else:
-                messagebox.showerror("Error", "Class already exists")
+        self.addClassButton(class_name)
+        self.master.windows.close("create_class") #hides create class window
                 
 
     def openClass(self, c, filename='classes.json'):
         """
-        Opens a window to display and manage students in the selected class.
+        Opens a window to display and manage students in the selected class. The window is
+        built once and shows whichever class was opened last.
 
         Args:
             c (str): The name of the class.
@@ -429,52 +591,24 @@ class AdminAccount:
         """
         self.width = 1200
         self.height = 750
-
-        self.window = self.ctk.CTk()
-        self.window.resizable(False, False)
-        self.window.geometry(f"{self.width}x{self.height}")
-        self.window.title(f"Class : {c}")
-
-        # Display copyright claim
-        showCopyrightClaim(self.ctk, self.window)
-
-        self.display_frame = self.ctk.CTkScrollableFrame(
-            self.window,
-            width=1000,
-            height=600,
-            border_width=2,
-            border_color="white",
-            orientation='vertical'
+        self.open_class = c
+
+        self.master.windows.open(
+            "class",
+            self.buildClassWindow,
+            title=f"Class : {c}",
+            geometry=f"{self.width}x{self.height}",
+            resizable=False
         )
-        self.display_frame.place(relx=0.5, rely=0.5, anchor='center')
 
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-
-            class_data = None
-            for cls in data['classes']:
-                if cls['class'] == c:
-                    class_data = cls
-                    break
-            
+            class_data = services.getClass(c)
             if not class_data:
+                self.display_frame.setItems([])
                 raise ValueError("Class not found")
 
-            for student in class_data["students"]:
-                student_info = f"{student['Name']}      Roll: {student['Roll']}"
-                show_student = self.ctk.CTkButton(
-                    self.display_frame,
-                    width=950,
-                    height=50,
-                    text=student_info,
-                    font=self.button_font,
-                    fg_color='black',
-                    border_width=2,
-                    border_color='white'
-                )
-                show_student.pack(padx=10, pady=10)
-                                        
+            self.display_frame.setItems(class_data.students)
+
         except FileNotFoundError:
             messagebox.showerror("Error", "classes.json not found.")
         except json.JSONDecodeError:
@@ -482,42 +616,40 @@ class AdminAccount:
         except KeyError as e:
             messagebox.showerror("Error", f"Missing key in JSON data: {e}")
 
+
+    def buildClassWindow(self, window):
+        """
+        Creates the widgets of the class window: the student list and the create student button.
+
+        Args:
+            window (CTkToplevel): The window to fill.
+        """
+        # Display copyright claim
+        showCopyrightClaim(self.ctk, window)
+
+        # only the rows in view exist; they are reused as the list scrolls
+        self.display_frame = VirtualList(
+            window,
+            self.ctk,
+            [],
+            lambda student: f"{student.name}      Roll: {student.roll}",
+            self.button_font,
+            width=1000,
+            height=600
+        )
+        self.display_frame.place(relx=0.5, rely=0.5, anchor='center')
+
         # Add students button
         self.create_student = self.ctk.CTkButton(
-            self.window,
+            window,
             text="Create Student",
             font=self.button_font,
             width=50,
             height=25,
-            command=lambda: self.createStudent(class_name=c)
+            command=lambda: self.createStudent(class_name=self.open_class)
         )
         self.create_student.pack(side='bottom', pady=10)
 
-        # back button
-        # self.back_button = self.ctk.CTkButton(
-        #     self.window,
-        #     text="Back",
-        #     text_color="white",
-        #     font=self.button_font,
-        #     width=150,
-        #     height=35,
-        #     fg_color="red",  # Ensure visible color
-        #     command=backToAccountFrame
-        # )
-        # self.back_button.pack(side="bottom", pady=10, padx=10)
-
-        # @staticmethod
-        # def backToAccountFrame():
-        #     self.window.destroy()
-        #     self.main_frame()
-        # Bind the closing event to the on_closing function
-        self.window.protocol("WM_DELETE_WINDOW", self.onClosing)
-        self.window.mainloop()
-
-    def onClosing(self):
-        self.display_frame.destroy()
-        self.window.destroy()
-
 
     def createStudent(self, class_name):
         """
@@ -564,20 +696,8 @@ class AdminAccount:
         self.student_guardian_entry = self.ctk.CTkEntry(self.student_window)
         self.student_guardian_entry.grid(row=6, column=1)
 
-        subjects = [
-            "Bangla",
-            "English",
-            "Math",
-            "Science",
-            "Life and Livelihood",
-            "Digital Technology",
-            "History and Social Science",
-            "Religion",
-            "Wellbeing",
-            "Arts and Culture"
-        ]
         self.marks_entries = {}
-        for i, subject in enumerate(subjects, start=1):
+        for i, subject in enumerate(SUBJECTS, start=1):
             label = self.ctk.CTkLabel(self.student_window, text=f"{subject} Marks", text_color='black')
             label.grid(row=6+i, column=0)
             entry = self.ctk.CTkEntry(self.student_window)
@@ -599,30 +719,18 @@ class AdminAccount:
         Args:
             class_name (str): The name of the class to which the student will be added.
         """
-        student_data = {
-            "Name": self.student_name_entry.get(),
-            "ID": self.student_id_entry.get(),
-            "Roll": self.student_roll_entry.get(),
-            "Marks": {subject: int(entry.get()) for subject, entry in self.marks_entries.items()},
-            "OtherInfo": {
-                "Age": int(self.student_age_entry.get()),
-                "Address": self.student_address_entry.get(),
-                "Phone Number": self.student_phone_number_entry.get(),
-                "Guardian": self.student_guardian_entry.get(),
-            }
-        }
-
         try:
-            with open('classes.json', 'r') as f:
-                data = json.load(f)
-
-            for cls in data["classes"]:
-                if cls["class"] == class_name:
-                    cls["students"].append(student_data)
-                    break
-
-            with open('classes.json', 'w') as f:
-                json.dump(data, f, indent=4)
+            student_data = services.makeStudent(
+                name=self.student_name_entry.get(),
+                student_id=self.student_id_entry.get(),
+                roll=self.student_roll_entry.get(),
+                marks={subject: entry.get() for subject, entry in self.marks_entries.items()},
+                age=self.student_age_entry.get(),
+                address=self.student_address_entry.get(),
+                phone=self.student_phone_number_entry.get(),
+                guardian=self.student_guardian_entry.get()
+            )
+            services.addStudent(class_name, student_data)
 
             self.student_window.destroy()
 
@@ -630,6 +738,8 @@ class AdminAccount:
             messagebox.showerror("Error", "classes.json not found.")
         except json.JSONDecodeError:
             messagebox.showerror("Error", "Error decoding JSON from classes.json.")
+        except ValueError as e:
+            messagebox.showerror("Error", f"{e}", parent=self.student_window)
 
 
 
@@ -1,13 +1,13 @@
 from functions import showCopyrightClaim, showErrorMessage, showInfo
-from json import load
-from admin_account import AdminAccount
+import services
+from screen_manager import Screen
 
 
-class AdminLogin:
+class AdminLogin(Screen):
     '''
     The AdminLogin class handles the creation and management of the admin login interface.
     It provides functionalities for admins to log in by entering their ID and has a button
-    to navigate back to the main menu.
+    to navigate back to the main menu. The App's ScreenManager shows and hides it.
 
     Attributes:
         master (tk.Tk): The main window or parent widget.
@@ -22,8 +22,8 @@ class AdminLogin:
 
     Methods:
         __init__(self, master, ctk, buttonFont): Initializes the AdminLogin class and sets up the GUI elements.
-        backToMain(self): Destroys the current login frame and returns to the main menu.
-        openAdminAccount(self): Destroys the current login frame and opens the admin account interface.
+        backToMain(self): Hides the login frame and returns to the main menu.
+        openAdminAccount(self): Hides the login frame and opens the admin account interface.
         authenticateAdminLogin(self): Authenticates the admin login by checking the ID against stored data.
     '''
     def __init__(self, master, ctk, buttonFont):
@@ -41,7 +41,6 @@ class AdminLogin:
 
         # create login frame
         self.login_frame = self.ctk.CTkFrame(self.master, width=800, height=500, border_width=2, border_color="white")
-        self.login_frame.place(relx=0.5, rely=0.5, anchor="center")
 
         # copyright claim 
         showCopyrightClaim(self.ctk, self.login_frame)
@@ -105,19 +104,21 @@ class AdminLogin:
         )
         self.login_button.place(relx=0.6, rely=0.6)
 
+        super().__init__(self.login_frame, (self.id_entry,))
 
     def backToMain(self):
         '''
-        Handles the back button action. Destroys the current login frame and navigates back to the main menu.
+        Handles the back button action. Hides the login frame and navigates back to the main menu.
         '''
-        self.login_frame.destroy()
         self.master.create_main_frame()
 
     def openAdminAccount(self):
         '''
-        Opens the admin account interface by destroying the current login frame and initializing the AdminAccount class.
+        Opens the admin account interface by hiding the login frame and initializing the AdminAccount class.
         '''
-        self.login_frame.destroy()
+        from admin_account import AdminAccount
+
+        self.master.screens.hideCurrent()
         AdminAccount(self.master, self.ctk, self.button_font)
 
     def authenticateAdminLogin(self):
@@ -127,17 +128,14 @@ class AdminLogin:
         If the ID matches, a success message is shown and the admin account interface is opened.
         If the ID does not match or the file does not exist, an error message is shown.
         '''
-        data_file = 'admin_id.json'
         id_no = self.id_entry.get()
 
         try:
-            with open(data_file) as f:
-                data = load(f)
-                if id_no != data.get("admin_id"):
-                    showErrorMessage(message="Login status: failed!.\nFatal error: unknown!\nId number incorrect!")
-                else:
-                    showInfo("Logged in successfully!")
-                    self.openAdminAccount()
+            if not services.checkAdminId(id_no):
+                showErrorMessage(message="Login status: failed!.\nFatal error: unknown!\nId number incorrect!")
+            else:
+                showInfo("Logged in successfully!")
+                self.openAdminAccount()
         except FileNotFoundError:
             showErrorMessage(message="File doesn't exist")
 
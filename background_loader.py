@@ -0,0 +1,102 @@
+import queue
+import threading
+import time
+
+
+class BackgroundLoader:
+    '''
+    Runs a slow load (parsing classes.json, building indexes) in a worker thread and hands
+    its items to the Tk thread a few at a time.
+
+    Tk widgets may only be touched from the thread running the mainloop, so the worker
+    only puts its result on a queue. The Tk side polls the queue with after() and, once the
+    items arrive, calls add_item for a chunk of them per event loop turn. A chunk stops
+    early when it has used its time budget, so the window keeps redrawing and answering
+    clicks however many items there are.
+
+    Attributes:
+        widget (tk.Misc): Widget whose after() schedules the polling; the App window is safest.
+        load (callable): Runs in the worker thread and returns a list of items.
+        add_item (callable): Called on the Tk thread with each item, in order.
+        on_done (callable): Called on the Tk thread after the last item, or None.
+        on_error (callable): Called on the Tk thread with the exception load raised, or None.
+        chunk_size (int): Most items added per event loop turn.
+        budget (float): Seconds a chunk may take before yielding to the event loop.
+        poll_interval (int): Milliseconds between checks of the queue while load runs.
+        done (bool): True once every item has been added, load failed or the loader was cancelled.
+
+    Methods:
+        start(self): Starts the worker and the polling.
+        cancel(self): Stops adding items; the worker's result is dropped.
+    '''
+
+    def __init__(self, widget, load, add_item, on_done=None, on_error=None, chunk_size=20, budget=0.008, poll_interval=16):
+        self.widget = widget
+        self.load = load
+        self.add_item = add_item
+        self.on_done = on_done
+        self.on_error = on_error
+        self.chunk_size = chunk_size
+        self.budget = budget
+        self.poll_interval = poll_interval
+        self.done = False
+        self._results = queue.Queue()
+        self._items = None
+        self._position = 0
+        self._after_id = None
+
+    def start(self):
+        worker = threading.Thread(target=self._work, name="BackgroundLoader", daemon=True)
+        worker.start()
+        self._schedule(self.poll_interval)
+
+    def cancel(self):
+        self.done = True
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _work(self):
+        try:
+            self._results.put((list(self.load()), None))
+        except Exception as e:
+            self._results.put((None, e))
+
+    def _schedule(self, delay):
+        self._after_id = self.widget.after(delay, self._poll)
+
+    def _poll(self):
+        self._after_id = None
+        if self.done:
+            return
+        if self._items is None:
+            try:
+                items, error = self._results.get_nowait()
+            except queue.Empty:
+                self._schedule(self.poll_interval)
+                return
+            if error is not None:
+                self.done = True
+                if self.on_error is not None:
+                    self.on_error(error)
+                return
+            self._items = items
+
+        self._addChunk()
+        if self._position < len(self._items):
+            # let Tk redraw and handle input before the next chunk
+            self._schedule(1)
+        else:
+            self.done = True
+            if self.on_done is not None:
+                self.on_done()
+
+    def _addChunk(self):
+        deadline = time.perf_counter() + self.budget
+        end = min(len(self._items), self._position + self.chunk_size)
+        while self._position < end:
+            item = self._items[self._position]
+            self._position += 1
+            self.add_item(item)
+            if time.perf_counter() >= deadline:
+                break
@@ -0,0 +1,83 @@
+'''
+Time to open a class window's student list and the number of widgets it creates: one
+CTkButton per student packed into a CTkScrollableFrame (as openClass used to do)
+against VirtualList.
+
+Needs a display. Run from the project root:
+    python -m benchmarks.bench_class_list --students 100 2000 10000
+'''
+import argparse
+import time
+import tkinter
+
+import customtkinter as ctk
+
+from records import Student
+from virtual_list import VirtualList
+
+
+FONT = ("Arial", 20)
+
+
+def rowText(student):
+    return f"{student.name}      Roll: {student.roll}"
+
+
+def packedButtons(window, students):
+    frame = ctk.CTkScrollableFrame(window, width=1000, height=600, border_width=2, border_color="white", orientation='vertical')
+    frame.place(relx=0.5, rely=0.5, anchor='center')
+    for student in students:
+        ctk.CTkButton(frame, width=950, height=50, text=rowText(student), font=FONT, fg_color='black',
+                      border_width=2, border_color='white').pack(padx=10, pady=10)
+    return frame
+
+
+def virtualList(window, students):
+    frame = VirtualList(window, ctk, students, rowText, FONT, width=1000, height=600)
+    frame.place(relx=0.5, rely=0.5, anchor='center')
+    return frame
+
+
+def widgetCount(widget):
+    return 1 + sum(widgetCount(child) for child in widget.winfo_children())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, nargs="+", default=[100, 2000])
+    args = parser.parse_args()
+
+    try:
+        window = ctk.CTk()
+    except tkinter.TclError as e:
+        print(f"No display to open a window on: {e}")
+        return
+    window.geometry("1200x750")
+
+    print(f"{'students':>8} {'method':<16} {'open':>8} {'widgets':>8} {'scroll to end':>14}")
+    for count in args.students:
+        students = [Student(f"Student {i}", f"{i:06d}", str(i + 1)) for i in range(count)]
+        for label, build in (("packed buttons", packedButtons), ("VirtualList", virtualList)):
+            before = widgetCount(window)
+            start = time.perf_counter()
+            frame = build(window, students)
+            window.update()
+            opened = time.perf_counter() - start
+            widgets = widgetCount(window) - before
+
+            start = time.perf_counter()
+            if isinstance(frame, VirtualList):
+                frame.onScrollbar("moveto", 1.0)
+            else:
+                frame._parent_canvas.yview_moveto(1.0)
+            window.update()
+            scrolled = time.perf_counter() - start
+
+            print(f"{count:>8} {label:<16} {opened * 1e3:>6.0f}ms {widgets:>8} {scrolled * 1e3:>12.1f}ms")
+            frame.destroy()
+            window.update()
+    window.destroy()
+
+
+if __name__ == "__main__":
+    main()
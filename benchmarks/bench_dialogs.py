@@ -0,0 +1,100 @@
+'''
+Opens and closes a dialog like the create teacher window many times: as a new CTk root
+each time (what the account screens used to do) and through WindowManager, which opens it
+as a CTkToplevel of the one root and reuses it. Prints the time per open, the widgets left
+alive and the process's resident memory after the cycles.
+
+Needs a display. Run from the project root:
+    python -m benchmarks.bench_dialogs --cycles 100
+'''
+import argparse
+import time
+import tkinter
+
+import customtkinter as ctk
+
+from window_manager import WindowManager
+
+
+FONT = ("Arial", 20)
+
+
+def residentMemory():
+    '''Resident set size in bytes, or None where /proc is not available.'''
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def fillDialog(window):
+    for row, text in enumerate(("Name:", "ID No:", "Access:", "Selected:", "Salary")):
+        ctk.CTkLabel(window, text=text, font=FONT).place(relx=0.1, rely=0.1 * (row + 1))
+    for row in (0, 1, 4):
+        ctk.CTkEntry(window, width=200, corner_radius=4, placeholder_text="...").place(relx=0.3, rely=0.1 * (row + 1))
+    ctk.CTkComboBox(window, width=140, height=28, values=["1", "2", "3"]).place(relx=0.3, rely=0.3)
+    ctk.CTkTextbox(window, width=200, height=20).place(relx=0.3, rely=0.4)
+    ctk.CTkButton(window, text="Create teacher", font=FONT).place(relx=0.35, rely=0.7)
+
+
+def newRoots(root, cycles):
+    for _ in range(cycles):
+        window = ctk.CTk()
+        window.geometry("400x500")
+        fillDialog(window)
+        window.update()
+        window.destroy()
+
+
+def windowManager(root, cycles):
+    windows = WindowManager(root, ctk)
+    for _ in range(cycles):
+        windows.open("create_teacher", fillDialog, title="Create Teacher", geometry="400x500")
+        root.update()
+        windows.close("create_teacher")
+        root.update()
+    return windows
+
+
+def widgetCount(widget):
+    return 1 + sum(widgetCount(child) for child in widget.winfo_children())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=100)
+    parser.add_argument("--method", choices=["both", "roots", "manager"], default="both",
+                        help="run one method per process for a clean memory figure")
+    args = parser.parse_args()
+
+    try:
+        root = ctk.CTk()
+    except tkinter.TclError as e:
+        print(f"No display to open a window on: {e}")
+        return
+    root.update()
+
+    methods = [("new CTk roots", newRoots), ("WindowManager", windowManager)]
+    if args.method == "roots":
+        methods = methods[:1]
+    elif args.method == "manager":
+        methods = methods[1:]
+
+    print(f"{args.cycles} open/close cycles")
+    print(f"{'method':<16} {'per open':>10} {'widgets left':>13} {'RSS after':>10}")
+    for label, run in methods:
+        start = time.perf_counter()
+        run(root, args.cycles)
+        elapsed = time.perf_counter() - start
+        rss = residentMemory()
+        rss_text = f"{rss / 2**20:.1f}MB" if rss is not None else "n/a"
+        print(f"{label:<16} {elapsed / args.cycles * 1e3:>8.1f}ms {widgetCount(root):>13} {rss_text:>10}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+'''
+Time and memory to export every student of a generated school with exporters.py, streamed
+from a classes.json that is not loaded, against the time to just write a file of the same
+size. The school is written one student at a time, so --students can be in the millions.
+With --trace, tracemalloc reports the peak memory of the export itself (and slows it down).
+
+Run from the project root:
+    python -m benchmarks.bench_export --students 1000000 --classes 50
+    python -m benchmarks.bench_export --kind marks --gzip --trace
+'''
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+
+import exporters
+from marks_store import SUBJECTS
+from repository import JsonRepository, DocumentCache
+
+
+def writeSchool(path, classes, students):
+    per_class = students // classes
+    with open(path, 'w') as f:
+        f.write('{"classes": [')
+        for n in range(classes):
+            f.write(("," if n else "") + f'{{"class": "{n + 1}", "students": [')
+            for i in range(per_class):
+                student = {
+                    "Name": f"Student {n}-{i}",
+                    "ID": f"{n + 1}-{i}",
+                    "Roll": str(i + 1),
+                    "Marks": {subject: (i * 7 + column * 13) % 101 for column, subject in enumerate(SUBJECTS)},
+                    "OtherInfo": {"Age": 10 + i % 8, "Address": f"House {i}", "Phone Number": f"01{i:09d}", "Guardian": f"Guardian {i}"},
+                }
+                f.write(("," if i else "") + json.dumps(student))
+            f.write("]}")
+        f.write("]}")
+    return per_class * classes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=1000000)
+    parser.add_argument("--classes", type=int, default=50)
+    parser.add_argument("--kind", choices=list(exporters.EXPORTS), default="students")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--trace", action="store_true", help="measure the export's peak memory with tracemalloc")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        classes_file = os.path.join(directory, "classes.json")
+        students = writeSchool(classes_file, args.classes, args.students)
+        repository = JsonRepository(classes_file, os.path.join(directory, "teachers.json"), cache=DocumentCache(), columnar_marks=True)
+        output = os.path.join(directory, f"export.{args.format}" + (".gz" if args.gzip else ""))
+        print(f"{students} students in {args.classes} classes, {os.path.getsize(classes_file) / 1e6:.0f}MB classes.json")
+
+        if args.trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        rows = exporters.export(repository, args.kind, output)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(output)
+        print(f"export {args.kind} to {os.path.basename(output)}: {rows} rows, {size / 1e6:.0f}MB in {elapsed:.2f}s "
+              f"({rows / elapsed:,.0f} rows/s, {size / 1e6 / elapsed:.0f}MB/s)")
+        if args.trace:
+            print(f"peak memory during the export: {tracemalloc.get_traced_memory()[1] / 1e6:.1f}MB")
+            tracemalloc.stop()
+        # ru_maxrss is in kilobytes on Linux
+        print(f"peak resident size of the process: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3:.0f}MB")
+
+        block = b"x" * (1024 * 1024)
+        start = time.perf_counter()
+        with open(output + ".raw", 'wb') as f:
+            for _ in range(max(size // len(block), 1)):
+                f.write(block)
+        elapsed = time.perf_counter() - start
+        print(f"writing {size / 1e6:.0f}MB of raw bytes: {elapsed:.2f}s ({size / 1e6 / elapsed:.0f}MB/s)")
+
+
+if __name__ == "__main__":
+    main()
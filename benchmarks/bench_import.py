@@ -0,0 +1,104 @@
+'''
+Time to bulk import students from a generated CSV or JSONL file into an empty school,
+against adding the same students one addStudent call (and one save) at a time as the
+create-student form does. The one-at-a-time run is limited to --single rows. Uses the
+json_indent setting from settings.json.
+
+Run from the project root:
+    python -m benchmarks.bench_import --rows 100000 --classes 20
+    python -m benchmarks.bench_import --format jsonl --mode journal
+'''
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+
+from journal import Journal
+from marks_store import SUBJECTS
+from repository import JsonRepository, DocumentCache
+from settings import getSetting
+from storage import CoalescingWriter, atomicWriteJson
+from student_import import COLUMNS, importStudents, parseStudent
+
+
+def writeStudents(path, file_format, rows, classes):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f) if file_format == "csv" else None
+        if writer:
+            writer.writerow(COLUMNS)
+        for i in range(rows):
+            values = [f"{i % classes + 1}", f"Student {i}", f"S{i:07d}", str(i // classes + 1)]
+            values += [(i * 7 + column * 13) % 101 for column in range(len(SUBJECTS))]
+            values += [10 + i % 8, f"House {i}, Road {i % 50}", f"01{i:09d}", f"Guardian {i}"]
+            if writer:
+                writer.writerow(values)
+            else:
+                f.write(json.dumps(dict(zip(COLUMNS, values))) + "\n")
+
+
+def openRepository(directory, mode, classes):
+    classes_file = os.path.join(directory, "classes.json")
+    atomicWriteJson(classes_file, {"classes": [{"class": f"{n + 1}", "students": []} for n in range(classes)]})
+    journal_file = os.path.join(directory, "classes.journal")
+    if os.path.exists(journal_file):
+        os.remove(journal_file)
+    return JsonRepository(
+        classes_file,
+        os.path.join(directory, "teachers.json"),
+        cache=DocumentCache(CoalescingWriter(0), locking=True),
+        journal=Journal(journal_file) if mode == "journal" else None,
+        columnar_marks=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--classes", type=int, default=20)
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--mode", choices=["snapshot", "journal"], default="snapshot")
+    parser.add_argument("--single", type=int, default=200, help="rows added one at a time for comparison")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"students.{args.format}")
+        writeStudents(path, args.format, args.rows, args.classes)
+        print(f"{args.rows} rows, {os.path.getsize(path) / 1e6:.1f}MB {args.format}, {args.mode} mode, "
+              f"json_indent {getSetting('json_indent')}")
+
+        repository = openRepository(directory, args.mode, args.classes)
+        start = time.perf_counter()
+        report = importStudents(repository, path, args.format)
+        elapsed = time.perf_counter() - start
+        print(f"bulk import: {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s); {report.summary()}")
+
+        start = time.perf_counter()
+        report = importStudents(repository, path, args.format, dry_run=True)
+        print(f"re-importing the same file as a dry run: {time.perf_counter() - start:.2f}s, {report.error_count} duplicates found")
+
+        repository = openRepository(directory, args.mode, args.classes)
+        single = min(args.single, args.rows)
+        students = [parseStudent(dict(zip(COLUMNS, map(str, row)))) for row in _rows(path, args.format, single)]
+        start = time.perf_counter()
+        for class_name, student in students:
+            repository.addStudent(class_name, student)
+        elapsed = time.perf_counter() - start
+        print(f"one addStudent per row: {elapsed / single * 1e3:.2f}ms per row, "
+              f"{elapsed / single * args.rows:.1f}s projected for {args.rows} rows")
+
+
+def _rows(path, file_format, count):
+    with open(path, newline='') as f:
+        if file_format == "csv":
+            reader = csv.reader(f)
+            next(reader)
+        else:
+            reader = (json.loads(line).values() for line in f)
+        for _, row in zip(range(count), reader):
+            yield row
+
+
+if __name__ == "__main__":
+    main()
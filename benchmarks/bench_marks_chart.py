@@ -0,0 +1,85 @@
+'''
+Time to build the marks part of the student screen and the number of widgets it creates:
+a label, a CTkProgressBar and a percentage label per subject (as StudentAccount used to
+do) against one MarksChart. Also times redrawing the chart for another student's marks.
+
+Needs a display. Run from the project root:
+    python -m benchmarks.bench_marks_chart --repeat 20
+'''
+import argparse
+import time
+import tkinter
+
+import customtkinter as ctk
+
+from marks_chart import MarksChart
+from marks_store import SUBJECTS
+
+
+FONT = ('Arial', 20, 'bold')
+
+
+def perSubjectWidgets(window, marks):
+    frame = ctk.CTkFrame(window, width=718, height=646, fg_color='black')
+    frame.place(relx=0.4, rely=0.001)
+    for position, subject in enumerate(SUBJECTS):
+        rely = 0.02 + position * 0.09
+        ctk.CTkLabel(frame, text=subject, font=FONT, text_color="white").place(relx=0.02, rely=rely)
+        progress = ctk.CTkProgressBar(frame, orientation='horizontal', mode="determinate", border_width=2, border_color='white', width=300, height=25)
+        progress.place(relx=0.75, rely=rely, anchor='center')
+        progress.set(marks[subject] / 100.0)
+        ctk.CTkLabel(frame, text=f"{marks[subject]}%", font=FONT, text_color="white").place(relx=0.45, rely=rely)
+    return frame
+
+
+def marksChart(window, marks):
+    chart = MarksChart(window, ctk, marks, font=FONT)
+    chart.place(relx=0.4, rely=0.001)
+    return chart
+
+
+def widgetCount(widget):
+    return 1 + sum(widgetCount(child) for child in widget.winfo_children())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        window = ctk.CTk()
+    except tkinter.TclError as e:
+        print(f"No display to open a window on: {e}")
+        return
+    window.geometry("1200x700")
+    window.update()
+
+    marks = [{subject: (i * 13 + position * 7) % 101 for position, subject in enumerate(SUBJECTS)} for i in range(args.repeat)]
+
+    print(f"{'method':<22} {'build':>8} {'widgets':>8}")
+    for label, build in (("per-subject widgets", perSubjectWidgets), ("MarksChart", marksChart)):
+        elapsed = 0.0
+        for student_marks in marks:
+            before = widgetCount(window)
+            start = time.perf_counter()
+            built = build(window, student_marks)
+            window.update()
+            elapsed += time.perf_counter() - start
+            widgets = widgetCount(window) - before
+            built.destroy()
+            window.update()
+        print(f"{label:<22} {elapsed / args.repeat * 1e3:>6.1f}ms {widgets:>8}")
+
+    chart = marksChart(window, marks[0])
+    window.update()
+    start = time.perf_counter()
+    for student_marks in marks:
+        chart.setMarks(student_marks)
+        window.update()
+    print(f"MarksChart.setMarks    {(time.perf_counter() - start) / args.repeat * 1e3:>6.1f}ms")
+    window.destroy()
+
+
+if __name__ == "__main__":
+    main()
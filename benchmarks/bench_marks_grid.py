@@ -0,0 +1,102 @@
+'''
+Time to enter every subject's mark for one class: one updateMark call (and one save of
+classes.json) per mark, as the evaluate window does, against editing the cells of a
+MarksSheet and saving them in one batch, as the marks grid does. Both count how many
+times the file holding the class was written, from its file lock's version stamp.
+
+Run from the project root:
+    python -m benchmarks.bench_marks_grid --students 60 --classes 20
+    python -m benchmarks.bench_marks_grid --mode journal
+    python -m benchmarks.bench_marks_grid --mode sharded
+'''
+import argparse
+import os
+import tempfile
+import time
+
+import repository
+from journal import Journal
+from marks_grid import MarksSheet
+from marks_store import SUBJECTS
+from repository import JsonRepository, DocumentCache
+from sharded_repository import ShardedRepository, split
+from storage import CoalescingWriter, FileLock, atomicWriteJson
+
+
+def makeSchool(directory, classes, students):
+    atomicWriteJson(os.path.join(directory, "classes.json"), {"classes": [{
+        "class": f"{n + 1}",
+        "students": [{
+            "Name": f"Student {n}-{i}",
+            "ID": f"{n + 1}-{i}",
+            "Roll": str(i + 1),
+            "Marks": {subject: 0 for subject in SUBJECTS},
+            "OtherInfo": {"Age": 12, "Address": "", "Phone Number": "", "Guardian": ""},
+        } for i in range(students)],
+    } for n in range(classes)]})
+
+
+def classFile(directory, mode):
+    # split() names class 1's shard after its position and name
+    if mode == "sharded":
+        return os.path.join(directory, "shards", "class_0_1.json")
+    return os.path.join(directory, "classes.json")
+
+
+def openRepository(directory, mode):
+    cache = DocumentCache(CoalescingWriter(0), locking=True)
+    if mode == "sharded":
+        split(os.path.join(directory, "classes.json"), os.path.join(directory, "shards"))
+        return ShardedRepository(os.path.join(directory, "shards"), os.path.join(directory, "classes.json"),
+                                 os.path.join(directory, "teachers.json"), cache=cache)
+    journal_file = os.path.join(directory, "classes.journal")
+    if os.path.exists(journal_file):
+        os.remove(journal_file)
+    return JsonRepository(
+        os.path.join(directory, "classes.json"),
+        os.path.join(directory, "teachers.json"),
+        cache=cache,
+        journal=Journal(journal_file) if mode == "journal" else None,
+        columnar_marks=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=60, help="students in the class being marked")
+    parser.add_argument("--classes", type=int, default=20, help="classes in the school, for a realistic file size")
+    parser.add_argument("--mode", choices=["snapshot", "journal", "sharded"], default="snapshot")
+    args = parser.parse_args()
+    marks = args.students * len(SUBJECTS)
+
+    with tempfile.TemporaryDirectory() as directory:
+        makeSchool(directory, args.classes, args.students)
+        print(f"{args.classes} classes of {args.students} students, {args.mode} mode; entering {marks} marks in class 1")
+
+        school = openRepository(directory, args.mode)
+        school.getClass("1")
+        versions = FileLock(classFile(directory, args.mode))
+        before = versions.version()
+        start = time.perf_counter()
+        for roll in range(1, args.students + 1):
+            for subject in SUBJECTS:
+                school.updateMark("1", str(roll), subject, 70)
+        elapsed = time.perf_counter() - start
+        print(f"one updateMark per mark: {elapsed:.2f}s ({elapsed / marks * 1e3:.2f}ms per mark), "
+              f"{versions.version() - before} writes")
+
+        makeSchool(directory, args.classes, args.students)
+        repository._repository = openRepository(directory, args.mode)
+        sheet = MarksSheet("1", repository._repository.getClass("1").students)
+        before = versions.version()
+        start = time.perf_counter()
+        for row in range(args.students):
+            for subject in SUBJECTS:
+                sheet.setText(row, subject, "70")
+        saved = sheet.save()
+        elapsed = time.perf_counter() - start
+        print(f"marks grid, {saved} cells saved in one batch: {elapsed:.2f}s, {versions.version() - before} writes")
+
+
+if __name__ == "__main__":
+    main()
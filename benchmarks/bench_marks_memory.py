@@ -0,0 +1,63 @@
+'''
+Measures the memory held by student marks: a dict per student (as parsed from
+classes.json) against the columnar MarksTable. With the table a Student keeps only its
+row number; MarksRow views are made on each access and dropped, so they are not counted.
+Both sides count a list holding one reference per student.
+
+Run from the project root:
+    python -m benchmarks.bench_marks_memory --students 1000000
+'''
+import argparse
+import random
+import time
+import tracemalloc
+
+from marks_store import SUBJECTS, MarksTable
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200_000)
+    args = parser.parse_args()
+
+    random.seed(1)
+    rows = [[random.randint(0, 100) for _ in SUBJECTS] for _ in range(args.students)]
+
+    def dicts():
+        # what json.load produces: one dict per student, keys shared through string interning
+        return [dict(zip(SUBJECTS, row)) for row in rows]
+
+    def columnar():
+        # what Student.marks keeps: the table and its row, not the MarksRow returned
+        table = MarksTable()
+        return table, [table.appendRow(dict(zip(SUBJECTS, row))).row for row in rows]
+
+    _marks, dict_bytes, dict_time = measure(dicts)
+    del _marks
+    (table, _rows), table_bytes, table_time = measure(columnar)
+    column_bytes = sum(column.buffer_info()[1] * column.itemsize for column in table.columns)
+
+    print(f"{args.students} students, {len(SUBJECTS)} subjects")
+    print(f"dict per student         {dict_bytes / 2**20:8.1f} MB  ({dict_bytes / args.students:6.0f} B/student, built in {dict_time:.2f}s)")
+    print(f"MarksTable + row numbers {table_bytes / 2**20:8.1f} MB  ({table_bytes / args.students:6.0f} B/student, built in {table_time:.2f}s)")
+    print(f"  of which columns        {column_bytes / 2**20:8.1f} MB  ({column_bytes / args.students:6.0f} B/student)")
+
+    print(f"{dict_bytes / table_bytes:.1f}x less memory with the table")
+
+    start = time.perf_counter()
+    averages = table.averages(range(0, len(table)))
+    print(f"school-wide averages over all subjects in {(time.perf_counter() - start) * 1e3:.1f}ms, Math = {averages['Math']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
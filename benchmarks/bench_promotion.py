@@ -0,0 +1,73 @@
+'''
+Time to promote a whole generated school with Repository.promote: a dry run, then the
+promotion itself with the marks archived, in one write. Marks are spread so that some
+students of every class fail.
+
+Run from the project root:
+    python -m benchmarks.bench_promotion --students 50000 --classes 10
+    python -m benchmarks.bench_promotion --backend sqlite
+'''
+import argparse
+import os
+import tempfile
+import time
+
+from journal import Journal
+from marks_store import SUBJECTS
+from promotion import PassRule
+from repository import JsonRepository, DocumentCache
+from sqlite_repository import SqliteRepository, migrate
+from storage import atomicWriteJson
+
+
+def makeSchool(classes_file, classes, students):
+    per_class = students // classes
+    atomicWriteJson(classes_file, {"classes": [{
+        "class": f"{n + 1}",
+        "students": [{
+            "Name": f"Student {n}-{i}",
+            "ID": f"{n + 1}-{i}",
+            "Roll": str(i + 1),
+            "Marks": {subject: (i * 7 + column * 13) % 101 for column, subject in enumerate(SUBJECTS)},
+            "OtherInfo": {"Age": 10 + n, "Address": "", "Phone Number": "", "Guardian": ""},
+        } for i in range(per_class)],
+    } for n in range(classes)]})
+    return per_class * classes
+
+
+def openRepository(directory, backend):
+    classes_file = os.path.join(directory, "classes.json")
+    teachers_file = os.path.join(directory, "teachers.json")
+    if backend == "sqlite":
+        atomicWriteJson(teachers_file, {"teachers": []})
+        migrate(os.path.join(directory, "school.db"), classes_file, teachers_file)
+        return SqliteRepository(os.path.join(directory, "school.db"))
+    journal = Journal(os.path.join(directory, "classes.journal")) if backend == "journal" else None
+    return JsonRepository(classes_file, teachers_file, cache=DocumentCache(locking=True), journal=journal, columnar_marks=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--backend", choices=["snapshot", "journal", "sqlite"], default="snapshot")
+    parser.add_argument("--max-failed", type=int, default=3, help="subjects a student may fail and still pass")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        students = makeSchool(os.path.join(directory, "classes.json"), args.classes, args.students)
+        repository = openRepository(directory, args.backend)
+        rule = PassRule(max_failed=args.max_failed)
+        print(f"{students} students in {args.classes} classes, {args.backend}")
+
+        start = time.perf_counter()
+        report = repository.promote(rule, dry_run=True)
+        print(f"dry run (reading the school included): {time.perf_counter() - start:.2f}s; {report.summary()}")
+
+        start = time.perf_counter()
+        report = repository.promote(rule, archive_file=os.path.join(directory, "marks-archive.jsonl"))
+        print(f"promotion with the marks archived: {time.perf_counter() - start:.2f}s; {report.summary()}")
+
+
+if __name__ == "__main__":
+    main()
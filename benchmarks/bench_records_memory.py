@@ -0,0 +1,82 @@
+'''
+Measures the memory held by a loaded roster: the dicts json.load produces against the
+slotted records in records.py, with and without columnar marks and lazily decoded
+OtherInfo.
+
+Run from the project root:
+    python -m benchmarks.bench_records_memory --students 200000
+'''
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from marks_store import SUBJECTS, MarksTable
+from records import loadSchool
+from storage import jsonDefault
+
+
+def roster(student_count, class_count):
+    '''The text of a classes.json file.'''
+    per_class = student_count // class_count
+    return json.dumps({"classes": [{
+        "class": str(c + 1),
+        "students": [{
+            "Name": f"Student {c}-{i}",
+            "ID": f"{c:03d}{i:07d}",
+            "Roll": str(i + 1),
+            "Marks": {subject: (i * 7 + position) % 101 for position, subject in enumerate(SUBJECTS)},
+            "OtherInfo": {"Age": 6 + c, "Address": f"{i} Main St", "Phone Number": f"011{i:08d}", "Guardian": f"Guardian {i}"},
+        } for i in range(per_class)]
+    } for c in range(class_count)]})
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--classes", type=int, default=10)
+    args = parser.parse_args()
+    students = args.students // args.classes * args.classes
+    text = roster(students, args.classes)
+
+    variants = [
+        ("dicts (json.load)", lambda: json.loads(text)),
+        ("records", lambda: loadSchool(json.loads(text))),
+        ("records + lazy OtherInfo", lambda: loadSchool(json.loads(text), encode_other_info=True)),
+        ("records + lazy + columnar", lambda: loadSchool(json.loads(text), MarksTable(), encode_other_info=True)),
+    ]
+
+    print(f"{students} students in {args.classes} classes")
+    print(f"{'':<28} {'memory':>10} {'per student':>12} {'load':>8}")
+    baseline = None
+    for label, build in variants:
+        # whatever a build still holds once it returns is the roster itself; load times
+        # include tracemalloc's overhead and only compare with each other
+        data, size, elapsed = measure(build)
+        baseline = baseline or size
+        print(f"{label:<28} {size / 2**20:8.1f}MB {size / students:10.0f} B {elapsed:7.2f}s  ({size / baseline:.0%})")
+        last = data
+        del data
+
+    student = last["classes"][args.classes // 2]["students"][students // args.classes // 2]
+    as_dict = json.loads(json.dumps(student, default=jsonDefault))
+    print(f"one student: dict {sys.getsizeof(as_dict)} B + OtherInfo dict {sys.getsizeof(as_dict['OtherInfo'])} B, "
+          f"Student {sys.getsizeof(student)} B + OtherInfo text {sys.getsizeof(student._other_info)} B")
+    start = time.perf_counter()
+    student.other_info
+    print(f"first read of one student's OtherInfo: {(time.perf_counter() - start) * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+'''
+Startup cost of main.py: what `import main` loads (from `python -X importtime`), and the
+time from launching the interpreter to the main menu's first drawn frame.
+
+Checks that none of the login and account screens' modules are imported to draw the
+menu, and that the first frame comes within --target seconds. Exits with status 1 if
+either check fails. Without a display only the import part runs.
+
+Run from the project root:
+    python -m benchmarks.bench_startup --runs 5 --target 1.0
+'''
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+# loaded on first use or by the background warm-up, never by `import main`
+LAZY_MODULES = [
+    "student_login", "teacher_login", "admin_login", "credentials",
+    "student_account", "teacher_account", "admin_account",
+    "thumbnails", "photo_store", "repository",
+]
+
+FIRST_FRAME = '''
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+try:
+    app = main.App()
+except Exception as e:
+    print(json.dumps({"error": str(e), "import": imported - start, "wall": time.time()}))
+    sys.exit()
+app.update()
+print(json.dumps({"import": imported - start, "frame": time.perf_counter() - start, "wall": time.time()}))
+app.destroy()
+'''
+
+
+def importTimes():
+    '''Returns [(module, self microseconds, cumulative microseconds, depth)] for `import main`.'''
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            capture_output=True, text=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(own), int(cumulative), depth))
+    return modules
+
+
+def firstFrame():
+    '''Launches the app once. Returns the child's timings plus "launch": seconds from spawn to first frame.'''
+    launched = time.time()
+    result = subprocess.run([sys.executable, "-c", FIRST_FRAME], capture_output=True, text=True, check=True)
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["launch"] = timings["wall"] - launched
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", type=float, default=1.0, help="seconds from launch to the first frame")
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    args = parser.parse_args()
+    failed = False
+
+    modules = importTimes()
+    # importtime lists a module after everything it imported; main's own imports are the
+    # depth 1 lines between the previous top-level module and main
+    end = next(i for i, m in enumerate(modules) if m[0] == "main" and m[3] == 0)
+    start = max((i for i in range(end) if modules[i][3] == 0), default=-1) + 1
+    top_level = sorted((m for m in modules[start:end] if m[3] == 1), key=lambda m: -m[2])
+    total = modules[end][2]
+    modules = modules[start:end + 1]
+    print(f"import main: {total / 1e3:.0f}ms cumulative")
+    for name, _own, cumulative, _depth in top_level[:args.top]:
+        print(f"  {cumulative / 1e3:8.1f}ms  {name}")
+
+    loaded = {name for name, _own, _cumulative, _depth in modules}
+    eager = [name for name in LAZY_MODULES if name in loaded]
+    if eager:
+        failed = True
+        print(f"loaded at startup but should be lazy: {', '.join(eager)}")
+    else:
+        print("no login or account screen module is loaded at startup")
+
+    runs = [firstFrame() for _ in range(args.runs)]
+    if "error" in runs[0]:
+        print(f"No display to draw the first frame on: {runs[0]['error']}")
+        print(f"import main alone: {statistics.median(run['import'] for run in runs) * 1e3:.0f}ms median over {args.runs} runs")
+    else:
+        launch = statistics.median(run["launch"] for run in runs)
+        print(f"first frame, median of {args.runs} runs: {launch * 1e3:.0f}ms from launch "
+              f"(import {statistics.median(run['import'] for run in runs) * 1e3:.0f}ms, "
+              f"import + App() + first update {statistics.median(run['frame'] for run in runs) * 1e3:.0f}ms)")
+        if launch > args.target:
+            failed = True
+            print(f"slower than the {args.target * 1e3:.0f}ms target")
+        else:
+            print(f"within the {args.target * 1e3:.0f}ms target")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # the child processes import main from the project root
+    os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")]))
+    main()
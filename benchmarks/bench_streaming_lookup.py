@@ -0,0 +1,106 @@
+'''
+Compares json.load with the streaming lookups in json_stream for a single student login
+and a single class view on a large classes.json.
+
+Each measurement runs in a fresh interpreter so peak RSS belongs to that lookup alone.
+
+Run from the project root:
+    python -m benchmarks.bench_streaming_lookup --students 200000
+'''
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+SUBJECTS = ["Bangla", "English", "Math", "Science", "Life and Livelihood", "Digital Technology",
+            "History and Social Science", "Religion", "Wellbeing", "Arts and Culture"]
+
+
+def writeSchool(filename, student_count, class_count):
+    '''Writes a classes.json-shaped file, one class at a time.'''
+    per_class = student_count // class_count
+    with open(filename, 'w') as f:
+        f.write('{"classes": [')
+        for c in range(class_count):
+            students = [{
+                "Name": f"Student {c}-{i}",
+                "ID": f"{c:03d}{i:07d}",
+                "Roll": str(i + 1),
+                "Marks": {subject: 70 for subject in SUBJECTS},
+                "OtherInfo": {"Age": 10, "Address": "123 Main St", "Phone Number": "01100000000", "Guardian": "Guardian"},
+            } for i in range(per_class)]
+            f.write((", " if c else "") + json.dumps({"class": str(c + 1), "students": students}, indent=4))
+        f.write(']}')
+    return per_class
+
+
+def child(method, filename, class_name, student_id):
+    import json_stream
+
+    start = time.perf_counter()
+    if method == "json.load/student":
+        with open(filename) as f:
+            data = json.load(f)
+        class_data = next(cls for cls in data["classes"] if cls["class"] == class_name)
+        next(s for s in class_data["students"] if s["ID"] == student_id)
+    elif method == "stream/student":
+        json_stream.findStudent(filename, class_name, student_id)
+    elif method == "json.load/class":
+        with open(filename) as f:
+            data = json.load(f)
+        next(cls for cls in data["classes"] if cls["class"] == class_name)
+    elif method == "stream/class":
+        json_stream.findClass(filename, class_name)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux
+    print(json.dumps({"seconds": elapsed, "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200_000)
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--child", nargs=4, help=argparse.SUPPRESS)
+    parser.add_argument("--write", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+    if args.write:
+        writeSchool(args.write, args.students, args.classes)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "classes.json")
+        # written by another process: Linux keeps ru_maxrss across exec, so children
+        # started from a parent that built the data would inherit its peak
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_streaming_lookup", "--write", filename,
+             "--students", str(args.students), "--classes", str(args.classes)],
+            check=True
+        )
+        per_class = args.students // args.classes
+        print(f"{args.students} students, file size {os.path.getsize(filename) / 2**20:.1f} MB")
+
+        # a student half way through the file, and the middle class
+        class_name = str(args.classes // 2 + 1)
+        student_id = f"{args.classes // 2:03d}{per_class // 2:07d}"
+
+        print(f"{'method':<20} {'latency':>10} {'peak RSS':>10}")
+        for method in ("json.load/student", "stream/student", "json.load/class", "stream/class"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_streaming_lookup", "--child", method, filename, class_name, student_id],
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output)
+            print(f"{method:<20} {result['seconds'] * 1e3:>8.0f}ms {result['peak_rss_mb']:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
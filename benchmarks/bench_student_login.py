@@ -0,0 +1,75 @@
+'''
+Measures student login lookup time as enrolment grows.
+
+Compares the old linear scan (find the class, then scan its students) against the
+StudentIndex used by StudentLogin.authenticateStudentLogin.
+
+Run from the project root:
+    python -m benchmarks.bench_student_login
+    python -m benchmarks.bench_student_login --sizes 1000 100000
+'''
+import argparse
+import random
+import time
+
+from indexes import StudentIndex
+
+
+CLASS_COUNT = 10
+SHARED_MARKS = {"Bangla": 80, "English": 75, "Math": 90}
+SHARED_INFO = {"Age": 10, "Address": "", "Phone Number": "", "Guardian": ""}
+
+
+def buildSchool(student_count):
+    '''Builds a classes.json-shaped document with student_count students spread across CLASS_COUNT classes.'''
+    classes = [{"class": str(c + 1), "students": []} for c in range(CLASS_COUNT)]
+    for i in range(student_count):
+        students = classes[i % CLASS_COUNT]["students"]
+        students.append({
+            "Name": f"Student {i}",
+            "ID": str(100000 + i),
+            "Roll": str(len(students) + 1),
+            # marks and info are shared to keep the 1M case inside a laptop's memory
+            "Marks": SHARED_MARKS,
+            "OtherInfo": SHARED_INFO,
+        })
+    return {"classes": classes}
+
+
+def linearLookup(data, class_name, student_id):
+    class_data = next((cls for cls in data['classes'] if cls['class'] == class_name), None)
+    if not class_data:
+        return None
+    return next((student for student in class_data['students'] if student['ID'] == student_id), None)
+
+
+def timeLookups(lookup, queries):
+    start = time.perf_counter()
+    for class_name, student_id in queries:
+        lookup(class_name, student_id)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'students':>10} {'index build':>12} {'linear scan':>14} {'indexed':>12}")
+    for size in args.sizes:
+        data = buildSchool(size)
+        picks = random.sample(range(size), min(args.queries, size))
+        queries = [(str(i % CLASS_COUNT + 1), str(100000 + i)) for i in picks]
+
+        start = time.perf_counter()
+        index = StudentIndex(data)
+        build_time = time.perf_counter() - start
+
+        linear = timeLookups(lambda c, s: linearLookup(data, c, s), queries)
+        indexed = timeLookups(lambda c, s: index.findStudent(s, c), queries)
+        print(f"{size:>10} {build_time * 1e3:>10.1f}ms {linear * 1e6:>12.1f}us {indexed * 1e6:>10.2f}us")
+
+
+if __name__ == "__main__":
+    main()
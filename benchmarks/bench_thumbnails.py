@@ -0,0 +1,66 @@
+'''
+Thumbnails a folder of generated student photos one after another on one core, then with
+thumbnails.makeThumbnails across every core, then again with every thumbnail already on
+disk.
+
+Run from the project root:
+    python -m benchmarks.bench_thumbnails --photos 200 --width 3000 --height 2000
+'''
+import argparse
+import os
+import tempfile
+import time
+
+from PIL import Image
+
+from thumbnails import ThumbnailCache, makeThumbnails
+
+
+def makePhotos(directory, count, width, height):
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"student_{i:04d}.jpg")
+        # a gradient, so the JPEGs take real work to decode
+        image = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+        image.putpixel((i % width, 0), (i % 256, 0, 0))
+        image.save(path, quality=90)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--photos", type=int, default=100)
+    parser.add_argument("--width", type=int, default=3000)
+    parser.add_argument("--height", type=int, default=2000)
+    parser.add_argument("--processes", type=int, default=None, help="defaults to the number of cores")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = makePhotos(directory, args.photos, args.width, args.height)
+
+        serial_cache = ThumbnailCache(os.path.join(directory, "serial"))
+        start = time.perf_counter()
+        for path in paths:
+            serial_cache.thumbnailPath(path)
+        serial = time.perf_counter() - start
+
+        parallel_directory = os.path.join(directory, "parallel")
+        start = time.perf_counter()
+        _thumbnails, errors = makeThumbnails(paths, directory=parallel_directory, processes=args.processes)
+        parallel = time.perf_counter() - start
+
+        start = time.perf_counter()
+        makeThumbnails(paths, directory=parallel_directory, processes=args.processes)
+        cached = time.perf_counter() - start
+
+    print(f"{args.photos} photos of {args.width}x{args.height}, {args.processes or os.cpu_count()} processes")
+    print(f"one core       {serial:7.2f}s  {serial / args.photos * 1e3:7.1f}ms/photo")
+    print(f"process pool   {parallel:7.2f}s  {parallel / args.photos * 1e3:7.1f}ms/photo  ({serial / parallel:.1f}x)")
+    print(f"already cached {cached:7.2f}s  {cached / args.photos * 1e3:7.1f}ms/photo")
+    if errors:
+        print(f"{len(errors)} photos failed, e.g. {next(iter(errors.items()))}")
+
+
+if __name__ == "__main__":
+    main()
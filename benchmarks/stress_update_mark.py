@@ -0,0 +1,102 @@
+'''
+Several processes add 1 to the same student's mark at once, each through its own
+repository as separate copies of the app would. With file locking every increment must
+survive; without it, concurrent read-modify-writes overwrite each other.
+
+Exits with status 1 if an increment was lost while locking was on.
+
+Run from the project root:
+    python -m benchmarks.stress_update_mark --processes 8 --updates 200
+    python -m benchmarks.stress_update_mark --mode journal
+    python -m benchmarks.stress_update_mark --no-locking
+'''
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from journal import Journal
+from marks_store import SUBJECTS
+from repository import JsonRepository, DocumentCache
+from storage import CoalescingWriter, atomicWriteJson
+
+
+CLASS_NAME = "1"
+ROLL = "1"
+SUBJECT = "Math"
+
+
+def openRepository(directory, mode, locking):
+    journal = Journal(os.path.join(directory, "classes.journal")) if mode == "journal" else None
+    return JsonRepository(
+        os.path.join(directory, "classes.json"),
+        os.path.join(directory, "teachers.json"),
+        cache=DocumentCache(CoalescingWriter(0), locking=locking),
+        journal=journal,
+        compact_every=100,
+        columnar_marks=True,
+    )
+
+
+def worker(directory, mode, locking, updates, barrier, results):
+    repository = openRepository(directory, mode, locking)
+    repository.getClass(CLASS_NAME)  # every copy starts from a loaded file, like an open screen
+    barrier.wait()
+    start = time.perf_counter()
+    for _ in range(updates):
+        repository.updateMark(CLASS_NAME, ROLL, SUBJECT, 1)
+    results.put((time.perf_counter() - start, repository.cacheStats()["reloads"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--updates", type=int, default=200, help="updates per process")
+    parser.add_argument("--students", type=int, default=100, help="students in the class, for a realistic file size")
+    parser.add_argument("--mode", choices=["snapshot", "journal"], default="snapshot")
+    parser.add_argument("--no-locking", action="store_true")
+    args = parser.parse_args()
+    locking = not args.no_locking
+
+    with tempfile.TemporaryDirectory() as directory:
+        atomicWriteJson(os.path.join(directory, "classes.json"), {"classes": [{
+            "class": CLASS_NAME,
+            "students": [{
+                "Name": f"Student {i}", "ID": f"{i:06d}", "Roll": str(i + 1),
+                "Marks": {subject: 0 for subject in SUBJECTS},
+                "OtherInfo": {"Age": 10, "Address": "", "Phone Number": "", "Guardian": ""},
+            } for i in range(args.students)]
+        }]})
+
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(args.processes + 1)
+        results = context.Queue()
+        processes = [
+            context.Process(target=worker, args=(directory, args.mode, locking, args.updates, barrier, results))
+            for _ in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+        barrier.wait()
+        start = time.perf_counter()
+        outcomes = [results.get() for _ in processes]
+        elapsed = time.perf_counter() - start
+        for process in processes:
+            process.join()
+
+        expected = args.processes * args.updates
+        final = openRepository(directory, args.mode, locking).findStudent("000000", CLASS_NAME).marks[SUBJECT]
+
+    print(f"{args.processes} processes x {args.updates} updates, {args.mode} mode, locking {'on' if locking else 'off'}")
+    print(f"final mark {final}, expected {expected}, lost {expected - final}")
+    print(f"{expected / elapsed:.0f} updates/s overall ({elapsed:.2f}s), "
+          f"slowest process {max(seconds for seconds, _reloads in outcomes):.2f}s")
+    print(f"updates applied to a reloaded file after another process wrote it: {sum(reloads for _seconds, reloads in outcomes)}")
+    if locking and final != expected:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+'''
+Command line front end to services.py: the same operations as the screens, without a
+display. Uses the storage configured in settings.json, like the app.
+
+Run from the project root:
+    python -m cli classes
+    python -m cli add-class "Class 6"
+    python -m cli add-student "Class 6" --name Rahim --id 6001 --roll 1 --age 11 --mark Math=80 ...
+    python -m cli update-mark "Class 6" 1 Math 5
+    python -m cli import-students admissions.csv --dry-run
+    python -m cli student 6001 --class "Class 6"
+    python -m cli promote --dry-run
+    python -m cli thumbnails photos/class6
+    python -m cli export students students.csv.gz --class "Class 6" --subject Math --min-mark 80
+'''
+import argparse
+import json
+import sys
+
+import exporters
+import services
+from marks_store import SUBJECTS
+from storage import jsonDefault
+
+
+def printRecord(record):
+    print(json.dumps(record, indent=4, default=jsonDefault))
+
+
+def listClasses(args):
+    for class_name in services.classNames():
+        print(class_name)
+
+
+def listStudents(args):
+    for student in services.classStudents(args.class_name):
+        print(f"{student.roll}\t{student.id}\t{student.name}")
+
+
+def addClass(args):
+    print(f"Created {services.createClass(args.class_name)}")
+
+
+def addStudent(args):
+    marks = {}
+    for item in args.mark:
+        subject, _, mark = item.rpartition("=")
+        marks[subject] = mark
+    missing = [subject for subject in SUBJECTS if subject not in marks]
+    if missing:
+        raise ValueError(f"No mark given for {', '.join(missing)}")
+    student = services.makeStudent(args.name, args.id, args.roll, marks, args.age, args.address, args.phone, args.guardian)
+    services.addStudent(args.class_name, student)
+    print(f"Added {student.name} to {args.class_name}")
+
+
+def updateMark(args):
+    services.updateMark(args.class_name, args.roll, args.subject, args.mark)
+    print(f"Updated {args.subject} of roll {args.roll} in {args.class_name}")
+
+
+def addTeacher(args):
+    teacher = services.createTeacher(args.name, args.id, args.classes, args.salary)
+    print(f"Created teacher {teacher.id}")
+
+
+def showStudent(args):
+    student = services.loginStudent(args.id, args.class_name) if args.class_name else services.findStudent(args.id)
+    if not student:
+        raise ValueError(f"ID {args.id} not found")
+    printRecord(student)
+
+
+def showTeacher(args):
+    printRecord(services.loginTeacher(args.id))
+
+
+def importStudents(args):
+    report = services.importStudents(args.file, args.format, args.skip_invalid, args.dry_run)
+    for line, message in report.errors:
+        print(f"line {line}: {message}", file=sys.stderr)
+    if report.error_count > len(report.errors):
+        print(f"... and {report.error_count - len(report.errors)} more", file=sys.stderr)
+    print(report.summary())
+    for class_name, count in report.per_class.items():
+        print(f"  {class_name}: {count}")
+    if report.error_count and not (args.skip_invalid or args.dry_run):
+        raise ValueError("Fix the rows above or pass --skip-invalid")
+
+
+def exportRecords(args):
+    count = services.exportRecords(args.kind, args.file, args.format, args.gzip or None, args.class_names,
+                                   args.subject, args.min_mark, args.max_mark)
+    if args.file != "-":
+        print(f"Exported {count} {args.kind} rows to {args.file}")
+
+
+def promoteStudents(args):
+    report = services.promoteStudents(args.dry_run, args.archive, not args.keep_marks, args.pass_mark, args.max_failed)
+    print(f"{'Class':<20}{'promoted':>10}{'repeating':>10}{'graduated':>10}{'incoming':>10}{'students':>10}")
+    for class_name, counts in report.per_class.items():
+        print(f"{class_name:<20}{counts['promoted']:>10}{counts['repeated']:>10}{counts['graduated']:>10}"
+              f"{counts['incoming']:>10}{counts['students']:>10}")
+    print(report.summary())
+
+
+def makeThumbnails(args):
+    thumbnails, errors = services.makeThumbnails(args.paths, args.processes)
+    for path, message in errors.items():
+        print(f"{path}: {message}", file=sys.stderr)
+    print(f"Made or found {len(thumbnails)} thumbnails, {len(errors)} pictures could not be read")
+
+
+def checkAdmin(args):
+    if not services.checkAdminId(args.id):
+        raise ValueError("Id number incorrect!")
+    print("Admin ID is correct")
+
+
+def buildParser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("classes", help="list the classes")
+    command.set_defaults(run=listClasses)
+
+    command = commands.add_parser("students", help="list the students of a class")
+    command.add_argument("class_name")
+    command.set_defaults(run=listStudents)
+
+    command = commands.add_parser("add-class", help="create a class")
+    command.add_argument("class_name")
+    command.set_defaults(run=addClass)
+
+    command = commands.add_parser("add-student", help="add a student to a class")
+    command.add_argument("class_name")
+    command.add_argument("--name", required=True)
+    command.add_argument("--id", required=True)
+    command.add_argument("--roll", required=True)
+    command.add_argument("--age", required=True)
+    command.add_argument("--address", default="")
+    command.add_argument("--phone", default="")
+    command.add_argument("--guardian", default="")
+    command.add_argument("--mark", action="append", default=[], metavar="SUBJECT=MARK",
+                         help=f"one per subject: {', '.join(SUBJECTS)}")
+    command.set_defaults(run=addStudent)
+
+    command = commands.add_parser("update-mark", help="add to a student's mark, like the evaluate window")
+    command.add_argument("class_name")
+    command.add_argument("roll")
+    command.add_argument("subject", choices=SUBJECTS)
+    command.add_argument("mark")
+    command.set_defaults(run=updateMark)
+
+    command = commands.add_parser("add-teacher", help="create a teacher")
+    command.add_argument("--name", required=True)
+    command.add_argument("--id", required=True)
+    command.add_argument("--salary", default="")
+    command.add_argument("--classes", nargs="*", default=[], help="classes the teacher may open")
+    command.set_defaults(run=addTeacher)
+
+    command = commands.add_parser("import-students", help="add students from a CSV or JSONL file in one batch")
+    command.add_argument("file")
+    command.add_argument("--format", choices=["csv", "jsonl"], help="taken from the file extension by default")
+    command.add_argument("--skip-invalid", action="store_true", help="save the valid rows even if some are bad")
+    command.add_argument("--dry-run", action="store_true", help="check the file without saving anything")
+    command.set_defaults(run=importStudents)
+
+    command = commands.add_parser("promote", help="move every student who passed up a class and renumber the rolls")
+    command.add_argument("--dry-run", action="store_true", help="show what would change without saving anything")
+    command.add_argument("--archive", metavar="FILE", help="new JSONL file to keep this year's marks and results in")
+    command.add_argument("--keep-marks", action="store_true", help="don't reset the marks to 0")
+    command.add_argument("--pass-mark", type=int, help="lowest passing mark per subject (setting promotion_pass_mark)")
+    command.add_argument("--max-failed", type=int, help="subjects a student may fail and still pass (setting promotion_max_failed)")
+    command.set_defaults(run=promoteStudents)
+
+    command = commands.add_parser("thumbnails", help="resize many profile pictures at once, one process per core")
+    command.add_argument("paths", nargs="*", help="pictures or folders of them; all admin and teacher pictures by default")
+    command.add_argument("--processes", type=int, help="worker processes; one per core by default")
+    command.set_defaults(run=makeThumbnails)
+
+    command = commands.add_parser("export", help="write classes, students, marks or teachers to a CSV or JSONL file")
+    command.add_argument("kind", choices=list(exporters.EXPORTS))
+    command.add_argument("file", help="output file; .gz is compressed; - writes JSONL to standard output unless --format is given")
+    command.add_argument("--format", choices=["csv", "jsonl"], help="taken from the file extension by default")
+    command.add_argument("--gzip", action="store_true", help="compress the output whatever the file name")
+    command.add_argument("--class", dest="class_names", action="append", metavar="CLASS",
+                         help="only this class; may be given more than once")
+    command.add_argument("--subject", choices=SUBJECTS, help="the subject --min-mark and --max-mark apply to")
+    command.add_argument("--min-mark", type=int, help="only students with at least this mark in --subject")
+    command.add_argument("--max-mark", type=int, help="only students with at most this mark in --subject")
+    command.set_defaults(run=exportRecords)
+
+    command = commands.add_parser("student", help="show a student, checking a login when --class is given")
+    command.add_argument("id")
+    command.add_argument("--class", dest="class_name")
+    command.set_defaults(run=showStudent)
+
+    command = commands.add_parser("teacher", help="show a teacher")
+    command.add_argument("id")
+    command.set_defaults(run=showTeacher)
+
+    command = commands.add_parser("check-admin", help="check an admin ID")
+    command.add_argument("id")
+    command.set_defaults(run=checkAdmin)
+
+    return parser
+
+
+def main(argv=None):
+    args = buildParser().parse_args(argv)
+    try:
+        args.run(args)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
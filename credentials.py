@@ -1,7 +1,8 @@
 from functions import showCopyrightClaim
+from screen_manager import Screen
 
 
-class Credentials:
+class Credentials(Screen):
 
     '''
     The Credentials class handles the creation and display of the credentials frame.
@@ -17,7 +18,7 @@ class Credentials:
 
     Methods:
         __init__(self, master, ctk, buttonFont): Initializes the Credentials class and sets up the GUI elements.
-        back_to_main(self): Destroys the current credentials frame and returns to the main menu.
+        back_to_main(self): Hides the credentials frame and returns to the main menu.
     '''
 
     def __init__(self, master, ctk, buttonFont):
@@ -35,7 +36,6 @@ class Credentials:
 
         # create credential frame
         self.credential_frame = self.ctk.CTkFrame(self.master, width=1000, height=600, border_width=2, border_color="white")
-        self.credential_frame.place(relx=0.5, rely=0.5, anchor="center")
 
 
         # copyright claim 
@@ -77,11 +77,12 @@ class Credentials:
         )
         self.back_button.place(relx=0.5, rely=0.9, anchor="center")
 
+        super().__init__(self.credential_frame)
+
 
     def back_to_main(self):
         '''
-        Handles the back button action. Destroys the current credentials frame and navigates back to the main menu.
+        Handles the back button action. Hides the credentials frame and navigates back to the main menu.
         '''
-        self.credential_frame.destroy()
         self.master.create_main_frame()
 
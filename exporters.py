@@ -0,0 +1,257 @@
+'''
+Exports of classes, students, marks and teachers to CSV or JSONL files.
+
+Records are read from the repository one class (with the JSON files, one student) at a
+time through Repository.iterClasses, turned into rows by generators and written out as
+they come, so an export of any size runs in constant memory. Output ending in .gz, or
+written with compress=True, is gzip compressed.
+
+What each export holds, one row per:
+    classes     class: Class, Students and the average mark per subject
+    students    student: the columns student_import.py reads, so a student export can be
+                imported into another school
+    marks       mark: Class, ID, Roll, Name, Subject, Mark
+    teachers    teacher: Name, ID, Classes ("; "-separated in CSV), Salary
+
+Rows can be limited to some classes, and student, class and mark rows to the students
+whose mark in one subject lies between min_mark and max_mark.
+'''
+import csv
+import gzip
+import json
+import os
+import sys
+
+from marks_store import SUBJECTS
+from student_import import COLUMNS, OTHER_INFO
+
+
+CLASS_COLUMNS = ["Class", "Students"] + SUBJECTS
+STUDENT_COLUMNS = COLUMNS
+MARK_COLUMNS = ["Class", "ID", "Roll", "Name", "Subject", "Mark"]
+TEACHER_COLUMNS = ["Name", "ID", "Classes", "Salary"]
+
+# zlib's default; level 9 costs several times the CPU for a few percent smaller files
+GZIP_LEVEL = 6
+
+# write buffer for uncompressed output
+BUFFER_SIZE = 1024 * 1024
+
+
+class MarkFilter:
+    '''
+    Which students a student, class or mark export keeps.
+
+    Attributes:
+        subject (str): The subject min_mark and max_mark apply to, or None to keep everyone.
+        min_mark (int): Lowest mark kept, or None.
+        max_mark (int): Highest mark kept, or None.
+
+    Methods:
+        keeps(self, student): True if the student's mark in subject is in range.
+    '''
+
+    def __init__(self, subject=None, min_mark=None, max_mark=None):
+        if subject is None and (min_mark is not None or max_mark is not None):
+            raise ValueError("Choose the subject the mark limits apply to")
+        self.subject = subject
+        self.min_mark = min_mark
+        self.max_mark = max_mark
+
+    def keeps(self, student):
+        if self.subject is None:
+            return True
+        mark = student.marks.get(self.subject)
+        if not isinstance(mark, (int, float)):
+            return False
+        return (self.min_mark is None or mark >= self.min_mark) and (self.max_mark is None or mark <= self.max_mark)
+
+
+def _checkFound(classes, found):
+    missing = sorted(classes - found) if classes is not None else []
+    if missing:
+        raise ValueError(f"Class {missing[0]} not found")
+
+
+def _students(repository, classes, mark_filter):
+    # classes are checked while streaming: a lookup first would read the whole school
+    found = set()
+    for class_name, students in repository.iterClasses(classes):
+        found.add(class_name)
+        yield class_name, (student for student in students if mark_filter.keeps(student))
+    _checkFound(classes, found)
+
+
+def classRows(repository, classes=None, mark_filter=None):
+    '''
+    Yields one row per class: its name, the number of (kept) students and their average
+    mark per subject, rounded to two places; "" for a subject none of them has a number for.
+    '''
+    mark_filter = mark_filter or MarkFilter()
+    for class_name, students in _students(repository, classes, mark_filter):
+        count = 0
+        totals = [0] * len(SUBJECTS)
+        counts = [0] * len(SUBJECTS)
+        for student in students:
+            count += 1
+            marks = student.marks
+            for column, subject in enumerate(SUBJECTS):
+                mark = marks.get(subject)
+                if isinstance(mark, (int, float)):
+                    totals[column] += mark
+                    counts[column] += 1
+        averages = [round(total / n, 2) if n else "" for total, n in zip(totals, counts)]
+        yield (class_name, count, *averages)
+
+
+def studentRows(repository, classes=None, mark_filter=None):
+    '''Yields one row per student in STUDENT_COLUMNS order; a missing mark is "".'''
+    mark_filter = mark_filter or MarkFilter()
+    for class_name, students in _students(repository, classes, mark_filter):
+        for student in students:
+            marks = student.marks
+            other_info = student.other_info
+            row = [class_name, student.name, student.id, student.roll]
+            row += [marks.get(subject, "") for subject in SUBJECTS]
+            row += [other_info.get(key, "") for key in OTHER_INFO]
+            yield row
+
+
+def markRows(repository, classes=None, mark_filter=None):
+    '''
+    Yields one row per mark of every kept student; only the filter's subject if it has one.
+    '''
+    mark_filter = mark_filter or MarkFilter()
+    for class_name, students in _students(repository, classes, mark_filter):
+        for student in students:
+            marks = student.marks
+            if mark_filter.subject is not None:
+                yield (class_name, student.id, student.roll, student.name, mark_filter.subject, marks[mark_filter.subject])
+                continue
+            for subject, mark in marks.items():
+                yield (class_name, student.id, student.roll, student.name, subject, mark)
+
+
+def teacherRows(repository, classes=None, mark_filter=None):
+    '''Yields one row per teacher, or per teacher who can open one of classes.'''
+    if mark_filter is not None and mark_filter.subject is not None:
+        raise ValueError("Teachers have no marks to filter by")
+    if classes is not None:
+        _checkFound(classes, {class_name for class_name, _students in repository.iterClasses(classes)})
+    for teacher in repository.iterTeachers():
+        if classes is not None and not any(class_name in classes for class_name in teacher.accessed_class):
+            continue
+        yield (teacher.name, teacher.id, list(teacher.accessed_class), teacher.salary)
+
+
+def _joinLists(row):
+    return ["; ".join(value) if type(value) is list else value for value in row]
+
+
+EXPORTS = {
+    "classes": (CLASS_COLUMNS, classRows),
+    "students": (STUDENT_COLUMNS, studentRows),
+    "marks": (MARK_COLUMNS, markRows),
+    "teachers": (TEACHER_COLUMNS, teacherRows),
+}
+
+
+def fileFormat(path):
+    '''
+    Returns "csv" or "jsonl" from the file name, ignoring a .gz ending. Standard output
+    ("-") has no name to go by and is written as JSONL.
+    '''
+    if path == "-":
+        return "jsonl"
+    name = path[:-3] if path.lower().endswith(".gz") else path
+    extension = os.path.splitext(name)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Can't tell the format of {path}; use a .csv or .jsonl file, or choose the format")
+
+
+def _open(path, compress):
+    if path == "-":
+        sys.stdout.flush()
+        if compress:
+            return gzip.open(sys.stdout.buffer, 'wt', newline='', encoding='utf-8', compresslevel=GZIP_LEVEL)
+        return open(sys.stdout.fileno(), 'w', newline='', encoding='utf-8', buffering=BUFFER_SIZE, closefd=False)
+    if compress:
+        return gzip.open(path, 'wt', newline='', encoding='utf-8', compresslevel=GZIP_LEVEL)
+    return open(path, 'w', newline='', encoding='utf-8', buffering=BUFFER_SIZE)
+
+
+def writeRows(rows, path, columns, file_format=None, compress=None):
+    '''
+    Writes rows to path as they are produced. The file is written next to path and moved
+    into place at the end, so a failed export leaves no half-written file behind.
+
+    Args:
+        rows (iterable): Sequences of values in columns order.
+        path (str): The output file, or "-" for standard output.
+        columns (list): The CSV header and JSONL keys.
+        file_format (str): "csv" or "jsonl"; taken from path if not given.
+        compress (bool): gzip the output; by default only when path ends in .gz.
+
+    Returns:
+        int: The number of rows written.
+    '''
+    file_format = file_format or fileFormat(path)
+    if compress is None:
+        compress = path.lower().endswith(".gz")
+    target = path if path == "-" else path + ".tmp"
+    count = 0
+    try:
+        with _open(target, compress) as f:
+            if file_format == "csv":
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+            else:
+                dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+                for row in rows:
+                    f.write(dumps(dict(zip(columns, row))))
+                    f.write("\n")
+                    count += 1
+    except BaseException:
+        if target != path:
+            try:
+                os.remove(target)
+            except FileNotFoundError:
+                pass
+        raise
+    if target != path:
+        os.replace(target, path)
+    return count
+
+
+def export(repository, kind, path, file_format=None, compress=None, classes=None, subject=None, min_mark=None, max_mark=None):
+    '''
+    Exports one kind of record from repository to path.
+
+    Args:
+        kind (str): "classes", "students", "marks" or "teachers".
+        classes (list): Only export these classes (teachers: who can open one of them).
+        subject, min_mark, max_mark: Only export students whose subject mark is in range.
+        The other arguments are those of writeRows.
+
+    Returns:
+        int: The number of rows written.
+
+    Raises:
+        ValueError: If kind, the format or a class is unknown, or the filter does not fit kind.
+    '''
+    if kind not in EXPORTS:
+        raise ValueError(f"Can't export {kind!r}; choose one of {', '.join(EXPORTS)}")
+    columns, rows = EXPORTS[kind]
+    if classes is not None:
+        classes = set(classes)
+    file_format = file_format or fileFormat(path)
+    rows = rows(repository, classes, MarkFilter(subject, min_mark, max_mark))
+    if kind == "teachers" and file_format == "csv":
+        rows = map(_joinLists, rows)
+    return writeRows(rows, path, columns, file_format, compress)
@@ -1,8 +1,10 @@
-from tkinter import filedialog
 import tkinter.messagebox as messagebox
-from PIL import Image, ImageTk
+from storage import atomicWriteJson
 import json
 
+# the main menu only needs the helpers at the top of this file; the file dialog and the
+# picture modules (PIL, worker pools) are imported by the functions that use them
+
 
 
 #border effect on hover
@@ -25,6 +27,14 @@ def showCopyrightClaim(ctk, frame_name):
     copyright_claim.place(relx=0.95, rely=0.95, anchor="se")
 
 
+def clearEntries(*entries):
+    '''Empties CTkEntry widgets so their placeholder text shows again.'''
+    for entry in entries:
+        # get() is "" while the placeholder is shown
+        if entry.get():
+            entry.delete(0, "end")
+
+
 def showErrorMessage(message):
     messagebox.showerror("Error!", message)
 
@@ -33,50 +43,80 @@ def showInfo(message):
 
 
 def uploadImage(self, filename):
+    from tkinter import filedialog
+    from photo_store import getPhotoStore
+
     file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.jpg;*.jpeg;*.png")])
     if file_path:
-        try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
+        # copied into the photo store and rendered in the background; the label is
+        # updated and the reference saved once that is done
+        if self.profile_loading is not None:
+            self.profile_loading.cancel()
+        self.profile_loading = getPhotoStore().ingestAsync(
+            self.profile_picture_label.winfo_toplevel(),
+            file_path,
+            lambda reference: saveProfileImage(self, filename, reference)
+        )
+
+
+def saveProfileImage(self, filename, reference):
+    """
+    Saves an uploaded picture's photo store reference as the profile_pic of a JSON file and shows it.
 
-            data['profile_pic'] = file_path  # Update the profile_pic path
+    Args:
+        filename (str): The JSON file holding profile_pic.
+        reference (str): The picture's photo store reference.
+    """
+    from photo_store import getPhotoStore
 
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=4)
+    try:
+        with open(filename, 'r') as f:
+            data = json.load(f)
+
+        data['profile_pic'] = reference  # Update the profile_pic reference
+
+        atomicWriteJson(filename, data)
+
+        # Update the label to show the profile picture
+        showProfileImage(self.profile_picture_label, getPhotoStore().photo(reference))
 
-            image = Image.open(file_path)
-            image = image.resize((200, 200), Image.Resampling.LANCZOS)
-            self.profile_image = ImageTk.PhotoImage(image)
+    except FileNotFoundError:
+        showErrorMessage("The admin_id.json file does not exist.")
 
-            # Update the label to show the profile picture
-            self.profile_picture_label.configure(image=self.profile_image, text="")
+    except json.JSONDecodeError:
+        showErrorMessage("Error reading the admin_id.json file.")
 
-        except FileNotFoundError:
-            showErrorMessage("The admin_id.json file does not exist.")
 
-        except json.JSONDecodeError:
-            showErrorMessage("Error reading the admin_id.json file.")
+def showProfileImage(label, photo):
+    if label.winfo_exists():
+        label.configure(image=photo, text="")
+        label.image = photo  # Keep a reference to avoid garbage collection
 
 
 def loadProfileImage(filename, label):
     """
-    Loads the profile image from a JSON file if it exists and sets it to a label.
+    Loads the profile image from a JSON file if it exists and sets it to a label. A picture
+    in the photo store is one small file and is shown at once; a picture still given as a
+    path is decoded in the background and shown when it is ready.
     
     Args:
-        filename (str): The JSON file containing the profile image path.
+        filename (str): The JSON file containing the profile image reference or path.
         label (tk.Label): The Tkinter label where the image will be displayed.
+
+    Returns:
+        PendingPhoto: Cancel it if the screen is left before the picture shows, or None.
     """
+    from photo_store import getPhotoStore, isStoreReference
+    from thumbnails import getThumbnailCache
+
     try:
         with open(filename, 'r') as f:
             data = json.load(f)
             file_path = data.get('profile_pic')
-            if file_path:
-                image = Image.open(file_path)
-                image = image.resize((200, 200), Image.Resampling.LANCZOS)
-                profile_image = ImageTk.PhotoImage(image)
-                label.configure(image=profile_image, text="")
-                label.image = profile_image  # Keep a reference to avoid garbage collection
+            if isStoreReference(file_path):
+                showProfileImage(label, getPhotoStore().photo(file_path))
+            elif file_path:
+                return getThumbnailCache().photoAsync(label.winfo_toplevel(), file_path, lambda photo: showProfileImage(label, photo))
     except (FileNotFoundError, json.JSONDecodeError):
         print(f"{filename} not found or corrupted")
-
-
+    return None
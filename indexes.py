@@ -0,0 +1,105 @@
+class StudentIndex:
+    '''
+    Lookup tables over a parsed classes.json document.
+
+    The index holds references into the document, so it stays valid for as long as the
+    document it was built from is the one being served.
+
+    Attributes:
+        document (dict): The classes.json document the index was built from.
+        classes (dict): Class name -> class dict.
+        students (dict): Student ID -> (class name, position in the class's students list).
+
+    Methods:
+        __init__(self, data): Builds both tables from a classes.json document.
+        addClass(self, class_data): Indexes a class and all of its students.
+        addStudent(self, class_name, student): Indexes a student already appended to its class.
+        reindex(self): Rebuilds the student table after students moved between classes.
+        getClass(self, class_name): Returns the class dict or None.
+        findStudent(self, student_id, class_name=None): Returns the student dict or None.
+    '''
+
+    def __init__(self, data):
+        self.document = data
+        self.classes = {}
+        self.students = {}
+        for class_data in data.get("classes", []):
+            self.addClass(class_data)
+
+    def addClass(self, class_data):
+        class_name = class_data["class"]
+        self.classes[class_name] = class_data
+        for position, student in enumerate(class_data["students"]):
+            self.students[student["ID"]] = (class_name, position)
+
+    def addStudent(self, class_name, student):
+        position = len(self.classes[class_name]["students"]) - 1
+        self.students[student["ID"]] = (class_name, position)
+
+    def reindex(self):
+        self.students = {}
+        for class_data in self.document.get("classes", []):
+            self.addClass(class_data)
+
+    def getClass(self, class_name):
+        return self.classes.get(class_name)
+
+    def findStudent(self, student_id, class_name=None):
+        '''
+        Returns the student with the given ID, or None.
+
+        Args:
+            student_id (str): The student's ID.
+            class_name (str): If given, the student must belong to this class.
+        '''
+        entry = self.students.get(student_id)
+        if entry is not None and (class_name is None or entry[0] == class_name):
+            return self.classes[entry[0]]["students"][entry[1]]
+
+        if entry is None or class_name not in self.classes:
+            return None
+
+        # the same ID is reused in another class; only then fall back to a scan
+        return next((student for student in self.classes[class_name]["students"] if student["ID"] == student_id), None)
+
+
+class TeacherDirectory:
+    '''
+    Lookup tables over a parsed teachers.json document.
+
+    Attributes:
+        document (dict): The teachers.json document the directory was built from.
+        teachers (dict): Teacher id -> teacher dict.
+        by_class (dict): Class name -> {teacher id: teacher dict} for every teacher whose
+            "accessed class" list contains that class.
+
+    Methods:
+        __init__(self, data): Builds the tables from a teachers.json document.
+        addTeacher(self, teacher): Indexes a teacher already appended to the document.
+        getTeacher(self, teacher_id): Returns the teacher dict or None.
+        teachersForClass(self, class_name): Returns the teachers who can access a class.
+    '''
+
+    def __init__(self, data):
+        self.document = data
+        self.teachers = {}
+        self.by_class = {}
+        for teacher in data.get("teachers", []):
+            self.addTeacher(teacher)
+
+    def __contains__(self, teacher_id):
+        return teacher_id in self.teachers
+
+    def __len__(self):
+        return len(self.teachers)
+
+    def addTeacher(self, teacher):
+        self.teachers[teacher["id"]] = teacher
+        for class_name in teacher.get("accessed class", []):
+            self.by_class.setdefault(class_name, {})[teacher["id"]] = teacher
+
+    def getTeacher(self, teacher_id):
+        return self.teachers.get(teacher_id)
+
+    def teachersForClass(self, class_name):
+        return list(self.by_class.get(class_name, {}).values())
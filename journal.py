@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from storage import jsonDefault
+
+
+class Journal:
+    '''
+    Append-only write-ahead log of changes to classes.json.
+
+    Each change is one compact JSON line carrying a sequence number. The snapshot
+    (classes.json) records the last sequence number folded into it as "journal_seq", so
+    replaying after an interrupted compaction never applies a change twice.
+
+    Attributes:
+        path (str): The journal file.
+        seq (int): Sequence number of the last record written or replayed.
+        count (int): Number of records currently in the journal file.
+
+    Methods:
+        fileKey(self): Returns (mtime, size) of the journal, used to detect outside changes.
+        replay(self, index, apply): Applies every record newer than the snapshot.
+        append(self, record): Adds a record and commits it unless a group is open.
+        group(self): Context manager that commits all records appended inside it at once.
+        commit(self): Writes and fsyncs the buffered records.
+        reset(self, seq): Empties the journal after its records were folded into the snapshot.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.seq = 0
+        self.count = 0
+        self._pending = []
+        self._depth = 0
+        self._lock = threading.RLock()
+
+    def fileKey(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return (0, 0)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def replay(self, index, apply):
+        '''
+        Applies the journal on top of a freshly loaded snapshot.
+
+        A torn last line (a crash in the middle of an append) is cut off so later appends
+        start on a clean line.
+
+        Args:
+            index (StudentIndex): Index over the snapshot document.
+            apply (callable): apply(index, record), normally mutations.applyMutation.
+        '''
+        with self._lock:
+            base = index.document.get("journal_seq", 0)
+            self.seq = base
+            self.count = 0
+            good_size = 0
+            try:
+                with open(self.path, 'rb') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            break
+                        good_size += len(line)
+                        self.count += 1
+                        if record["seq"] <= base:
+                            continue
+                        try:
+                            apply(index, record)
+                        except ValueError as e:
+                            # the record was valid when written; keep going like the live app would
+                            print(f"Skipping journal record {record['seq']}: {e}")
+                        self.seq = record["seq"]
+            except FileNotFoundError:
+                return
+
+            if good_size != os.path.getsize(self.path):
+                with open(self.path, 'r+b') as f:
+                    f.truncate(good_size)
+
+    def append(self, record):
+        with self._lock:
+            self.seq += 1
+            # serialized now: the record may share objects with the live document, which
+            # later changes in the same group would otherwise leak into
+            self._pending.append(json.dumps(dict(record, seq=self.seq), separators=(',', ':'), default=jsonDefault) + "\n")
+            if self._depth == 0:
+                self.commit()
+
+    @contextmanager
+    def group(self):
+        '''
+        Group commit: everything appended inside the block is written with a single
+        write and fsync when the outermost block exits, or dropped if it raises.
+        '''
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self
+            except Exception:
+                if self._depth == 1:
+                    # all or nothing: drop the whole group
+                    self.seq -= len(self._pending)
+                    self._pending.clear()
+                raise
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.commit()
+
+    def commit(self):
+        with self._lock:
+            if not self._pending:
+                return
+            lines = "".join(self._pending)
+            pending = len(self._pending)
+            self._pending.clear()
+            with open(self.path, 'a') as f:
+                start = f.tell()
+                try:
+                    f.write(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                except Exception:
+                    # drop the partial group so the next append starts on a clean line
+                    f.truncate(start)
+                    self.seq -= pending
+                    raise
+            self.count += pending
+
+    def reset(self, seq):
+        '''
+        Empties the journal once the snapshot holds everything up to seq.
+        '''
+        with self._lock:
+            with open(self.path, 'w') as f:
+                f.flush()
+                os.fsync(f.fileno())
+            self.seq = seq
+            self.count = 0
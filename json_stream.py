@@ -0,0 +1,272 @@
+'''
+Incremental lookups in classes.json that stop as soon as the answer is found, and
+iteration over every student of the file for exports.
+
+Only the class or student being looked for is ever fully decoded; everything else is
+decoded one student at a time and dropped, so memory stays bounded by the largest single
+student record plus the read buffer, however big the file is.
+'''
+import json
+
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class _Reader:
+    '''
+    A read buffer over a text file with just enough JSON tokenizing to walk objects and
+    arrays. Values are decoded with json.JSONDecoder.raw_decode, refilling the buffer when a
+    value runs past its end.
+    '''
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # drop what was already consumed so the buffer does not grow with the file
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise json.JSONDecodeError("Unexpected end of file", self.buffer, self.pos)
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expected {char!r}", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self):
+        '''Decodes the next complete JSON value.'''
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.pos == 0:
+                    # the value is bigger than the buffer; read more at a time so it is
+                    # not re-decoded once per chunk
+                    self.chunk_size *= 2
+                if self._fill():
+                    continue
+                raise
+            # a number that ends exactly at the buffer end may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def items(self):
+        '''Yields the keys of the object at the current position; the caller must consume each value.'''
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect('}')
+            return
+
+    def elements(self):
+        '''Yields once per element of the array at the current position; the caller must consume each element.'''
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(']')
+            return
+
+    def skip(self):
+        '''
+        Consumes the next value. Arrays are decoded one element at a time (each element in C
+        via raw_decode) and objects one member at a time, so only one piece is held at once.
+        '''
+        char = self.peek()
+        if char == '{':
+            for _ in self.items():
+                self.value()
+        elif char == '[':
+            for _ in self.elements():
+                self.value()
+        else:
+            self.value()
+
+
+def _classes(reader):
+    '''Positions reader at each class object of the top-level "classes" array in turn.'''
+    for key in reader.items():
+        if key != "classes":
+            reader.skip()
+            continue
+        for _ in reader.elements():
+            yield
+        return
+
+
+def _scanClass(reader, class_name, student_id=None):
+    '''
+    Walks one class object.
+
+    Returns:
+        tuple: (matched, class_data, student). With student_id set, class_data is None and
+            student is the matching student of the matching class, if any.
+    '''
+    name = None
+    students = None
+    student = None
+    for key in reader.items():
+        if key == "class":
+            name = reader.value()
+        elif key == "students" and name is not None and name != class_name:
+            reader.skip()
+        elif key == "students" and name is not None and student_id is not None:
+            for _ in reader.elements():
+                candidate = reader.value()
+                if candidate.get("ID") == student_id:
+                    # nothing after this point is needed
+                    return True, None, candidate
+        elif key == "students":
+            # the class name is not known yet (or the whole class is wanted)
+            students = reader.value()
+        else:
+            reader.skip()
+
+    if name != class_name:
+        return False, None, None
+    if student_id is None:
+        return True, {"class": name, "students": students if students is not None else []}, None
+    if students is not None:
+        student = next((s for s in students if s.get("ID") == student_id), None)
+    return True, None, student
+
+
+def findClass(filename, class_name):
+    '''
+    Returns the class dict for class_name, or None, without loading the other classes.
+
+    Raises FileNotFoundError and json.JSONDecodeError like json.load.
+    '''
+    with open(filename, 'r') as f:
+        reader = _Reader(f)
+        for _ in _classes(reader):
+            matched, class_data, _student = _scanClass(reader, class_name)
+            if matched:
+                return class_data
+    return None
+
+
+def hasClass(filename, class_name):
+    '''
+    True if class_name exists. Students are skipped without being kept.
+    '''
+    with open(filename, 'r') as f:
+        reader = _Reader(f)
+        for _ in _classes(reader):
+            for key in reader.items():
+                if key == "class":
+                    if reader.value() == class_name:
+                        return True
+                else:
+                    reader.skip()
+    return False
+
+
+def findStudent(filename, class_name, student_id):
+    '''
+    Returns the student with student_id in class_name, or None. Stops reading as soon as
+    the class has been scanned.
+    '''
+    with open(filename, 'r') as f:
+        reader = _Reader(f)
+        for _ in _classes(reader):
+            matched, _class_data, student = _scanClass(reader, class_name, student_id)
+            if matched:
+                return student
+    return None
+
+
+def _values(reader):
+    '''Yields the elements of the array at the current position, decoded one at a time.'''
+    for _ in reader.elements():
+        yield reader.value()
+
+
+def _walkClass(reader, class_names=None):
+    '''
+    Walks one class object, yielding (class name, students) once if the class is wanted.
+    Whatever the caller leaves of students is skipped before the walk goes on.
+    '''
+    name = None
+    students = None
+    done = False
+    for key in reader.items():
+        if key == "class":
+            name = reader.value()
+        elif key == "students" and name is not None:
+            done = True
+            if class_names is not None and name not in class_names:
+                reader.skip()
+                continue
+            students = _values(reader)
+            yield name, students
+            for _ in students:
+                pass
+        elif key == "students":
+            # the class name is not known yet, so the students have to be kept
+            students = reader.value()
+        else:
+            reader.skip()
+
+    if not done and name is not None and (class_names is None or name in class_names):
+        yield name, iter(students if students is not None else [])
+
+
+def iterClasses(filename, class_names=None):
+    '''
+    Yields (class name, students) for every class of classes.json, or only those in
+    class_names, in file order. students is an iterator of student dicts decoded one at a
+    time; it is only valid until the next class is asked for.
+
+    Raises FileNotFoundError and json.JSONDecodeError like json.load.
+    '''
+    with open(filename, 'r') as f:
+        reader = _Reader(f)
+        for _ in _classes(reader):
+            yield from _walkClass(reader, class_names)
+
+
+def iterClass(filename):
+    '''
+    Like iterClasses, for a file holding one class object (a shard of ShardedRepository).
+    '''
+    with open(filename, 'r') as f:
+        yield from _walkClass(_Reader(f))
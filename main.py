@@ -1,14 +1,31 @@
 import customtkinter as ctk
+import threading
+from importlib import import_module
 from functions import onEnter, onLeave, showCopyrightClaim
-from student_login import StudentLogin
-from teacher_login import TeacherLogin
-from admin_login import AdminLogin
-from credentials import Credentials
+from screen_manager import Screen, ScreenManager
+from window_manager import WindowManager
+from settings import getSetting
 
 
 ctk.set_appearance_mode("dark") #options: "light", "dark", "system"
 ctk.set_default_color_theme("blue")  # Options: "blue", "green", "dark-blue"
 
+# screen name -> (module, class); a screen's module is imported when it is first opened,
+# so drawing the main menu does not load the login and account screens
+SCREENS = {
+    "student_login": ("student_login", "StudentLogin"),
+    "teacher_login": ("teacher_login", "TeacherLogin"),
+    "admin_login": ("admin_login", "AdminLogin"),
+    "credentials": ("credentials", "Credentials"),
+}
+
+# imported in the background after the main menu is drawn, with "warm_imports" on
+WARM_MODULES = [
+    "student_login", "teacher_login", "admin_login", "credentials",
+    "student_account", "teacher_account", "admin_account",
+    "thumbnails", "photo_store", "tkinter.filedialog",
+]
+
 class App(ctk.CTk):
 
     '''
@@ -17,13 +34,18 @@ class App(ctk.CTk):
     Attributes:
         main_frame (CTkFrame): The main frame that holds all the main menu widgets.
         button_font (tuple): Font style used for the buttons.
+        screens (ScreenManager): Builds the menu, login and credentials screens once and switches between them.
+        windows (WindowManager): Opens the accounts' dialogs as windows of this one root and reuses them.
 
     Methods:
-        create_main_frame(): Creates the main menu frame with buttons for login and privacy policy.
+        create_main_frame(): Shows the main menu, building it on first use.
+        buildMainFrame(): Creates the main menu frame with buttons for login and privacy policy.
         openStudentLogin(): Opens the student login interface.
         openTeacherLogin(): Opens the teacher login interface.
         openAdminLogin(): Opens the admin login interface.
         openCredentials(): Opens the privacy and policy information.
+        buildScreen(name): Imports a screen's module and builds the screen.
+        warmImports(): Imports the other screens' modules in a background thread.
     '''
 
     def __init__(self):
@@ -45,21 +67,40 @@ class App(ctk.CTk):
         self.minsize(400, 300)
 
 
+        # screens are built on first use and then only shown and hidden
+        self.screens = ScreenManager(getSetting("screen_cache_size"))
+        self.screens.register("main", self.buildMainFrame, pinned=True)
+        for name in SCREENS:
+            self.screens.register(name, lambda name=name: self.buildScreen(name))
+
+        # dialogs are CTkToplevels of this window, not new CTk roots
+        self.windows = WindowManager(self, ctk)
+
         # Create the main frame
         self.main_frame = None
         self.create_main_frame()
 
+        # once the menu is on screen, load the rest so the first click does not wait for it
+        if getSetting("warm_imports"):
+            self.after_idle(self.warmImports)
+
 
     def create_main_frame(self):
+        '''
+        Shows the main menu. Account screens call this on logout; the menu is only built once.
+        '''
+        self.screens.show("main")
+
+
+    def buildMainFrame(self):
         '''
         Creates the main menu frame with buttons for logging in as a student, teacher, or admin,
         and for viewing privacy and policy information.
-        '''
-        if self.main_frame is not None:
-            self.main_frame.destroy()
 
+        Returns:
+            Screen: The main menu screen.
+        '''
         self.main_frame = ctk.CTkFrame(self, width=800, height=500, border_width = 2, border_color = "white")
-        self.main_frame.place(relx=0.5, rely=0.5, anchor="center")
 
         # copyright claim 
         showCopyrightClaim(ctk, self.main_frame)
@@ -140,34 +181,63 @@ class App(ctk.CTk):
         self.credentials.bind("<Enter>", lambda event: onEnter(event, self.credentials))
         self.credentials.bind("<Leave>", lambda event: onLeave(event, self.credentials))
 
+        return Screen(self.main_frame)
+
+
+    def buildScreen(self, name):
+        '''
+        Imports the module of a screen listed in SCREENS and builds the screen.
+
+        Args:
+            name (str): The screen's name.
+
+        Returns:
+            Screen: The new screen.
+        '''
+        module, class_name = SCREENS[name]
+        screen_class = getattr(import_module(module), class_name)
+        return screen_class(self, ctk, buttonFont=self.button_font)
+
+
+    def warmImports(self):
+        '''
+        Imports the login and account modules in a daemon thread. Imports only run module
+        code, no Tk calls, so this is safe off the Tk thread; a screen opened meanwhile
+        waits for its module like it would without the warm-up.
+        '''
+        def warm():
+            for module in WARM_MODULES:
+                try:
+                    import_module(module)
+                except ImportError as e:
+                    print(f"Could not preload {module}: {e}")
+
+        threading.Thread(target=warm, name="warm-imports", daemon=True).start()
+
 
     def openStudentLogin(self):
         """
-        Destroys the main frame and opens the student login interface.
+        Hides the main frame and opens the student login interface.
         """
-        self.main_frame.destroy()
-        StudentLogin(self, ctk, buttonFont=self.button_font)
+        self.screens.show("student_login")
 
     def openTeacherLogin(self):
         """
-        Destroys the main frame and opens the teacher login interface.
+        Hides the main frame and opens the teacher login interface.
         """
-        self.main_frame.destroy()
-        TeacherLogin(self, ctk, buttonFont=self.button_font)
+        self.screens.show("teacher_login")
 
     def openAdminLogin(self):
         """
-        Destroys the main frame and opens the admin login interface.
+        Hides the main frame and opens the admin login interface.
         """
-        self.main_frame.destroy()
-        AdminLogin(self, ctk, buttonFont=self.button_font)
+        self.screens.show("admin_login")
 
     def openCredentials(self):
         """
-        Destroys the main frame and opens the privacy and policy information interface.
+        Hides the main frame and opens the privacy and policy information interface.
         """
-        self.main_frame.destroy()
-        Credentials(self, ctk, buttonFont=self.button_font)
+        self.screens.show("credentials")
 
 
 # create and run the app
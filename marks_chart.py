@@ -0,0 +1,93 @@
+from marks_store import SUBJECTS
+
+
+class MarksChart:
+    '''
+    One canvas drawing a bar per subject: the subject's name, its mark as a percentage and a
+    bar filled up to the mark, like the label, progress bar and percentage label the student
+    screen used to create for every subject.
+
+    The canvas items are created once; setMarks() only moves the bars and changes the texts,
+    so a chart can be kept and redrawn for another student or after a mark changes.
+
+    Attributes:
+        ctk (module): CustomTkinter module used for custom widgets.
+        subjects (list): The subjects shown, top to bottom.
+        marks (dict): Subject -> mark currently drawn.
+        canvas (CTkCanvas): The canvas everything is drawn on; place it like any widget.
+
+    Methods:
+        place(self, **kwargs): Places the chart in its master.
+        destroy(self): Destroys the chart.
+        setMarks(self, marks): Redraws the bars for new marks.
+    '''
+
+    def __init__(self, master, ctk, marks=None, font=('Arial', 20, 'bold'), subjects=SUBJECTS, width=718, height=646,
+                 bar_width=300, bar_height=25, fg_color='black'):
+        '''
+        Args:
+            master (widget): The parent widget.
+            ctk (module): CustomTkinter module used for custom widgets.
+            marks (Mapping): Subject -> mark; missing subjects show 0.
+            font (font): Font of the subject names and percentages.
+            subjects (list): The subjects to show, top to bottom.
+            width (int): Width of the chart.
+            height (int): Height of the chart.
+            bar_width (int): Length of a full (100%) bar.
+            bar_height (int): Thickness of the bars.
+            fg_color (str): Background colour.
+        '''
+        self.ctk = ctk
+        self.subjects = list(subjects)
+        self.marks = {}
+        self.width = width
+        self.bar_width = bar_width
+        self.bar_height = bar_height
+
+        # the progress bar colours of the current theme, like CTkProgressBar
+        theme = self.ctk.ThemeManager.theme["CTkProgressBar"]
+        shade = 1 if self.ctk.get_appearance_mode() == "Dark" else 0
+        self.trough_color = theme["fg_color"][shade]
+        self.progress_color = theme["progress_color"][shade]
+
+        self.canvas = self.ctk.CTkCanvas(master, width=width, height=height, bg=fg_color, highlightthickness=0)
+
+        # one row per subject, bars at the right like the old progress bars
+        row_height = height / max(1, len(self.subjects))
+        self.bar_left = width * 0.75 - bar_width / 2
+        self._rows = {}
+        for position, subject in enumerate(self.subjects):
+            middle = row_height * (position + 0.5)
+            top = middle - bar_height / 2
+            self.canvas.create_text(width * 0.02, middle, text=subject, anchor="w", font=font, fill="white")
+            percent = self.canvas.create_text(width * 0.45, middle, text="0%", anchor="w", font=font, fill="white")
+            self.canvas.create_rectangle(self.bar_left, top, self.bar_left + bar_width, top + bar_height,
+                                         fill=self.trough_color, outline="white", width=2)
+            fill = self.canvas.create_rectangle(self.bar_left, top, self.bar_left, top + bar_height,
+                                                fill=self.progress_color, width=0)
+            self._rows[subject] = (percent, fill, top)
+
+        self.setMarks(marks or {})
+
+    def place(self, **kwargs):
+        self.canvas.place(**kwargs)
+
+    def destroy(self):
+        self.canvas.destroy()
+
+    def setMarks(self, marks):
+        '''
+        Redraws the chart for marks, changing only the rows whose mark changed.
+
+        Args:
+            marks (Mapping): Subject -> mark; missing subjects show 0.
+        '''
+        for subject, (percent, fill, top) in self._rows.items():
+            mark = marks.get(subject, 0)
+            if self.marks.get(subject) == mark:
+                continue
+            self.marks[subject] = mark
+            self.canvas.itemconfigure(percent, text=f"{mark}%")
+            share = min(max(float(mark) / 100.0, 0.0), 1.0)
+            # inset by the trough's border so the fill sits inside it
+            self.canvas.coords(fill, self.bar_left + 2, top + 2, self.bar_left + 2 + (self.bar_width - 4) * share, top + self.bar_height - 2)
@@ -0,0 +1,363 @@
+from marks_store import SUBJECTS, parseMark
+import services
+
+
+class MarksSheet:
+    '''
+    The marks of one class being edited as a table: a row per student, a column per
+    subject. Each cell edit is checked as it is made and kept until save(), which writes
+    every changed cell in one batch instead of one save per mark.
+
+    Attributes:
+        class_name (str): The class the students belong to.
+        students (list): The Student records, one per row.
+        subjects (list): The subjects, one per column.
+        saved (list): Per row, subject -> mark as last loaded or saved.
+        edits (dict): (row, subject) -> text of every cell that differs from saved.
+        errors (dict): (row, subject) -> message for every edited cell that is not a valid mark.
+
+    Methods:
+        text(self, row, subject): Returns the text shown in a cell.
+        setText(self, row, subject, text): Edits a cell. Returns the cell's error message or None.
+        revert(self, row, subject): Drops the edit of a cell.
+        isDirty(self, row, subject): True if the cell has an unsaved edit.
+        isInvalid(self, row, subject): True if the cell's edit is not a valid mark.
+        dirtyCount(self): Number of edited cells.
+        changes(self): Returns the (roll, subject, mark) of every edited cell.
+        save(self): Saves every edited cell in one batch.
+    '''
+
+    def __init__(self, class_name, students, subjects=SUBJECTS):
+        self.class_name = class_name
+        self.students = list(students)
+        self.subjects = list(subjects)
+        self.saved = [{subject: student.marks.get(subject) for subject in self.subjects} for student in self.students]
+        self.edits = {}
+        self.errors = {}
+
+    def text(self, row, subject):
+        if (row, subject) in self.edits:
+            return self.edits[(row, subject)]
+        mark = self.saved[row][subject]
+        return "" if mark is None else str(mark)
+
+    def setText(self, row, subject, text):
+        '''
+        Args:
+            row (int): The student's row.
+            subject (str): The subject's column.
+            text (str): The text typed into the cell.
+
+        Returns:
+            str: Why text is not a valid mark, or None if it is.
+        '''
+        key = (row, subject)
+        self.errors.pop(key, None)
+        mark = self.saved[row][subject]
+        if text.strip() == ("" if mark is None else str(mark)):
+            self.edits.pop(key, None)
+            return None
+        self.edits[key] = text
+        try:
+            parseMark(text, subject)
+        except ValueError as e:
+            self.errors[key] = f"Roll {self.students[row].roll}, {e}"
+            return self.errors[key]
+        return None
+
+    def revert(self, row, subject):
+        self.edits.pop((row, subject), None)
+        self.errors.pop((row, subject), None)
+
+    def isDirty(self, row, subject):
+        return (row, subject) in self.edits
+
+    def isInvalid(self, row, subject):
+        return (row, subject) in self.errors
+
+    def dirtyCount(self):
+        return len(self.edits)
+
+    def changes(self):
+        return [(self.students[row].roll, subject, parseMark(text, subject)) for (row, subject), text in self.edits.items()]
+
+    def save(self):
+        '''
+        Writes every edited cell in one batch and marks them saved.
+
+        Returns:
+            int: Number of marks saved.
+
+        Raises:
+            ValueError: If a cell is not a valid mark, or the class or a roll no longer
+                exists; nothing is saved then.
+        '''
+        if self.errors:
+            raise ValueError(f"{len(self.errors)} marks are not valid, e.g.\n{next(iter(self.errors.values()))}")
+        changes = self.changes()
+        if changes:
+            services.setMarks(self.class_name, changes)
+        for (row, subject), text in self.edits.items():
+            self.saved[row][subject] = parseMark(text, subject)
+        self.edits.clear()
+        return len(changes)
+
+
+class MarksGrid:
+    '''
+    A spreadsheet of a MarksSheet drawn on one canvas, with a single entry that moves from
+    cell to cell instead of an entry widget per cell. Edited cells are shaded until saved
+    and cells holding something that is not a mark are shown in red.
+
+    Keys: Enter or Down moves to the next student, Up to the previous one, Tab and
+    Shift-Tab to the next and previous subject (Left and Right too at the ends of the
+    text), Escape undoes the cell's edit and Ctrl-S calls on_save. Typing replaces the
+    selected mark.
+
+    Attributes:
+        ctk (module): CustomTkinter module used for custom widgets.
+        sheet (MarksSheet): The marks shown and edited.
+        row (int): Row of the cell being edited.
+        column (int): Column of the cell being edited.
+        frame (CTkFrame): Outer frame; place it like any widget.
+        canvas (CTkCanvas): The scrolling canvas the cells are drawn on.
+        editor (CTkEntry): The entry over the cell being edited.
+
+    Methods:
+        place(self, **kwargs): Places the grid in its master.
+        destroy(self): Destroys the grid.
+        setSheet(self, sheet): Shows another sheet and starts editing its first cell.
+        focusCell(self, row, column): Moves the entry to a cell.
+        commitEditor(self): Hands the entry's text to the sheet.
+        redraw(self): Redraws every cell from the sheet.
+    '''
+
+    SCROLLBAR_WIDTH = 16
+    NORMAL_COLOR = 'black'
+    DIRTY_COLOR = '#1f4e79'
+    INVALID_COLOR = '#8b1a1a'
+
+    def __init__(self, master, ctk, sheet, font, width=1100, height=560, name_width=230, cell_width=84, row_height=30,
+                 header_height=56, on_change=None, on_save=None):
+        '''
+        Args:
+            master (widget): The parent widget.
+            ctk (module): CustomTkinter module used for custom widgets.
+            sheet (MarksSheet): The marks to show.
+            font (font): Font of the cells.
+            width (int): Width of the grid, scrollbar included.
+            height (int): Height of the grid, header included.
+            name_width (int): Width of the roll and name column.
+            cell_width (int): Width of a mark cell.
+            row_height (int): Height of a row.
+            header_height (int): Height of the subject names above the cells.
+            on_change (callable): Called with the error message (or None) after a cell is edited.
+            on_save (callable): Called when Ctrl-S is pressed.
+        '''
+        self.ctk = ctk
+        self.font = font
+        self.name_width = name_width
+        self.cell_width = cell_width
+        self.row_height = row_height
+        self.header_height = header_height
+        self.on_change = on_change
+        self.on_save = on_save
+        self.row = 0
+        self.column = 0
+
+        self.frame = self.ctk.CTkFrame(master, width=width, height=height, fg_color=self.NORMAL_COLOR)
+        view_width = width - self.SCROLLBAR_WIDTH
+        view_height = height - header_height
+
+        self.header = self.ctk.CTkCanvas(self.frame, width=view_width, height=header_height, bg=self.NORMAL_COLOR, highlightthickness=0)
+        self.header.place(x=0, y=0)
+        self.header.create_text(6, header_height / 2, text="Roll   Name", anchor="w", font=font, fill="white")
+
+        self.canvas = self.ctk.CTkCanvas(self.frame, width=view_width, height=view_height, bg=self.NORMAL_COLOR, highlightthickness=0)
+        self.canvas.place(x=0, y=header_height)
+        self.scrollbar = self.ctk.CTkScrollbar(self.frame, height=view_height, command=self.canvas.yview)
+        self.scrollbar.place(x=view_width, y=header_height)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+
+        self.canvas.bind("<Button-1>", self.onClick)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.bind(sequence, self.onMouseWheel)
+
+        self.editor = self.ctk.CTkEntry(self.canvas, width=cell_width, height=row_height, font=font, corner_radius=0, border_width=2, justify="center")
+        self._editor_item = None
+        bindings = {
+            "<Return>": lambda event: self.move(1, 0),
+            "<KP_Enter>": lambda event: self.move(1, 0),
+            "<Down>": lambda event: self.move(1, 0),
+            "<Up>": lambda event: self.move(-1, 0),
+            "<Tab>": lambda event: self.move(0, 1),
+            "<Shift-Tab>": lambda event: self.move(0, -1),
+            "<ISO_Left_Tab>": lambda event: self.move(0, -1),
+            "<Left>": lambda event: self.move(0, -1) if self.editor.index("insert") == 0 and not self.editor.select_present() else None,
+            "<Right>": lambda event: self.move(0, 1) if self.editor.index("insert") == len(self.editor.get()) and not self.editor.select_present() else None,
+            "<Escape>": self.onEscape,
+            "<Control-s>": self.onSave,
+        }
+        for sequence, command in bindings.items():
+            self.editor.bind(sequence, command)
+
+        self.setSheet(sheet)
+
+    def place(self, **kwargs):
+        self.frame.place(**kwargs)
+
+    def destroy(self):
+        self.frame.destroy()
+
+    def setSheet(self, sheet):
+        '''
+        Draws sheet's header and cells and puts the entry on the first cell.
+        '''
+        self.sheet = sheet
+        self.header.delete("subject")
+        self.canvas.delete("cell")
+        for column, subject in enumerate(sheet.subjects):
+            self.header.create_text(self.name_width + (column + 0.5) * self.cell_width, self.header_height / 2,
+                                    text=subject, width=self.cell_width - 4, justify="center", font=('Arial', 11, 'bold'),
+                                    fill="white", tags="subject")
+
+        self._cells = {}
+        for row, student in enumerate(sheet.students):
+            top = row * self.row_height
+            self.canvas.create_text(6, top + self.row_height / 2, text=f"{student.roll}   {student.name}", anchor="w",
+                                    width=self.name_width - 8, font=self.font, fill="white", tags="cell")
+            for column in range(len(sheet.subjects)):
+                left = self.name_width + column * self.cell_width
+                rectangle = self.canvas.create_rectangle(left, top, left + self.cell_width, top + self.row_height,
+                                                         outline="#555555", tags="cell")
+                text = self.canvas.create_text(left + self.cell_width / 2, top + self.row_height / 2, font=self.font,
+                                               fill="white", tags="cell")
+                self._cells[(row, column)] = (rectangle, text)
+                self.redrawCell(row, column)
+
+        width = self.name_width + len(sheet.subjects) * self.cell_width
+        self.canvas.configure(scrollregion=(0, 0, width, max(1, len(sheet.students)) * self.row_height))
+        self.canvas.yview_moveto(0)
+        self.row = self.column = 0
+        if sheet.students:
+            self.focusCell(0, 0, commit=False)
+        elif self._editor_item is not None:
+            self.canvas.itemconfigure(self._editor_item, state="hidden")
+
+    def redrawCell(self, row, column):
+        subject = self.sheet.subjects[column]
+        rectangle, text = self._cells[(row, column)]
+        if self.sheet.isInvalid(row, subject):
+            fill = self.INVALID_COLOR
+        elif self.sheet.isDirty(row, subject):
+            fill = self.DIRTY_COLOR
+        else:
+            fill = self.NORMAL_COLOR
+        self.canvas.itemconfigure(rectangle, fill=fill)
+        self.canvas.itemconfigure(text, text=self.sheet.text(row, subject))
+
+    def redraw(self):
+        for row, column in self._cells:
+            self.redrawCell(row, column)
+
+    def commitEditor(self):
+        '''
+        Hands the entry's text to the sheet if it changed and redraws the cell.
+
+        Returns:
+            str: The cell's error message, or None.
+        '''
+        if not self.sheet.students:
+            return None
+        subject = self.sheet.subjects[self.column]
+        text = self.editor.get()
+        if text == self.sheet.text(self.row, subject):
+            return self.sheet.errors.get((self.row, subject))
+        error = self.sheet.setText(self.row, subject, text)
+        self.redrawCell(self.row, self.column)
+        if self.on_change is not None:
+            self.on_change(error)
+        return error
+
+    def focusCell(self, row, column, commit=True):
+        '''
+        Moves the entry to the cell at row, column, scrolling it into view, and selects its
+        text so typing replaces it.
+
+        Args:
+            row (int): The student's row.
+            column (int): The subject's column.
+            commit (bool): Keep what was typed in the cell being left.
+        '''
+        if commit:
+            self.commitEditor()
+        self.row = row
+        self.column = column
+        x = self.name_width + column * self.cell_width
+        y = row * self.row_height
+        if self._editor_item is None:
+            self._editor_item = self.canvas.create_window(x, y, window=self.editor, anchor="nw")
+        else:
+            self.canvas.coords(self._editor_item, x, y)
+            self.canvas.itemconfigure(self._editor_item, state="normal")
+
+        self.editor.delete(0, "end")
+        self.editor.insert(0, self.sheet.text(row, self.sheet.subjects[column]))
+        self.editor.select_range(0, "end")
+        self.editor.icursor("end")
+        self.editor.focus_set()
+        self._scrollIntoView(row)
+
+    def _scrollIntoView(self, row):
+        total = len(self.sheet.students) * self.row_height
+        top, bottom = self.canvas.yview()
+        y = row * self.row_height
+        if y < top * total:
+            self.canvas.yview_moveto(y / total)
+        elif y + self.row_height > bottom * total:
+            self.canvas.yview_moveto((y + self.row_height) / total - (bottom - top))
+
+    def move(self, rows, columns):
+        '''Moves the entry by rows and columns; Tab past the last subject goes on to the next student.'''
+        row = self.row + rows
+        column = self.column + columns
+        if column >= len(self.sheet.subjects):
+            row, column = row + 1, 0
+        elif column < 0:
+            row, column = row - 1, len(self.sheet.subjects) - 1
+        if 0 <= row < len(self.sheet.students):
+            self.focusCell(row, column)
+        return "break"
+
+    def onClick(self, event):
+        x = self.canvas.canvasx(event.x) - self.name_width
+        y = self.canvas.canvasy(event.y)
+        row = int(y // self.row_height)
+        column = int(x // self.cell_width)
+        if x >= 0 and 0 <= row < len(self.sheet.students) and 0 <= column < len(self.sheet.subjects):
+            self.focusCell(row, column)
+
+    def onMouseWheel(self, event):
+        if event.num == 4:
+            notches = -1
+        elif event.num == 5:
+            notches = 1
+        elif abs(event.delta) >= 120:
+            notches = -event.delta // 120
+        else:
+            notches = -event.delta
+        self.canvas.yview_scroll(notches, "units")
+
+    def onEscape(self, event):
+        if self.sheet.students:
+            self.sheet.revert(self.row, self.sheet.subjects[self.column])
+            self.redrawCell(self.row, self.column)
+            self.focusCell(self.row, self.column, commit=False)
+            if self.on_change is not None:
+                self.on_change(None)
+        return "break"
+
+    def onSave(self, event):
+        if self.on_save is not None:
+            self.on_save()
+        return "break"
@@ -0,0 +1,193 @@
+'''
+Column-per-subject storage for student marks.
+
+Instead of a ten-key dict per student, every subject gets one array('B') column and each
+student holds just its row number; student["Marks"] hands out a MarksRow, a small
+dict-like view onto that row. Existing code that reads or updates
+student["Marks"][subject] keeps working unchanged.
+'''
+from array import array
+from collections.abc import MutableMapping
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# The subjects every student is marked in, in the order AdminAccount.createStudent asks for them.
+SUBJECTS = [
+    "Bangla",
+    "English",
+    "Math",
+    "Science",
+    "Life and Livelihood",
+    "Digital Technology",
+    "History and Social Science",
+    "Religion",
+    "Wellbeing",
+    "Arts and Culture"
+]
+
+SUBJECT_COLUMNS = {subject: column for column, subject in enumerate(SUBJECTS)}
+
+# array('B') holds 0-255; 255 marks "no mark for this subject"
+MISSING = 255
+
+# marks entered in bulk (imports, the marks grid) must lie in this range
+MAX_MARK = 100
+
+
+def parseMark(value, subject):
+    '''
+    Returns value, an int or the text of an entry, as a mark from 0 to MAX_MARK.
+
+    Raises:
+        ValueError: Naming subject, if value is not such a mark.
+    '''
+    mark = value.strip() if isinstance(value, str) else value
+    if isinstance(mark, str) and mark.isdigit():
+        mark = int(mark)
+    if type(mark) is not int or not 0 <= mark <= MAX_MARK:
+        raise ValueError(f"{subject}: {value!r} is not a mark from 0 to {MAX_MARK}")
+    return mark
+
+
+class MarksTable:
+    '''
+    One array('B') column per subject in SUBJECTS; row n of every column belongs to the
+    same student.
+
+    Attributes:
+        columns (list): array('B') per subject, in SUBJECTS order.
+        extras (dict): Row -> marks that do not fit the columns (unknown subjects, values
+            outside 0-254, non-numbers). Empty for ordinary students.
+
+    Methods:
+        appendRow(self, marks): Stores a marks mapping as a new row and returns its MarksRow.
+        column(self, subject): Returns the column for subject.
+        average(self, subject, rows): Average mark over the given rows, skipping missing marks.
+        averages(self, rows): Average for every subject over the given rows.
+    '''
+
+    def __init__(self):
+        self.columns = [array('B') for _ in SUBJECTS]
+        self.extras = {}
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def appendRow(self, marks):
+        view = MarksRow(self, len(self))
+        stored = 0
+        for subject, column in zip(SUBJECTS, self.columns):
+            mark = marks.get(subject)
+            if type(mark) is int and 0 <= mark < MISSING:
+                column.append(mark)
+                stored += 1
+            else:
+                column.append(MISSING)
+        if stored != len(marks):
+            # unknown subjects or marks the columns cannot hold
+            self.extras[view.row] = {subject: mark for subject, mark in marks.items() if subject not in SUBJECT_COLUMNS
+                          or not (type(mark) is int and 0 <= mark < MISSING)}
+        return view
+
+    def column(self, subject):
+        return self.columns[SUBJECT_COLUMNS[subject]]
+
+    def average(self, subject, rows):
+        '''
+        Args:
+            subject (str): A subject in SUBJECTS.
+            rows (range or list): Row numbers, e.g. range(start, stop) for a class loaded in one piece.
+
+        Returns:
+            float: The average, or None if nobody in rows has a mark for subject.
+        '''
+        column = self.column(subject)
+        if numpy is not None:
+            values = numpy.frombuffer(column, dtype=numpy.uint8)
+            values = values[rows.start:rows.stop] if isinstance(rows, range) and rows.step == 1 else values[list(rows)]
+            values = values[values != MISSING]
+            return float(values.mean()) if len(values) else None
+
+        if isinstance(rows, range) and rows.step == 1:
+            values = [value for value in column[rows.start:rows.stop] if value != MISSING]
+        else:
+            values = [column[row] for row in rows if column[row] != MISSING]
+        return sum(values) / len(values) if values else None
+
+    def averages(self, rows):
+        return {subject: self.average(subject, rows) for subject in SUBJECTS}
+
+
+class MarksRow(MutableMapping):
+    '''
+    A student's marks as a mapping backed by one row of a MarksTable. The view holds no
+    data of its own, so any number of views on the same row agree and one can be made on
+    demand for each access.
+    '''
+    __slots__ = ("table", "row")
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    @property
+    def extra(self):
+        return self.table.extras.get(self.row)
+
+    def __getitem__(self, subject):
+        column = SUBJECT_COLUMNS.get(subject)
+        if column is not None:
+            value = self.table.columns[column][self.row]
+            if value != MISSING:
+                return value
+        extra = self.extra
+        if extra is not None and subject in extra:
+            return extra[subject]
+        raise KeyError(subject)
+
+    def __setitem__(self, subject, mark):
+        column = SUBJECT_COLUMNS.get(subject)
+        fits = column is not None and type(mark) is int and 0 <= mark < MISSING
+        if fits:
+            self.table.columns[column][self.row] = mark
+            extra = self.extra
+            if extra is not None:
+                extra.pop(subject, None)
+            return
+        if column is not None:
+            self.table.columns[column][self.row] = MISSING
+        self.table.extras.setdefault(self.row, {})[subject] = mark
+
+    def __delitem__(self, subject):
+        found = False
+        column = SUBJECT_COLUMNS.get(subject)
+        if column is not None and self.table.columns[column][self.row] != MISSING:
+            self.table.columns[column][self.row] = MISSING
+            found = True
+        extra = self.extra
+        if extra is not None and subject in extra:
+            del extra[subject]
+            found = True
+        if not found:
+            raise KeyError(subject)
+
+    def __iter__(self):
+        extra = self.extra
+        for subject, column in zip(SUBJECTS, self.table.columns):
+            if column[self.row] != MISSING or (extra is not None and subject in extra):
+                yield subject
+        if extra is not None:
+            for subject in extra:
+                if subject not in SUBJECT_COLUMNS:
+                    yield subject
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
@@ -0,0 +1,99 @@
+'''
+Changes to classes.json expressed as small records, so the same record can be applied
+in memory, appended to the journal and replayed later.
+
+Record formats:
+    {"op": "add_class", "class": "7"}
+    {"op": "add_student", "class": "7", "student": {...}}
+    {"op": "update_mark", "class": "7", "roll": "3", "subject": "Math", "delta": 5}
+    {"op": "set_mark", "class": "7", "roll": "3", "subject": "Math", "mark": 80}
+    {"op": "promote", "pass_mark": 33, "max_failed": 0, "reset_marks": true}
+
+A promote record holds only the rule, not the moves: applied to the same document it
+always makes the same moves (see promotion.py), so replaying it gives the same result.
+'''
+from marks_store import SUBJECTS
+from promotion import PassRule, planPromotion, applyPlan
+from records import SchoolClass, Student
+
+
+def addClassRecord(class_name):
+    return {"op": "add_class", "class": class_name}
+
+
+def addStudentRecord(class_name, student):
+    return {"op": "add_student", "class": class_name, "student": student}
+
+
+def updateMarkRecord(class_name, roll, subject, delta):
+    return {"op": "update_mark", "class": class_name, "roll": roll, "subject": subject, "delta": delta}
+
+
+def setMarkRecord(class_name, roll, subject, mark):
+    return {"op": "set_mark", "class": class_name, "roll": roll, "subject": subject, "mark": mark}
+
+
+def promoteRecord(pass_mark, max_failed, reset_marks):
+    return {"op": "promote", "pass_mark": pass_mark, "max_failed": max_failed, "reset_marks": reset_marks}
+
+
+def applyMutation(index, record):
+    '''
+    Applies record to the document behind a StudentIndex and keeps the index in step.
+
+    Every check runs before anything is changed, so a rejected record leaves the
+    document untouched.
+
+    Args:
+        index (StudentIndex): Index over the classes.json document to change.
+        record (dict): One of the records described in the module docstring.
+
+    Raises:
+        ValueError: If the record refers to a missing class, roll or subject, adds a
+            class that already exists, or promotes a school with two classes of one name.
+    '''
+    op = record["op"]
+    if op == "promote":
+        classes = index.document.get("classes", [])
+        plan = planPromotion(classes, PassRule(record["pass_mark"], record["max_failed"]))
+        applyPlan(classes, plan, record["reset_marks"])
+        index.reindex()
+        return
+
+    class_name = record["class"]
+
+    if op == "add_class":
+        if index.getClass(class_name) is not None:
+            raise ValueError("Class already exists")
+        class_data = SchoolClass(class_name)
+        index.document.setdefault("classes", []).append(class_data)
+        index.addClass(class_data)
+        return
+
+    class_data = index.getClass(class_name)
+    if class_data is None:
+        raise ValueError(f"Class {class_name} not found")
+
+    if op == "add_student":
+        student = Student.fromDict(record["student"])
+        class_data["students"].append(student)
+        index.addStudent(class_name, student)
+
+    elif op in ("update_mark", "set_mark"):
+        roll = record["roll"]
+        subject = record["subject"]
+        student = next((student for student in class_data['students'] if student['Roll'] == roll), None)
+        if not student:
+            raise ValueError(f"Roll: {roll} not found")
+        if op == "set_mark":
+            # a subject the student has no mark in yet may be filled in
+            if subject not in SUBJECTS and subject not in student['Marks']:
+                raise ValueError(f"{subject} not found\nWrite subject name in Pascal case")
+            student['Marks'][subject] = record["mark"]
+            return
+        if subject not in student['Marks']:
+            raise ValueError(f"{subject} not found\nWrite subject name in Pascal case")
+        student['Marks'][subject] += record["delta"]
+
+    else:
+        raise ValueError(f"Unknown change: {op}")
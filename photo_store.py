@@ -0,0 +1,193 @@
+'''
+Content-addressed store for uploaded pictures.
+
+An upload is copied into photo_directory under the SHA-256 of its bytes, so the same
+photo uploaded twice is kept once. The sizes the screens show are rendered right away, so
+showing a stored picture is a single read of a small PNG. The JSON files then hold a
+reference like "store:<sha256>" instead of a path that only exists on the uploader's
+machine.
+
+    photos/3f/3fa4...e1.jpg        the original, as uploaded
+    photos/3f/3fa4...e1-200.png    profile picture size
+    photos/3f/3fa4...e1-48.png     list size
+'''
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageTk
+
+from settings import getSetting
+from thumbnails import PendingPhoto
+
+
+REFERENCE_PREFIX = "store:"
+PROFILE_SIZE = (200, 200)
+LIST_SIZE = (48, 48)
+VARIANT_SIZES = (PROFILE_SIZE, LIST_SIZE)
+
+_CHUNK = 1 << 20
+
+
+def isStoreReference(value):
+    '''True if value is a "store:<sha256>" reference rather than a file path.'''
+    return isinstance(value, str) and value.startswith(REFERENCE_PREFIX)
+
+
+def _writeAtomically(target, write):
+    '''Calls write(f) on a temporary file next to target, then renames it over target.'''
+    directory = os.path.dirname(target)
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(target) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(temp_path, target)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class PhotoStore:
+    '''
+    Pictures kept under one directory, named by the hash of their contents.
+
+    Attributes:
+        directory (str): Root of the store.
+
+    Methods:
+        ingest(self, path): Copies a picture into the store, renders its sizes and returns its reference.
+        ingestAsync(self, widget, path, callback): Runs ingest in a worker thread and calls callback(reference) on the Tk thread.
+        variantPath(self, reference, size=PROFILE_SIZE): Returns the file of a rendered size.
+        originalPath(self, reference): Returns the stored original.
+        photo(self, reference, size=PROFILE_SIZE): Returns a PhotoImage of a rendered size.
+    '''
+
+    def __init__(self, directory, workers=1):
+        self.directory = directory
+        self.workers = workers
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _digest(self, reference):
+        if not isStoreReference(reference):
+            raise ValueError(f"Not a photo store reference: {reference!r}")
+        return reference[len(REFERENCE_PREFIX):]
+
+    def _folder(self, digest):
+        return os.path.join(self.directory, digest[:2])
+
+    def variantPath(self, reference, size=PROFILE_SIZE):
+        digest = self._digest(reference)
+        return os.path.join(self._folder(digest), f"{digest}-{size[0]}.png")
+
+    def originalPath(self, reference):
+        '''
+        Raises:
+            FileNotFoundError: If the picture is not in the store.
+        '''
+        digest = self._digest(reference)
+        folder = self._folder(digest)
+        for name in os.listdir(folder):
+            if name.startswith(digest + "."):
+                return os.path.join(folder, name)
+        raise FileNotFoundError(f"{reference} is not in {self.directory}")
+
+    def ingest(self, path):
+        '''
+        Copies the picture at path into the store unless the same bytes are already there,
+        and renders the sizes that are missing. Safe to call from any thread.
+
+        Args:
+            path (str): The picture to add.
+
+        Returns:
+            str: The picture's "store:<sha256>" reference.
+
+        Raises:
+            OSError: If path cannot be read or is not a picture Pillow can open.
+        '''
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        reference = REFERENCE_PREFIX + digest
+        folder = self._folder(digest)
+        os.makedirs(folder, exist_ok=True)
+
+        # rendering first means a file Pillow cannot open never gets into the store
+        missing = [size for size in VARIANT_SIZES if not os.path.exists(self.variantPath(reference, size))]
+        if missing:
+            with Image.open(path) as image:
+                image.load()
+                for size in missing:
+                    variant = image.resize(size, Image.Resampling.LANCZOS)
+                    _writeAtomically(self.variantPath(reference, size), lambda f: variant.save(f, format="PNG"))
+
+        extension = os.path.splitext(path)[1].lower()
+        original = os.path.join(folder, digest + extension)
+        if not any(name.startswith(digest + ".") for name in os.listdir(folder)):
+            with open(path, 'rb') as source:
+                _writeAtomically(original, lambda f: shutil.copyfileobj(source, f, _CHUNK))
+        return reference
+
+    def ingestAsync(self, widget, path, callback):
+        '''
+        Like ingest(), but hashing, copying and rendering run in a worker thread.
+        callback(reference) runs on the Tk thread once the picture is stored.
+
+        Args:
+            widget (tk.Misc): Widget whose after() polls for the result; the App window is safest.
+            path (str): The picture to add.
+            callback (callable): Called with the reference on the Tk thread.
+
+        Returns:
+            PendingPhoto: Cancel it if the screen goes away first.
+        '''
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="photo-store")
+            future = self._pool.submit(self.ingest, path)
+
+        def finish():
+            try:
+                reference = future.result()
+            except (OSError, ValueError) as e:
+                print(f"Cannot store {path}: {e}")
+                return
+            callback(reference)
+
+        pending = PendingPhoto(widget)
+        pending.wait(future, finish)
+        return pending
+
+    def photo(self, reference, size=PROFILE_SIZE):
+        '''
+        Returns a PhotoImage of the picture rendered at size: one read of a small PNG.
+
+        Raises:
+            FileNotFoundError: If the picture is not in the store.
+        '''
+        with Image.open(self.variantPath(reference, size)) as image:
+            return ImageTk.PhotoImage(image)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def getPhotoStore():
+    '''
+    Returns the process-wide photo store in the "photo_directory" setting.
+    '''
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PhotoStore(getSetting("photo_directory"))
+        return _store
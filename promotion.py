@@ -0,0 +1,229 @@
+'''
+End-of-year promotion of the whole school in one step.
+
+Classes are taken in the order of the classes array: a student of one class who passes
+moves to the next class, and one who fails repeats the class. Students who pass the last
+class graduate and leave the school. A student passes with a mark of at least pass_mark in
+every subject in SUBJECTS but at most max_failed of them; a missing mark counts as failed.
+
+Each class then gets new rolls from 1: first the students promoted into it, then those
+repeating it, each group ordered by their total mark of the year just ended (ties keep
+the old roll order). Marks are reset to 0 in every subject, optionally after the year's
+marks have been written to an archive file, one JSON line per student:
+    {"Class": "6", "ID": "...", "Roll": "4", "Name": "...", "Marks": {...},
+     "Result": "promoted", "To": "7", "New Roll": "1"}
+
+planPromotion() works out every move in one pass over the classes without changing
+anything; applyPlan() then rewrites the classes in place. Repositories do both inside one
+batch (see Repository.promote), so the promotion is saved with a single write.
+'''
+import json
+import os
+
+from marks_store import SUBJECTS
+from storage import jsonDefault
+
+
+PROMOTED = "promoted"
+REPEATED = "repeated"
+GRADUATED = "graduated"
+
+
+class PassRule:
+    '''
+    When a student passes the year.
+
+    Attributes:
+        pass_mark (int): Lowest mark that passes a subject.
+        max_failed (int): Subjects a student may fail and still pass the year.
+
+    Methods:
+        failedSubjects(self, marks): Returns the subjects failed.
+        passes(self, marks): True if the student passes the year.
+    '''
+
+    def __init__(self, pass_mark=33, max_failed=0):
+        if pass_mark < 0 or max_failed < 0:
+            raise ValueError("The pass mark and the number of subjects that may be failed can't be negative")
+        self.pass_mark = pass_mark
+        self.max_failed = max_failed
+
+    def failedSubjects(self, marks):
+        failed = []
+        for subject in SUBJECTS:
+            mark = marks.get(subject)
+            if not isinstance(mark, (int, float)) or mark < self.pass_mark:
+                failed.append(subject)
+        return failed
+
+    def passes(self, marks):
+        return len(self.failedSubjects(marks)) <= self.max_failed
+
+
+class PromotionReport:
+    '''
+    What a promotion does, or would do after a dry run.
+
+    Attributes:
+        per_class (dict): Class name -> {"promoted", "repeated", "graduated", "incoming",
+            "students"}: students moved up out of the class, kept back in it, leaving the
+            school from it, moved up into it, and its size afterwards.
+        archived (int): Students whose marks were written to the archive file.
+        saved (bool): Whether the promotion was saved.
+
+    Methods:
+        total(self, key): Sum of one count over the classes.
+        summary(self): Returns a short text describing the outcome.
+    '''
+
+    def __init__(self, class_names):
+        self.per_class = {
+            class_name: {PROMOTED: 0, REPEATED: 0, GRADUATED: 0, "incoming": 0, "students": 0}
+            for class_name in class_names
+        }
+        self.archived = 0
+        self.saved = False
+
+    def total(self, key):
+        return sum(counts[key] for counts in self.per_class.values())
+
+    def summary(self):
+        text = (f"{self.total(PROMOTED)} promoted, {self.total(REPEATED)} repeating, "
+                f"{self.total(GRADUATED)} graduated")
+        if self.archived:
+            text += f"; marks of {self.archived} students archived"
+        return text + ("" if self.saved else "; nothing saved")
+
+
+class PromotionPlan:
+    '''
+    Every move of a promotion, worked out before anything is changed.
+
+    Attributes:
+        rosters (dict): Class name -> list of the class's students after the promotion, in
+            new roll order.
+        moves (list): (student, from class, result, to class or None, new roll or None)
+            for every student, in the order of the classes array.
+        report (PromotionReport): The counts per class.
+    '''
+
+    def __init__(self, class_names):
+        self.rosters = {class_name: [] for class_name in class_names}
+        self.moves = []
+        self.report = PromotionReport(class_names)
+
+
+def _rollKey(student):
+    roll = student["Roll"]
+    return (0, int(roll), "") if str(roll).isdigit() else (1, 0, str(roll))
+
+
+def _meritOrder(students):
+    '''Highest total mark first; the sort is stable, so ties stay in old roll order.'''
+    students = sorted(students, key=_rollKey)
+    students.sort(key=lambda student: -sum(mark for mark in student["Marks"].values() if isinstance(mark, (int, float))))
+    return students
+
+
+def planPromotion(classes, rule):
+    '''
+    Works out the promotion of classes, a list of class records in the order of the
+    classes array, without changing them.
+
+    Returns:
+        PromotionPlan: The new rosters, each student's move and the counts per class.
+    '''
+    class_names = [class_data["class"] for class_data in classes]
+    if len(set(class_names)) != len(class_names):
+        raise ValueError("Two classes have the same name")
+    plan = PromotionPlan(class_names)
+    report = plan.report.per_class
+
+    # repeaters first in the class they stay in; promoted students are put in front below
+    promoted_into = {class_name: [] for class_name in class_names}
+    results = {}
+    for position, class_data in enumerate(classes):
+        class_name = class_names[position]
+        next_class = class_names[position + 1] if position + 1 < len(class_names) else None
+        passed = []
+        failed = []
+        for student in class_data["students"]:
+            (passed if rule.passes(student["Marks"]) else failed).append(student)
+        plan.rosters[class_name] = _meritOrder(failed)
+        report[class_name][REPEATED] = len(failed)
+        for student in failed:
+            results[id(student)] = (class_name, REPEATED, class_name)
+        if next_class is None:
+            report[class_name][GRADUATED] = len(passed)
+            for student in passed:
+                results[id(student)] = (class_name, GRADUATED, None)
+        else:
+            promoted_into[next_class] = _meritOrder(passed)
+            report[class_name][PROMOTED] = len(passed)
+            report[next_class]["incoming"] = len(passed)
+            for student in passed:
+                results[id(student)] = (class_name, PROMOTED, next_class)
+
+    new_rolls = {}
+    for class_name in class_names:
+        roster = promoted_into[class_name] + plan.rosters[class_name]
+        plan.rosters[class_name] = roster
+        report[class_name]["students"] = len(roster)
+        for roll, student in enumerate(roster, 1):
+            new_rolls[id(student)] = str(roll)
+
+    for class_data in classes:
+        for student in class_data["students"]:
+            from_class, result, to_class = results[id(student)]
+            plan.moves.append((student, from_class, result, to_class, new_rolls.get(id(student))))
+    return plan
+
+
+def applyPlan(classes, plan, reset_marks=True):
+    '''
+    Rewrites the students of every class in classes to plan, in place: the students lists
+    stay the same list objects, so documents that share them see the change. Rolls are
+    renumbered and, with reset_marks, every mark is set to 0.
+    '''
+    for class_data in classes:
+        class_data["students"][:] = plan.rosters[class_data["class"]]
+    for student, _from_class, _result, _to_class, new_roll in plan.moves:
+        if new_roll is None:
+            continue
+        student.roll = new_roll
+        if reset_marks:
+            marks = student.marks
+            for subject in list(marks):
+                marks[subject] = 0
+
+
+def writeArchive(path, plan):
+    '''
+    Writes every student's marks and result to a JSONL file before a promotion resets them.
+    The file is written next to path and moved into place once complete.
+
+    Returns:
+        int: The number of students archived.
+
+    Raises:
+        ValueError: If path exists; an earlier year's archive is never overwritten.
+    '''
+    if os.path.exists(path):
+        raise ValueError(f"{path} already exists; choose a new archive file")
+    temporary = path + ".tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        for student, from_class, result, to_class, new_roll in plan.moves:
+            f.write(json.dumps({
+                "Class": from_class,
+                "ID": student["ID"],
+                "Roll": student["Roll"],
+                "Name": student["Name"],
+                "Marks": dict(student["Marks"]),
+                "Result": result,
+                "To": to_class,
+                "New Roll": new_roll,
+            }, default=jsonDefault) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+    return len(plan.moves)
@@ -0,0 +1,235 @@
+'''
+Slotted record types for students, teachers and classes.
+
+Records keep their fields in __slots__ instead of a dict per record, and they are
+read-only mappings over the JSON keys (student["Roll"], class_data["students"], ...). The
+indexes, mutations and writers that work on the classes.json / teachers.json shape
+therefore work on records unchanged. Screens use the attributes (student.name,
+teacher.accessed_class).
+'''
+import json
+from collections.abc import Mapping
+
+from marks_store import MarksRow
+
+
+class Record(Mapping):
+    '''
+    Base of the record types.
+
+    Subclasses list their (JSON key, attribute) pairs in FIELDS, in file order. Keys a
+    record does not know about are kept in a small dict, so a record saves back exactly what
+    it was loaded from.
+
+    Methods:
+        fromDict(cls, data): Builds a record from its JSON shape; records are returned as is.
+        toJson(self): Returns the record in its JSON shape.
+    '''
+    __slots__ = ("_extra",)
+    FIELDS = ()
+    _ATTRIBUTES = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._ATTRIBUTES = dict(cls.FIELDS)
+
+    @classmethod
+    def fromDict(cls, data):
+        if isinstance(data, cls):
+            return data
+        record = cls(**{attribute: data[key] for key, attribute in cls.FIELDS if key in data})
+        if not cls._ATTRIBUTES.keys() >= data.keys():
+            record._extra = {key: value for key, value in data.items() if key not in cls._ATTRIBUTES}
+        return record
+
+    def __getitem__(self, key):
+        attribute = self._ATTRIBUTES.get(key)
+        if attribute is not None:
+            return getattr(self, attribute)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key, _attribute in self.FIELDS:
+            yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return len(self.FIELDS) + (len(self._extra) if self._extra is not None else 0)
+
+    def toJson(self):
+        data = {key: getattr(self, attribute) for key, attribute in self.FIELDS}
+        if self._extra is not None:
+            data.update(self._extra)
+        return data
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.toJson()!r})"
+
+
+class Student(Record):
+    '''
+    One student of a class.
+
+    Marks are either a plain dict or a row of a marks_store.MarksTable; in the second case
+    the student holds only the table and its row number. OtherInfo (age, address, phone,
+    guardian) is only needed by the student's own account screen, so it may be kept as
+    compact JSON text and is decoded the first time it is read.
+
+    Attributes:
+        name (str): Student's name.
+        id (str): Student's ID.
+        roll (str): Roll number in the class.
+        marks (Mapping): Subject -> mark.
+        other_info (dict): "Age", "Address", "Phone Number" and "Guardian".
+    '''
+    __slots__ = ("name", "id", "roll", "_marks", "_row", "_other_info")
+    FIELDS = (("Name", "name"), ("ID", "id"), ("Roll", "roll"), ("Marks", "marks"), ("OtherInfo", "other_info"))
+
+    def __init__(self, name="", id="", roll="", marks=None, other_info=None):
+        self._extra = None
+        self.name = name
+        self.id = id
+        self.roll = roll
+        self.marks = marks if marks is not None else {}
+        # a dict, or its JSON text until first use
+        self._other_info = other_info if other_info is not None else {}
+
+    @classmethod
+    def fromDict(cls, data, table=None, encode_other_info=False):
+        '''
+        Args:
+            data (dict): A student in the classes.json shape, or a Student.
+            table (MarksTable): If given, the marks are moved into a row of this table.
+            encode_other_info (bool): Keep OtherInfo as JSON text until it is first read.
+        '''
+        student = super().fromDict(data)
+        if table is not None and student._marks is not table:
+            student.marks = table.appendRow(student.marks)
+        if encode_other_info and type(student._other_info) is dict:
+            student._other_info = json.dumps(student._other_info, separators=(',', ':'))
+        return student
+
+    @property
+    def marks(self):
+        if self._row is None:
+            return self._marks
+        return MarksRow(self._marks, self._row)
+
+    @marks.setter
+    def marks(self, marks):
+        if isinstance(marks, MarksRow):
+            self._marks = marks.table
+            self._row = marks.row
+        else:
+            self._marks = marks
+            self._row = None
+
+    @property
+    def marks_row(self):
+        '''The student's row in the marks table, or None if the marks are a dict.'''
+        return self._row
+
+    @property
+    def other_info(self):
+        if type(self._other_info) is str:
+            self._other_info = json.loads(self._other_info)
+        return self._other_info
+
+    @other_info.setter
+    def other_info(self, other_info):
+        self._other_info = other_info
+
+    def toJson(self):
+        data = super().toJson()
+        if type(self._other_info) is str:
+            # saving does not need to keep every student's OtherInfo decoded
+            data["OtherInfo"] = json.loads(self._other_info)
+        return data
+
+
+class Teacher(Record):
+    '''
+    One teacher.
+
+    Attributes:
+        name (str): Teacher's name.
+        id (str): Teacher's ID.
+        accessed_class (list): Names of the classes the teacher can open.
+        salary (str): Teacher's salary.
+        profile_pic (str): Photo store reference ("store:<sha256>") or path of the profile picture, or "".
+    '''
+    __slots__ = ("name", "id", "accessed_class", "salary", "profile_pic")
+    FIELDS = (("Name", "name"), ("id", "id"), ("accessed class", "accessed_class"), ("Salary", "salary"), ("profile_pic", "profile_pic"))
+
+    def __init__(self, name="", id="", accessed_class=None, salary="", profile_pic=""):
+        self._extra = None
+        self.name = name
+        self.id = id
+        self.accessed_class = accessed_class if accessed_class is not None else []
+        self.salary = salary
+        self.profile_pic = profile_pic
+
+
+class SchoolClass(Record):
+    '''
+    One class and its students.
+
+    Attributes:
+        name (str): The class name.
+        students (list): The class's Student records.
+    '''
+    __slots__ = ("name", "students")
+    FIELDS = (("class", "name"), ("students", "students"))
+
+    def __init__(self, name="", students=None):
+        self._extra = None
+        self.name = name
+        self.students = students if students is not None else []
+
+    @classmethod
+    def fromDict(cls, data, table=None, encode_other_info=False):
+        '''
+        Builds the class record and turns its students into Student records. The students
+        list is converted in place and shared with data, so a document that holds data
+        sees the same students.
+        '''
+        record = super().fromDict(data)
+        students = record.students
+        for position, student in enumerate(students):
+            students[position] = Student.fromDict(student, table, encode_other_info)
+        return record
+
+
+def loadSchool(data, table=None, encode_other_info=False):
+    '''
+    Turns every class and student of a parsed classes.json document into records, in place.
+
+    Args:
+        data (dict): The classes.json document.
+        table (MarksTable): If given, marks are moved into this table; students of one class
+            get consecutive rows.
+        encode_other_info (bool): Keep each student's OtherInfo as JSON text until first read.
+
+    Returns:
+        dict: data.
+    '''
+    classes = data.get("classes", [])
+    for position, class_data in enumerate(classes):
+        classes[position] = SchoolClass.fromDict(class_data, table, encode_other_info)
+    return data
+
+
+def loadTeachers(data):
+    '''
+    Turns every teacher of a parsed teachers.json document into a Teacher, in place.
+
+    Returns:
+        dict: data.
+    '''
+    teachers = data.get("teachers", [])
+    for position, teacher in enumerate(teachers):
+        teachers[position] = Teacher.fromDict(teacher)
+    return data
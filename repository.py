@@ -0,0 +1,778 @@
+import json
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+
+import json_stream
+from indexes import StudentIndex, TeacherDirectory
+from journal import Journal
+from marks_store import SUBJECTS, MarksTable
+from mutations import addClassRecord, addStudentRecord, updateMarkRecord, setMarkRecord, promoteRecord, applyMutation
+from promotion import planPromotion, writeArchive
+from records import SchoolClass, Student, Teacher, loadSchool, loadTeachers
+from settings import getSetting
+from storage import FileLock, atomicWriteJson, getWriter
+
+
+CLASSES_FILE = 'classes.json'
+TEACHERS_FILE = 'teachers.json'
+
+
+class DocumentCache:
+    '''
+    Process-wide cache of parsed JSON documents. Each file is parsed once and served from
+    memory until its modification time or size changes on disk. A file can have a loader
+    attached that post-processes every fresh parse; with a journal attached, the file is also
+    reloaded when the journal changes.
+
+    Writes go through a CoalescingWriter, so they are atomic and may be batched.
+
+    With locking, every file is guarded by a storage.FileLock shared with other processes
+    running the app: parses hold the reader lock, writes hold the writer lock and bump the
+    file's version stamp, and the stamp is part of what decides whether the cached copy is
+    still current. Writes are then never deferred, since a pending write would overwrite
+    whatever another process saved in the meantime.
+
+    Attributes:
+        lock (threading.RLock): Guards the cached documents; hold it while changing one.
+        writer (CoalescingWriter): Writes documents to disk.
+        locking (bool): Whether files are locked against other processes.
+        hits (int): Number of loads answered from memory.
+        misses (int): Number of loads that had to parse the file.
+        reloads (int): Misses that replaced a cached copy because the file changed on disk,
+            normally because another process wrote it.
+
+    Methods:
+        load(self, filename): Returns the parsed document, reloading it only if the file changed.
+        attach(self, filename, on_load, journal=None): Runs on_load after every parse of filename.
+        derived(self, filename, name, builder): Returns a structure built from the current document.
+        exclusive(self, filename): Context manager holding filename's writer lock.
+        isFresh(self, filename): True if filename is cached and unchanged on disk.
+        touch(self, filename): Marks the cached document as matching the files on disk.
+        store(self, filename, data, keep_derived=False, durable=False): Writes the document to disk and keeps it cached.
+        invalidate(self, filename=None): Drops one cached document, or all of them.
+        stats(self): Returns hit, miss and reload counts.
+    '''
+
+    def __init__(self, writer=None, locking=False):
+        self._entries = {}
+        self._loaders = {}
+        self._file_locks = {}
+        self.lock = threading.RLock()
+        self.writer = writer if writer is not None else getWriter()
+        self.locking = locking
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def _fileLock(self, filename):
+        if not self.locking:
+            return None
+        if filename not in self._file_locks:
+            self._file_locks[filename] = FileLock(filename)
+        return self._file_locks[filename]
+
+    def _fileKey(self, filename):
+        stat = os.stat(filename)
+        key = (stat.st_mtime_ns, stat.st_size)
+        journal = self._loaders.get(filename, (None, None))[1]
+        if journal is not None:
+            key += journal.fileKey()
+        file_lock = self._fileLock(filename)
+        if file_lock is not None:
+            key += (file_lock.version(),)
+        return key
+
+    def _shared(self, filename):
+        file_lock = self._fileLock(filename)
+        return file_lock.shared() if file_lock is not None else nullcontext()
+
+    @contextmanager
+    def exclusive(self, filename):
+        '''
+        Holds the writer lock on filename for the block (just the in-process lock without
+        locking). Loads inside the block see the latest version on disk and nobody else can
+        save the file until the block exits, so a read-modify-write inside it cannot lose
+        another process's change.
+        '''
+        with self.lock:
+            file_lock = self._fileLock(filename)
+            if file_lock is None:
+                yield
+                return
+            with file_lock.exclusive():
+                yield
+
+    def attach(self, filename, on_load, journal=None):
+        '''
+        Args:
+            filename (str): The JSON file.
+            on_load (callable): Called with each freshly parsed document; may change it in
+                place and returns a dict of derived structures to cache with it.
+            journal (Journal): Journal whose changes on_load replays, if any. The document
+                is reloaded whenever the journal file changes too.
+        '''
+        with self.lock:
+            self._loaders[filename] = (on_load, journal)
+            self._entries.pop(filename, None)
+
+    def load(self, filename):
+        '''
+        Returns the parsed contents of filename.
+
+        Raises FileNotFoundError and json.JSONDecodeError exactly like json.load, so callers
+        keep their existing error handling.
+
+        Args:
+            filename (str): The JSON file to read.
+        '''
+        with self.lock, self._shared(filename):
+            key = self._fileKey(filename)
+            entry = self._entries.get(filename)
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+            if entry is not None:
+                self.reloads += 1
+            with open(filename, 'r') as f:
+                data = json.load(f)
+            built = {}
+            if filename in self._loaders:
+                built = self._loaders[filename][0](data)
+                key = self._fileKey(filename)  # replay may cut a torn record off the journal
+            self._entries[filename] = (key, data, built)
+            return data
+
+    def derived(self, filename, name, builder):
+        '''
+        Returns builder(document) for the current version of filename. The result is kept
+        until the document is reloaded, so indexes are built once per version of the file.
+
+        Args:
+            filename (str): The JSON file the structure is built from.
+            name (str): Key under which the structure is cached.
+            builder (callable): Called with the parsed document on first use.
+        '''
+        with self.lock:
+            data = self.load(filename)
+            built = self._entries[filename][2]
+            if name not in built:
+                built[name] = builder(data)
+            return built[name]
+
+    def store(self, filename, data, keep_derived=False, durable=False):
+        '''
+        Caches data and writes it to filename. Unless durable is set, the write may be
+        coalesced with later ones; the cached copy is served in the meantime.
+
+        Args:
+            filename (str): The JSON file to write.
+            data (dict): The document to save.
+            keep_derived (bool): True if the caller already updated the derived structures
+                to match data; otherwise they are rebuilt on next use.
+            durable (bool): Write now and return only once the file is on disk. Always the
+                case with locking.
+        '''
+        with self.exclusive(filename):
+            entry = self._entries.get(filename)
+            built = entry[2] if keep_derived and entry is not None and entry[1] is data else {}
+            try:
+                if durable or self.locking or not os.path.exists(filename):
+                    self.writer.cancel(filename)
+                    atomicWriteJson(filename, data)
+                    if self.locking:
+                        self._fileLock(filename).bump()
+                    self._entries[filename] = (self._fileKey(filename), data, built)
+                else:
+                    # the key is refreshed by touch() once the writer has saved the file
+                    self._entries[filename] = (self._fileKey(filename), data, built)
+                    self.writer.write(filename, data, lock=self.lock, on_flush=self.touch)
+            except Exception:
+                # the cached copy may already hold the failed change
+                self._entries.pop(filename, None)
+                raise
+
+    def isFresh(self, filename):
+        with self.lock:
+            entry = self._entries.get(filename)
+            if entry is None:
+                return False
+            try:
+                return entry[0] == self._fileKey(filename)
+            except FileNotFoundError:
+                return False
+
+    def touch(self, filename):
+        '''
+        Records the current file key for a document that was changed in memory and then
+        written by the caller (for example by appending to its journal), so the change is
+        not mistaken for an outside edit and reloaded. With locking, the version stamp is
+        bumped so other processes do reload it.
+        '''
+        with self.exclusive(filename):
+            if self.locking:
+                self._fileLock(filename).bump()
+            entry = self._entries.get(filename)
+            if entry is not None:
+                self._entries[filename] = (self._fileKey(filename), entry[1], entry[2])
+
+    def invalidate(self, filename=None):
+        with self.lock:
+            if filename is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(filename, None)
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "reloads": self.reloads, "documents": len(self._entries)}
+
+
+class Repository:
+    '''
+    The storage interface used by the login and account screens. Whichever backend stores
+    them, classes, students and teachers come back as the record types in records.py, and
+    addStudent/addTeacher take either a record or a dict in the classes.json /
+    teachers.json shape.
+
+    Methods:
+        classNames(self): Returns the names of all classes in creation order.
+        getClass(self, class_name): Returns the SchoolClass or None.
+        hasClass(self, class_name): True if the class exists.
+        findStudent(self, student_id, class_name=None): Returns the Student or None.
+        addClass(self, class_name): Adds an empty class. Returns False if it exists.
+        addStudent(self, class_name, student): Adds a student. Returns False if the class is missing.
+        addStudents(self, students): Adds (class name, student) pairs in one batch.
+        updateMark(self, class_name, roll, subject, mark): Adds mark to a student's subject mark.
+        setMark(self, class_name, roll, subject, mark): Replaces a student's subject mark.
+        setMarks(self, class_name, marks): Replaces (roll, subject, mark) triples in one batch.
+        batch(self): Context manager that commits every change made inside it at once.
+        getTeacher(self, teacher_id): Returns the Teacher or None.
+        teachersForClass(self, class_name): Returns the teachers who can access a class.
+        addTeacher(self, teacher): Adds a teacher. Returns False if the id is taken.
+        iterClasses(self, class_names=None): Yields (class name, students) one class at a time.
+        iterTeachers(self): Yields every teacher.
+        promote(self, rule, reset_marks=True, archive_file=None, dry_run=False): Promotes every class at once.
+    '''
+
+    def classNames(self):
+        raise NotImplementedError
+
+    def getClass(self, class_name):
+        raise NotImplementedError
+
+    def hasClass(self, class_name):
+        return self.getClass(class_name) is not None
+
+    def findStudent(self, student_id, class_name=None):
+        raise NotImplementedError
+
+    def addClass(self, class_name):
+        raise NotImplementedError
+
+    def addStudent(self, class_name, student):
+        raise NotImplementedError
+
+    def addStudents(self, students):
+        '''
+        Adds every (class name, student) pair in one batch, so they are saved together or
+        not at all.
+
+        Raises:
+            ValueError: If a class does not exist; none of the students are added then.
+        '''
+        with self.batch():
+            for class_name, student in students:
+                if not self.addStudent(class_name, student):
+                    raise ValueError(f"Class {class_name} not found")
+
+    def updateMark(self, class_name, roll, subject, mark):
+        '''
+        Raises:
+            ValueError: If the class, roll or subject does not exist, or mark is not a number.
+        '''
+        raise NotImplementedError
+
+    def setMark(self, class_name, roll, subject, mark):
+        '''
+        Raises:
+            ValueError: If the class or roll does not exist, or the subject is neither in
+                SUBJECTS nor among the student's marks.
+        '''
+        raise NotImplementedError
+
+    def setMarks(self, class_name, marks):
+        '''
+        Replaces every (roll, subject, mark) of the class in one batch, so they are saved
+        together or not at all.
+
+        Raises:
+            ValueError: As setMark; none of the marks are changed then.
+        '''
+        with self.batch():
+            for roll, subject, mark in marks:
+                self.setMark(class_name, roll, subject, mark)
+
+    def batch(self):
+        raise NotImplementedError
+
+    def getTeacher(self, teacher_id):
+        raise NotImplementedError
+
+    def teachersForClass(self, class_name):
+        raise NotImplementedError
+
+    def addTeacher(self, teacher):
+        raise NotImplementedError
+
+    def iterClasses(self, class_names=None):
+        '''
+        Yields (class name, students) for every class, or only those in class_names, in
+        creation order. students is an iterator of Student records that is only valid until
+        the next class is asked for, so backends can read one class, or one student, at a
+        time.
+        '''
+        for class_name in self.classNames():
+            if class_names is not None and class_name not in class_names:
+                continue
+            class_data = self.getClass(class_name)
+            if class_data is not None:
+                yield class_name, iter(class_data.students)
+
+    def iterTeachers(self):
+        raise NotImplementedError
+
+    def promote(self, rule, reset_marks=True, archive_file=None, dry_run=False):
+        '''
+        Promotes every student who passes to the next class of the classes array, keeps back
+        those who fail and graduates the last class, as described in promotion.py. Everything
+        is saved together or not at all.
+
+        Args:
+            rule (PassRule): Who passes.
+            reset_marks (bool): Set every mark to 0 for the new year.
+            archive_file (str): A new JSONL file to write each student's marks and result to
+                before they are reset, or None.
+            dry_run (bool): Only work out what would change.
+
+        Returns:
+            PromotionReport: The counts per class.
+
+        Raises:
+            ValueError: If archive_file exists or two classes share a name; nothing is
+                changed then.
+        '''
+        raise NotImplementedError
+
+
+class JsonRepository(Repository):
+    '''
+    Read and write access to the school's JSON data files, served from a shared DocumentCache.
+
+    Every parse of classes.json and teachers.json is turned into records (see records.py);
+    students keep OtherInfo as JSON text until it is read. With columnar_marks, student
+    marks are held in a marks_store.MarksTable rather than a dict per student.
+
+    The first single-class or single-student lookup made while classes.json is not cached
+    (and no journal is in use) streams the file with json_stream instead of parsing all of
+    it; the cache is then filled in a background thread, so the lookups after it use the
+    StudentIndex. iterClasses streams the file whenever it is not cached.
+
+    The returned documents are the cached objects themselves. Screens change classes.json
+    through addClass/addStudent/updateMark, which either rewrite the file or, with a journal,
+    append one record per change and fold the journal back into classes.json every
+    compact_every records.
+
+    Methods:
+        classesDocument(self): Returns the whole parsed classes.json document.
+        teachersDocument(self): Returns the whole parsed teachers.json document.
+        classNames(self): Returns the names of all classes in file order.
+        studentIndex(self): Returns the StudentIndex for the current classes.json.
+        getClass(self, class_name): Returns the SchoolClass or None.
+        findStudent(self, student_id, class_name=None): Returns the Student or None.
+        addClass(self, class_name): Adds an empty class.
+        addStudent(self, class_name, student): Appends a student to a class.
+        addStudents(self, students): Appends (class name, student) pairs in one batch.
+        updateMark(self, class_name, roll, subject, mark): Adds mark to a student's subject mark.
+        setMark(self, class_name, roll, subject, mark): Replaces a student's subject mark.
+        batch(self): Context manager that commits every change made inside it at once.
+        compact(self): Folds the journal into classes.json.
+        marksTable(self): Returns the MarksTable behind the cached classes.json, if any.
+        classAverages(self, class_name): Average mark per subject for a class.
+        teacherDirectory(self): Returns the TeacherDirectory for the current teachers.json.
+        getTeacher(self, teacher_id): Returns the Teacher or None.
+        teachersForClass(self, class_name): Returns the teachers who can access a class.
+        addTeacher(self, teacher): Adds a teacher unless the id is taken and saves teachers.json.
+        iterClasses(self, class_names=None): Yields (class name, students) one class at a time.
+        iterTeachers(self): Yields every teacher in teachers.json.
+        promote(self, rule, reset_marks=True, archive_file=None, dry_run=False): Promotes every class in one write.
+        saveClasses(self, data): Writes classes.json.
+        saveTeachers(self, data): Writes teachers.json.
+        cacheStats(self): Returns cache hit and miss counts.
+    '''
+
+    def __init__(self, classes_file=CLASSES_FILE, teachers_file=TEACHERS_FILE, cache=None, journal=None, compact_every=1000, columnar_marks=False):
+        self.classes_file = classes_file
+        self.teachers_file = teachers_file
+        self.cache = cache if cache is not None else DocumentCache()
+        self.journal = journal
+        self.compact_every = compact_every
+        self.columnar_marks = columnar_marks
+        self._batch_depth = 0
+        self._lock = self.cache.lock
+        self._streamed = False
+
+        self.cache.attach(self.classes_file, self._onLoad, journal=self.journal)
+        self.cache.attach(self.teachers_file, self._onTeachersLoad)
+
+    def _loadRecords(self, data):
+        table = MarksTable() if self.columnar_marks else None
+        loadSchool(data, table, encode_other_info=True)
+        return table
+
+    def _onLoad(self, data):
+        table = self._loadRecords(data)
+        index = StudentIndex(data)
+        if self.journal is not None:
+            self.journal.replay(index, lambda index, record: self._apply(index, record, table))
+        return {"students": index, "marks": table}
+
+    def _onTeachersLoad(self, data):
+        loadTeachers(data)
+        return {}
+
+    @staticmethod
+    def _apply(index, record, table):
+        applyMutation(index, record)
+        if table is not None and record["op"] == "add_student":
+            student = index.getClass(record["class"]).students[-1]
+            student.marks = table.appendRow(student.marks)
+
+    def _buildIndex(self, data):
+        # a document handed to saveClasses may still hold dicts; records come first
+        self.cache.derived(self.classes_file, "marks", self._loadRecords)
+        return StudentIndex(data)
+
+    def marksTable(self):
+        '''
+        Returns the MarksTable behind the cached classes.json, or None without columnar_marks.
+        '''
+        return self.cache.derived(self.classes_file, "marks", self._loadRecords)
+
+    def classesDocument(self):
+        return self.cache.load(self.classes_file)
+
+    def teachersDocument(self):
+        return self.cache.load(self.teachers_file)
+
+    def classNames(self):
+        return [class_data["class"] for class_data in self.classesDocument().get("classes", [])]
+
+    def studentIndex(self):
+        return self.cache.derived(self.classes_file, "students", self._buildIndex)
+
+    def _streamable(self):
+        return self.journal is None and not self.cache.isFresh(self.classes_file)
+
+    def _streamFirstLookup(self):
+        '''
+        True for the first lookup made while classes.json is not cached; that one streams
+        the file and then calls _warmCache.
+        '''
+        with self._lock:
+            if self._streamed or not self._streamable():
+                return False
+            self._streamed = True
+            return True
+
+    def _warmCache(self):
+        def load():
+            try:
+                self.studentIndex()
+            except (OSError, ValueError):
+                # the next lookup loads the file again and reports the error
+                pass
+        threading.Thread(target=load, daemon=True).start()
+
+    def getClass(self, class_name):
+        if self._streamFirstLookup():
+            class_data = json_stream.findClass(self.classes_file, class_name)
+            self._warmCache()
+            return SchoolClass.fromDict(class_data) if class_data is not None else None
+        return self.studentIndex().getClass(class_name)
+
+    def hasClass(self, class_name):
+        if self._streamFirstLookup():
+            found = json_stream.hasClass(self.classes_file, class_name)
+            self._warmCache()
+            return found
+        return self.studentIndex().getClass(class_name) is not None
+
+    def findStudent(self, student_id, class_name=None):
+        if class_name is not None and self._streamFirstLookup():
+            student = json_stream.findStudent(self.classes_file, class_name, student_id)
+            self._warmCache()
+            return Student.fromDict(student) if student is not None else None
+        return self.studentIndex().findStudent(student_id, class_name)
+
+    def iterClasses(self, class_names=None):
+        if self._streamable():
+            for class_name, students in json_stream.iterClasses(self.classes_file, class_names):
+                yield class_name, map(Student.fromDict, students)
+            return
+        for class_data in self.studentIndex().document.get("classes", []):
+            if class_names is None or class_data.name in class_names:
+                yield class_data.name, iter(class_data.students)
+
+    def _commit(self, record):
+        '''
+        Applies record to the cached document and persists it.
+
+        The record is applied under the writer lock to whatever version of classes.json is
+        current by then: if another process saved the file since this one last read it,
+        the cache notices the new version stamp and the record is applied to the reloaded
+        document instead of overwriting the other change.
+
+        Raises:
+            ValueError: If the record is rejected; nothing is changed or written then.
+        '''
+        with self.cache.exclusive(self.classes_file):
+            index = self.studentIndex()
+            self._apply(index, record, self.marksTable())
+            try:
+                if self.journal is not None:
+                    self.journal.append(record)
+                    if self._batch_depth == 0:
+                        self._afterJournalCommit()
+                elif self._batch_depth == 0:
+                    self.cache.store(self.classes_file, index.document, keep_derived=True)
+            except Exception:
+                self.cache.invalidate(self.classes_file)
+                raise
+
+    def _afterJournalCommit(self):
+        self.cache.touch(self.classes_file)
+        if self.journal.count >= self.compact_every:
+            self.compact()
+
+    @contextmanager
+    def batch(self):
+        '''
+        Commits every change made inside the block together: one journal write and fsync
+        in journal mode, one rewrite of classes.json otherwise. Other processes cannot save
+        classes.json while the block runs.
+        '''
+        with self.cache.exclusive(self.classes_file):
+            self._batch_depth += 1
+            try:
+                if self.journal is not None:
+                    with self.journal.group():
+                        yield self
+                else:
+                    yield self
+            except Exception:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.cache.invalidate(self.classes_file)
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                if self.journal is not None:
+                    self._afterJournalCommit()
+                else:
+                    self.cache.store(self.classes_file, self.studentIndex().document, keep_derived=True)
+
+    def compact(self):
+        '''
+        Writes the current state to classes.json and empties the journal.
+        '''
+        with self.cache.exclusive(self.classes_file):
+            if self.journal is None:
+                return
+            data = self.studentIndex().document
+            data["journal_seq"] = self.journal.seq
+            # the snapshot must be on disk before the journal is emptied
+            self.cache.store(self.classes_file, data, keep_derived=True, durable=True)
+            self.journal.reset(self.journal.seq)
+            self.cache.touch(self.classes_file)
+
+    def promote(self, rule, reset_marks=True, archive_file=None, dry_run=False):
+        '''
+        Works out the moves under the writer lock and commits them as one promote record:
+        one rewrite of classes.json, or one journal record.
+        '''
+        with self.cache.exclusive(self.classes_file):
+            plan = planPromotion(self.studentIndex().document.get("classes", []), rule)
+            if dry_run:
+                return plan.report
+            if archive_file is not None:
+                plan.report.archived = writeArchive(archive_file, plan)
+            try:
+                self._commit(promoteRecord(rule.pass_mark, rule.max_failed, reset_marks))
+            except Exception:
+                if archive_file is not None:
+                    os.remove(archive_file)
+                raise
+            plan.report.saved = True
+            return plan.report
+
+    def classAverages(self, class_name):
+        '''
+        Returns:
+            dict: Subject -> average mark of the class (None if nobody has one), or None
+                if the class does not exist.
+        '''
+        class_data = self.studentIndex().getClass(class_name)
+        if class_data is None:
+            return None
+        table = self.marksTable()
+        if table is not None and all(student.marks_row is not None for student in class_data.students):
+            return table.averages([student.marks_row for student in class_data.students])
+
+        averages = {}
+        for subject in SUBJECTS:
+            marks = [student.marks[subject] for student in class_data.students
+                     if isinstance(student.marks.get(subject), int)]
+            averages[subject] = sum(marks) / len(marks) if marks else None
+        return averages
+
+    def addClass(self, class_name):
+        '''
+        Creates classes.json if it is missing.
+
+        Returns:
+            bool: False if the class already exists.
+        '''
+        with self.cache.exclusive(self.classes_file):
+            if not os.path.exists(self.classes_file):
+                self.cache.store(self.classes_file, {"classes": []})
+            try:
+                self._commit(addClassRecord(class_name))
+            except ValueError:
+                return False
+            return True
+
+    def addStudent(self, class_name, student):
+        '''
+        Appends student to the class, keeping the index in step.
+
+        Returns:
+            bool: False if the class does not exist.
+        '''
+        try:
+            self._commit(addStudentRecord(class_name, student))
+        except ValueError:
+            return False
+        return True
+
+    def addStudents(self, students):
+        '''
+        Appends every (class name, student) pair inside one batch, looking the index and
+        marks table up once for all of them rather than once per student.
+
+        Raises:
+            ValueError: If a class does not exist; none of the students are added then.
+        '''
+        with self.batch():
+            index = self.studentIndex()
+            table = self.marksTable()
+            for class_name, student in students:
+                record = addStudentRecord(class_name, student)
+                self._apply(index, record, table)
+                if self.journal is not None:
+                    self.journal.append(record)
+
+    def updateMark(self, class_name, roll, subject, mark):
+        '''
+        Adds mark to the student's current mark in subject.
+
+        Raises:
+            ValueError: If the class, roll or subject does not exist, or mark is not a number.
+        '''
+        self._commit(updateMarkRecord(class_name, roll, subject, int(mark)))
+
+    def setMark(self, class_name, roll, subject, mark):
+        '''
+        Replaces the student's mark in subject.
+
+        Raises:
+            ValueError: If the class or roll does not exist, or the subject is unknown.
+        '''
+        self._commit(setMarkRecord(class_name, roll, subject, int(mark)))
+
+    def teacherDirectory(self):
+        return self.cache.derived(self.teachers_file, "teachers", lambda data: TeacherDirectory(loadTeachers(data)))
+
+    def getTeacher(self, teacher_id):
+        return self.teacherDirectory().getTeacher(teacher_id)
+
+    def teachersForClass(self, class_name):
+        return self.teacherDirectory().teachersForClass(class_name)
+
+    def addTeacher(self, teacher):
+        '''
+        Appends teacher to teachers.json unless its id already exists. Creates the file
+        if it is missing.
+
+        Returns:
+            bool: False if a teacher with the same id exists.
+        '''
+        with self.cache.exclusive(self.teachers_file):
+            try:
+                directory = self.teacherDirectory()
+            except FileNotFoundError:
+                self.cache.store(self.teachers_file, {"teachers": []})
+                directory = self.teacherDirectory()
+
+            teacher = Teacher.fromDict(teacher)
+            if teacher.id in directory:
+                return False
+
+            directory.document["teachers"].append(teacher)
+            directory.addTeacher(teacher)
+            self.cache.store(self.teachers_file, directory.document, keep_derived=True)
+            return True
+
+    def iterTeachers(self):
+        return iter(self.teachersDocument().get("teachers", []))
+
+    def saveClasses(self, data):
+        self.cache.store(self.classes_file, data)
+
+    def saveTeachers(self, data):
+        self.cache.store(self.teachers_file, data)
+
+    def cacheStats(self):
+        return self.cache.stats()
+
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def getRepository():
+    '''
+    Returns the process-wide repository shared by every screen. The "storage_backend"
+    setting picks the JSON files (default), one file per class, or the SQLite database.
+    '''
+    global _repository
+    with _repository_lock:
+        if _repository is None and getSetting("storage_backend") == "sqlite":
+            from sqlite_repository import SqliteRepository
+            _repository = SqliteRepository(getSetting("sqlite_file"))
+        elif _repository is None and getSetting("storage_backend") == "sharded":
+            from sharded_repository import ShardedRepository
+            _repository = ShardedRepository(getSetting("shard_directory"), cache=DocumentCache(locking=getSetting("file_locking")))
+        elif _repository is None:
+            journal = None
+            if getSetting("storage_mode") == "journal":
+                journal = Journal(getSetting("journal_file"))
+            _repository = JsonRepository(
+                cache=DocumentCache(locking=getSetting("file_locking")),
+                journal=journal,
+                compact_every=getSetting("journal_compact_every"),
+                columnar_marks=getSetting("columnar_marks"),
+            )
+        return _repository
@@ -0,0 +1,149 @@
+from collections import OrderedDict
+
+from functions import clearEntries
+
+
+class Screen:
+    '''
+    A full-window frame that the ScreenManager builds once and then shows and hides.
+
+    Screens are placed in the middle of the window like every frame of the app. Coming back
+    to a screen empties its entries (a login screen should not show the last ID typed in)
+    but keeps every other widget as it is.
+
+    Attributes:
+        frame (CTkFrame): The frame holding the screen's widgets.
+        entries (tuple): The CTkEntry widgets emptied by reset().
+
+    Methods:
+        show(self): Places the frame in the middle of its master, above any other frame.
+        hide(self): Removes the frame from view without destroying it.
+        reset(self): Empties the entries.
+        destroy(self): Destroys the frame and its widgets.
+    '''
+
+    def __init__(self, frame, entries=()):
+        '''
+        Args:
+            frame (CTkFrame): The frame holding the screen's widgets.
+            entries (iterable): The CTkEntry widgets to empty each time the screen is shown again.
+        '''
+        self.frame = frame
+        self.entries = tuple(entries)
+
+    def show(self):
+        self.frame.place(relx=0.5, rely=0.5, anchor="center")
+        # frames made after this one was built would otherwise cover it
+        self.frame.lift()
+
+    def hide(self):
+        self.frame.place_forget()
+
+    def reset(self):
+        clearEntries(*self.entries)
+
+    def destroy(self):
+        self.frame.destroy()
+
+
+class ScreenManager:
+    '''
+    Builds each screen of the main window on first use and keeps it, so going back and forth
+    between the menu and the login screens only hides one frame and places another.
+
+    At most capacity screens are kept. When one more is built, the least recently shown
+    screen is destroyed and will be built again if it is needed later; the screen on
+    display and pinned screens are never dropped.
+
+    Attributes:
+        capacity (int): Most screens kept at once.
+        current (str): Name of the screen on display, or None.
+
+    Methods:
+        register(self, name, build, pinned=False): Tells the manager how to build a screen.
+        show(self, name): Hides the current screen and shows the named one.
+        hideCurrent(self): Hides the current screen, for frames the manager does not keep.
+        get(self, name): Returns the named screen if it is built, else None.
+        evict(self, name): Destroys a kept screen.
+        stats(self): Returns hit, miss and eviction counts.
+    '''
+
+    def __init__(self, capacity=4):
+        '''
+        Args:
+            capacity (int): Most screens kept at once.
+        '''
+        self.capacity = max(1, capacity)
+        self.current = None
+        self._builders = {}
+        self._pinned = set()
+        self._screens = OrderedDict()  # least recently shown first
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def register(self, name, build, pinned=False):
+        '''
+        Args:
+            name (str): The screen's name.
+            build (callable): Returns a new Screen.
+            pinned (bool): Never drop this screen to make room for others.
+        '''
+        self._builders[name] = build
+        if pinned:
+            self._pinned.add(name)
+
+    def show(self, name):
+        '''
+        Hides the current screen and shows the named one, building it if it is not kept.
+
+        Returns:
+            Screen: The screen shown.
+        '''
+        self.hideCurrent()
+        screen = self._screens.get(name)
+        if screen is None:
+            self._misses += 1
+            screen = self._builders[name]()
+            self._screens[name] = screen
+            self._evictLeastRecent(keep=name)
+        else:
+            self._hits += 1
+            self._screens.move_to_end(name)
+            screen.reset()
+        screen.show()
+        self.current = name
+        return screen
+
+    def hideCurrent(self):
+        if self.current is not None:
+            screen = self._screens.get(self.current)
+            if screen is not None:
+                screen.hide()
+            self.current = None
+
+    def get(self, name):
+        return self._screens.get(name)
+
+    def evict(self, name):
+        screen = self._screens.pop(name, None)
+        if screen is not None:
+            if self.current == name:
+                self.current = None
+            screen.destroy()
+            self._evictions += 1
+
+    def _evictLeastRecent(self, keep):
+        for name in list(self._screens):
+            if len(self._screens) <= self.capacity:
+                break
+            if name != keep and name != self.current and name not in self._pinned:
+                self.evict(name)
+
+    def stats(self):
+        '''
+        Returns:
+            dict: "hits" (screens shown again without building), "misses" (screens built),
+            "evictions" (screens dropped) and "kept" (screens built now).
+        '''
+        return {"hits": self._hits, "misses": self._misses, "evictions": self._evictions, "kept": len(self._screens)}
@@ -0,0 +1,299 @@
+'''
+The app's operations without any widgets: logging in, creating classes, teachers and
+students, updating marks, promoting the school and exporting records. The screens read
+their entries and call these; cli.py calls the same functions from the command line, so
+anything the screens can do can be scripted or run as a batch job on a machine with no
+display.
+
+Invalid input and rejected changes raise ValueError with a message fit to show the user.
+'''
+import json
+import os
+
+import exporters
+from marks_store import SUBJECTS, parseMark
+from promotion import PassRule
+from records import Student, Teacher
+from repository import getRepository
+from settings import getSetting
+import student_import
+
+
+ADMIN_FILE = 'admin_id.json'
+
+# pictures makeThumbnails picks up from a folder, as the upload dialog offers them
+PICTURE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def _wholeNumber(value, what):
+    '''Parses value (an int or the text of an entry) as an int, or raises ValueError naming what.'''
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        raise ValueError(f"{what} must be a whole number, not {value!r}") from None
+
+
+# logins
+
+def checkAdminId(admin_id, filename=ADMIN_FILE):
+    '''
+    Returns:
+        bool: True if admin_id is the admin ID stored in filename.
+
+    Raises:
+        FileNotFoundError: If filename does not exist.
+    '''
+    with open(filename) as f:
+        return admin_id == json.load(f).get("admin_id")
+
+
+def loginStudent(student_id, class_name):
+    '''
+    Returns:
+        Student: The student with student_id in class_name.
+
+    Raises:
+        ValueError: If the class does not exist or has no student with that ID.
+    '''
+    repository = getRepository()
+    student = repository.findStudent(student_id, class_name)
+    if student:
+        return student
+    if not repository.hasClass(class_name):
+        raise ValueError(f"Class {class_name} doesn't exist")
+    raise ValueError(f"ID {student_id} not found")
+
+
+def loginTeacher(teacher_id):
+    '''
+    Returns:
+        Teacher: The teacher with teacher_id.
+
+    Raises:
+        ValueError: If there is no such teacher.
+    '''
+    teacher = getRepository().getTeacher(teacher_id)
+    if not teacher:
+        raise ValueError(f"ID {teacher_id} not found")
+    return teacher
+
+
+# reading
+
+def classNames():
+    return getRepository().classNames()
+
+
+def accessibleClasses(teacher):
+    '''Returns the names of the existing classes teacher may open, in file order.'''
+    return [class_name for class_name in getRepository().classNames() if class_name in teacher.accessed_class]
+
+
+def getClass(class_name):
+    return getRepository().getClass(class_name)
+
+
+def classStudents(class_name):
+    '''
+    Returns:
+        list: The Student records of the class.
+
+    Raises:
+        ValueError: If the class does not exist.
+    '''
+    class_data = getRepository().getClass(class_name)
+    if not class_data:
+        raise ValueError(f"Class {class_name} not found")
+    return class_data.students
+
+
+def findStudent(student_id, class_name=None):
+    return getRepository().findStudent(student_id, class_name)
+
+
+def getTeacher(teacher_id):
+    return getRepository().getTeacher(teacher_id)
+
+
+# changes
+
+def createClass(class_name):
+    '''
+    Raises:
+        ValueError: If class_name is empty or the class already exists.
+    '''
+    class_name = class_name.strip()
+    if not class_name:
+        raise ValueError("Enter a class name")
+    if not getRepository().addClass(class_name):
+        raise ValueError("Class already exists")
+    return class_name
+
+
+def createTeacher(name, teacher_id, accessed_class=(), salary="", profile_pic=""):
+    '''
+    Returns:
+        Teacher: The teacher saved.
+
+    Raises:
+        ValueError: If the name or ID is empty or a teacher with the ID exists.
+    '''
+    if not name or not teacher_id:
+        raise ValueError("Enter the teacher's name and ID")
+    teacher = Teacher(name=name, id=teacher_id, accessed_class=list(accessed_class), salary=salary, profile_pic=profile_pic)
+    if not getRepository().addTeacher(teacher):
+        raise ValueError("Teacher already exists!")
+    return teacher
+
+
+def makeStudent(name, student_id, roll, marks, age, address="", phone="", guardian=""):
+    '''
+    Builds a Student from form or command line values, checking them on the way.
+
+    Args:
+        name (str): Student's name.
+        student_id (str): Student's ID.
+        roll (str): Roll number in the class.
+        marks (Mapping): Subject -> mark, as ints or text; every subject in SUBJECTS is needed.
+        age (int or str): Student's age.
+        address (str): Student's address.
+        phone (str): Student's phone number.
+        guardian (str): Student's guardian.
+
+    Raises:
+        ValueError: If a value is missing or not a number where one is needed.
+    '''
+    if not name or not student_id or not roll:
+        raise ValueError("Enter the student's name, ID and roll")
+    unknown = [subject for subject in marks if subject not in SUBJECTS]
+    if unknown:
+        raise ValueError(f"Unknown subject: {unknown[0]}")
+    return Student(
+        name=name,
+        id=student_id,
+        roll=str(roll),
+        marks={subject: _wholeNumber(marks.get(subject, ""), f"{subject} mark") for subject in SUBJECTS},
+        other_info={
+            "Age": _wholeNumber(age, "Age"),
+            "Address": address,
+            "Phone Number": phone,
+            "Guardian": guardian,
+        }
+    )
+
+
+def addStudent(class_name, student):
+    '''
+    Raises:
+        ValueError: If the class does not exist.
+    '''
+    if not getRepository().addStudent(class_name, student):
+        raise ValueError(f"Class {class_name} not found")
+    return student
+
+
+def updateMark(class_name, roll, subject, mark):
+    '''
+    Adds mark to the student's mark in subject, like the evaluate window.
+
+    Raises:
+        ValueError: If mark is not a number, or the class, roll or subject does not exist.
+    '''
+    getRepository().updateMark(class_name, str(roll).strip(), subject.strip(), _wholeNumber(mark, "Mark"))
+
+
+def importStudents(path, file_format=None, skip_invalid=False, dry_run=False):
+    '''
+    Adds the students in a CSV or JSONL file to their classes in one batch; see
+    student_import.py for the file layout and the checks made.
+
+    Returns:
+        ImportReport: Rows read, rejected rows with their line numbers, and what was saved.
+
+    Raises:
+        ValueError: If the file's format or CSV header is wrong.
+    '''
+    return student_import.importStudents(getRepository(), path, file_format, skip_invalid, dry_run)
+
+
+def setMarks(class_name, marks):
+    '''
+    Replaces many marks of a class in one batch, as the marks grid saves them.
+
+    Args:
+        class_name (str): The class.
+        marks (iterable): (roll, subject, mark) triples; marks are ints or text from 0 to 100.
+
+    Raises:
+        ValueError: If a mark is not valid, or the class, a roll or a subject does not
+            exist; none of the marks are changed then.
+    '''
+    marks = [(str(roll), subject, parseMark(mark, subject)) for roll, subject, mark in marks]
+    getRepository().setMarks(class_name, marks)
+
+
+def promoteStudents(dry_run=False, archive_file=None, reset_marks=True, pass_mark=None, max_failed=None):
+    '''
+    Promotes the whole school to the next year in one write; see promotion.py for the rules.
+    pass_mark and max_failed default to the promotion settings.
+
+    Returns:
+        PromotionReport: What changed, or with dry_run what would change.
+
+    Raises:
+        ValueError: If the archive file exists, a rule value is not a whole number, or two
+            classes share a name; nothing is changed then.
+    '''
+    rule = PassRule(
+        _wholeNumber(getSetting("promotion_pass_mark") if pass_mark is None else pass_mark, "Pass mark"),
+        _wholeNumber(getSetting("promotion_max_failed") if max_failed is None else max_failed, "Failed subjects allowed"),
+    )
+    return getRepository().promote(rule, reset_marks, archive_file or None, dry_run)
+
+
+def makeThumbnails(paths=(), processes=None):
+    '''
+    Makes the profile picture thumbnails of many pictures at once, one worker process per
+    core, so the screens never have to resize them. Folders are expanded to the pictures
+    in them. With no paths, the admin's and every teacher's profile picture that is kept as
+    a file path is done; pictures in the photo store are already rendered when uploaded.
+
+    Returns:
+        tuple: ({path: thumbnail file}, {path: error message}), as thumbnails.makeThumbnails.
+    '''
+    # Pillow is only loaded for this
+    import thumbnails
+    from photo_store import isStoreReference
+
+    pictures = []
+    for path in paths:
+        if os.path.isdir(path):
+            pictures += sorted(os.path.join(path, name) for name in os.listdir(path)
+                               if os.path.splitext(name)[1].lower() in PICTURE_EXTENSIONS)
+        else:
+            pictures.append(path)
+    if not paths:
+        pictures = [teacher.profile_pic for teacher in getRepository().iterTeachers()]
+        try:
+            with open(ADMIN_FILE) as f:
+                pictures.append(json.load(f).get("profile_pic"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        pictures = [picture for picture in pictures if picture and not isStoreReference(picture)]
+    return thumbnails.makeThumbnails(pictures, processes=processes)
+
+
+def exportRecords(kind, path, file_format=None, compress=None, classes=None, subject=None, min_mark=None, max_mark=None):
+    '''
+    Writes classes, students, marks or teachers to a CSV or JSONL file, streaming them one
+    record at a time; see exporters.py for the columns and filters.
+
+    Returns:
+        int: The number of rows written.
+
+    Raises:
+        ValueError: If kind, the format or a class is unknown, or the filter does not fit kind.
+    '''
+    return exporters.export(getRepository(), kind, path, file_format, compress, classes, subject, min_mark, max_mark)
@@ -0,0 +1,74 @@
+import json
+
+
+SETTINGS_FILE = 'settings.json'
+
+# Every key can be overridden in settings.json; a missing file means all defaults.
+DEFAULTS = {
+    # "json" keeps data in classes.json / teachers.json, "sharded" keeps one file per class
+    # in shard_directory, "sqlite" uses sqlite_file
+    "storage_backend": "json",
+    "shard_directory": "classes",
+    "sqlite_file": "school.db",
+    # JSON backend only: "snapshot" rewrites classes.json on every change, "journal" appends to classes.journal
+    "storage_mode": "snapshot",
+    "journal_file": "classes.journal",
+    # fold the journal back into classes.json after this many records
+    "journal_compact_every": 1000,
+    # JSON backend only: keep marks in one compact column per subject instead of a dict per student
+    "columnar_marks": True,
+    # spaces of indentation in the saved JSON files; null writes them without line breaks,
+    # which saves a large school several times faster
+    "json_indent": 4,
+    # seconds to gather writes to the same JSON file into one disk write; 0 writes at once
+    "write_coalesce_window": 0.0,
+    # JSON backends: lock files against other copies of the app and re-apply a change on top
+    # of anything they saved first; writes are then never delayed by write_coalesce_window
+    "file_locking": True,
+    # menu, login and credentials screens kept built in memory; the least recently used
+    # one is destroyed when another is built (the main menu is always kept)
+    "screen_cache_size": 4,
+    # profile pictures are resized to 200x200 once and saved here; the PhotoImages of the
+    # last thumbnail_memory_cache pictures shown are kept in memory
+    "thumbnail_directory": ".thumbnails",
+    "thumbnail_memory_cache": 16,
+    # uploaded pictures are copied here, named by the hash of their contents
+    "photo_directory": "photos",
+    # end-of-year promotion: a student passes with at least promotion_pass_mark in every
+    # subject but promotion_max_failed of them
+    "promotion_pass_mark": 33,
+    "promotion_max_failed": 0,
+    # after the main menu is drawn, import the login and account screens in a background
+    # thread so opening them does not wait on it
+    "warm_imports": True,
+}
+
+_settings = None
+
+
+def loadSettings(filename=SETTINGS_FILE):
+    '''
+    Reads settings.json and fills in defaults for missing keys.
+
+    Args:
+        filename (str): The settings file. Defaults to 'settings.json'.
+    '''
+    settings = dict(DEFAULTS)
+    try:
+        with open(filename, 'r') as f:
+            settings.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    except json.JSONDecodeError:
+        print(f"{filename} is corrupted, using default settings")
+    return settings
+
+
+def getSetting(name):
+    '''
+    Returns one setting, reading settings.json on first use.
+    '''
+    global _settings
+    if _settings is None:
+        _settings = loadSettings()
+    return _settings[name]
@@ -0,0 +1,330 @@
+import argparse
+import json
+import os
+import re
+from contextlib import ExitStack, contextmanager
+
+import json_stream
+from indexes import StudentIndex
+from mutations import addStudentRecord, updateMarkRecord, setMarkRecord, promoteRecord, applyMutation
+from promotion import planPromotion, writeArchive
+from records import SchoolClass, Student
+from repository import JsonRepository, CLASSES_FILE, TEACHERS_FILE
+from storage import atomicWriteJson
+
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def _shardIndex(shard):
+    # a shard is a single class dict; its record shares the students list with it, so
+    # changes made through the index show up in the cached shard
+    return StudentIndex({"classes": [SchoolClass.fromDict(shard, encode_other_info=True)]})
+
+
+class ShardedRepository(JsonRepository):
+    '''
+    Repository that keeps each class in its own file, so opening, adding a student to or
+    marking one class reads and rewrites only that class.
+
+    Layout of the shard directory:
+        manifest.json          {"classes": [{"class": "1", "file": "class_0_1.json"}, ...]}
+        class_0_1.json         {"class": "1", "students": [...]}
+
+    Until the directory has a manifest (see split()), every call falls back to the
+    monolithic classes.json exactly like JsonRepository. Teachers always live in
+    teachers.json.
+
+    Attributes:
+        directory (str): The shard directory.
+
+    Methods:
+        isSharded(self): True once the shard directory has a manifest.
+        plus everything in Repository.
+    '''
+
+    def __init__(self, directory, classes_file=CLASSES_FILE, teachers_file=TEACHERS_FILE, cache=None):
+        super().__init__(classes_file=classes_file, teachers_file=teachers_file, cache=cache)
+        self.directory = directory
+        self.manifest_file = os.path.join(directory, MANIFEST_FILE)
+        self._dirty = set()
+        # shards locked by the running batch, and the stack that releases them
+        self._locked = set()
+        self._batch_locks = None
+
+    def isSharded(self):
+        return os.path.exists(self.manifest_file)
+
+    def _manifest(self):
+        return self.cache.load(self.manifest_file)
+
+    def _shardFiles(self):
+        return self.cache.derived(
+            self.manifest_file, "files",
+            lambda manifest: {entry["class"]: os.path.join(self.directory, entry["file"]) for entry in manifest["classes"]}
+        )
+
+    def _shard(self, class_name):
+        filename = self._shardFiles().get(class_name)
+        if filename is None:
+            return None
+        return self.cache.derived(filename, "students", _shardIndex)
+
+    def _lockShard(self, filename):
+        # inside a batch a shard stays locked from its first change until the batch ends
+        if self._batch_depth > 0 and filename not in self._locked:
+            self._batch_locks.enter_context(self.cache.exclusive(filename))
+            self._locked.add(filename)
+
+    def _save(self, class_name):
+        if self._batch_depth > 0:
+            self._dirty.add(class_name)
+            return
+        filename = self._shardFiles()[class_name]
+        self.cache.store(filename, self.cache.load(filename), keep_derived=True)
+
+    def classNames(self):
+        if not self.isSharded():
+            return super().classNames()
+        return [entry["class"] for entry in self._manifest()["classes"]]
+
+    def getClass(self, class_name):
+        if not self.isSharded():
+            return super().getClass(class_name)
+        index = self._shard(class_name)
+        return index.getClass(class_name) if index else None
+
+    def hasClass(self, class_name):
+        if not self.isSharded():
+            return super().hasClass(class_name)
+        return class_name in self._shardFiles()
+
+    def findStudent(self, student_id, class_name=None):
+        if not self.isSharded():
+            return super().findStudent(student_id, class_name)
+        if class_name is not None:
+            index = self._shard(class_name)
+            return index.findStudent(student_id, class_name) if index else None
+        for name in self.classNames():
+            student = self._shard(name).findStudent(student_id)
+            if student is not None:
+                return student
+        return None
+
+    def addClass(self, class_name):
+        if not self.isSharded():
+            return super().addClass(class_name)
+        with self.cache.exclusive(self.manifest_file):
+            manifest = self._manifest()
+            if class_name in self._shardFiles():
+                return False
+            safe_name = re.sub(r'[^A-Za-z0-9_-]', '_', class_name)
+            entry = {"class": class_name, "file": f"class_{len(manifest['classes'])}_{safe_name}.json"}
+            # the shard must exist before the manifest points at it
+            atomicWriteJson(os.path.join(self.directory, entry["file"]), {"class": class_name, "students": []})
+            manifest["classes"].append(entry)
+            self.cache.store(self.manifest_file, manifest, durable=True)
+            return True
+
+    def _commitToShard(self, record):
+        filename = self._shardFiles().get(record["class"])
+        if filename is None:
+            raise ValueError(f"Class {record['class']} not found")
+        self._lockShard(filename)
+        with self.cache.exclusive(filename):
+            # reloads the shard if another process saved it since it was cached
+            index = self._shard(record["class"])
+            applyMutation(index, record)
+            try:
+                self._save(record["class"])
+            except Exception:
+                self.cache.invalidate(filename)
+                raise
+
+    def addStudent(self, class_name, student):
+        if not self.isSharded():
+            return super().addStudent(class_name, student)
+        try:
+            self._commitToShard(addStudentRecord(class_name, student))
+        except ValueError:
+            return False
+        return True
+
+    def addStudents(self, students):
+        '''
+        Checks every class first, then adds each class's students under its shard's lock
+        and writes each shard once, when the batch ends.
+        '''
+        if not self.isSharded():
+            return super().addStudents(students)
+        with self.batch():
+            files = self._shardFiles()
+            groups = {}
+            for class_name, student in students:
+                if class_name not in files:
+                    raise ValueError(f"Class {class_name} not found")
+                groups.setdefault(class_name, []).append(student)
+            for class_name, group in groups.items():
+                self._lockShard(files[class_name])
+                index = self._shard(class_name)
+                for student in group:
+                    applyMutation(index, addStudentRecord(class_name, student))
+                self._save(class_name)
+
+    def updateMark(self, class_name, roll, subject, mark):
+        if not self.isSharded():
+            return super().updateMark(class_name, roll, subject, mark)
+        self._commitToShard(updateMarkRecord(class_name, roll, subject, int(mark)))
+
+    def setMark(self, class_name, roll, subject, mark):
+        if not self.isSharded():
+            return super().setMark(class_name, roll, subject, mark)
+        self._commitToShard(setMarkRecord(class_name, roll, subject, int(mark)))
+
+    def iterClasses(self, class_names=None):
+        '''
+        Streams each shard that is not already cached instead of loading it into the cache.
+        '''
+        if not self.isSharded():
+            yield from super().iterClasses(class_names)
+            return
+        for class_name, filename in list(self._shardFiles().items()):
+            if class_names is not None and class_name not in class_names:
+                continue
+            if self.cache.isFresh(filename):
+                yield class_name, iter(self._shard(class_name).getClass(class_name).students)
+                continue
+            for _name, students in json_stream.iterClass(filename):
+                yield class_name, map(Student.fromDict, students)
+
+    def promote(self, rule, reset_marks=True, archive_file=None, dry_run=False):
+        '''
+        Locks every shard, promotes the classes in memory and then rewrites each shard once.
+        Each shard is replaced atomically, but not all of them at the same instant.
+        '''
+        if not self.isSharded():
+            return super().promote(rule, reset_marks, archive_file, dry_run)
+        with self._lock, ExitStack() as locks:
+            files = self._shardFiles()
+            for filename in files.values():
+                locks.enter_context(self.cache.exclusive(filename))
+            indexes = [self._shard(class_name) for class_name in files]
+            classes = [index.getClass(class_name) for index, class_name in zip(indexes, files)]
+            plan = planPromotion(classes, rule)
+            if dry_run:
+                return plan.report
+            if archive_file is not None:
+                plan.report.archived = writeArchive(archive_file, plan)
+            try:
+                # the shards' class records share their students lists with the cached shards
+                applyMutation(StudentIndex({"classes": classes}), promoteRecord(rule.pass_mark, rule.max_failed, reset_marks))
+                for index, filename in zip(indexes, files.values()):
+                    index.reindex()
+                    self.cache.store(filename, self.cache.load(filename), keep_derived=True)
+            except Exception:
+                for filename in files.values():
+                    self.cache.invalidate(filename)
+                if archive_file is not None:
+                    os.remove(archive_file)
+                raise
+            plan.report.saved = True
+            return plan.report
+
+    @contextmanager
+    def batch(self):
+        '''
+        Writes each shard changed inside the block once, when the block exits. A shard is
+        locked from its first change to the end of the block, so nobody else can save it in
+        between. If the block raises, nothing is written and the changed shards are reloaded
+        from disk on next use.
+        '''
+        if not self.isSharded():
+            with super().batch():
+                yield self
+            return
+
+        with self._lock, ExitStack() as locks:
+            if self._batch_depth == 0:
+                self._batch_locks = locks
+            self._batch_depth += 1
+            try:
+                yield self
+            except Exception:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._endBatch()
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                dirty, self._dirty = self._dirty, set()
+                try:
+                    for class_name in dirty:
+                        self._save(class_name)
+                except Exception:
+                    self._endBatch()
+                    raise
+                self._locked.clear()
+                self._batch_locks = None
+
+    def _endBatch(self):
+        # a shard may have been changed before a failing mutation marked it dirty
+        for filename in self._locked:
+            self.cache.invalidate(filename)
+        self._locked.clear()
+        self._dirty.clear()
+        self._batch_locks = None
+
+
+def split(classes_file=CLASSES_FILE, directory='classes'):
+    '''
+    Splits a monolithic classes.json into one file per class plus a manifest. The manifest
+    is written last, so an interrupted split leaves the app reading classes.json.
+
+    Returns:
+        int: Number of classes written.
+    '''
+    with open(classes_file, 'r') as f:
+        data = json.load(f)
+
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"classes": []}
+    for position, class_data in enumerate(data.get("classes", [])):
+        safe_name = re.sub(r'[^A-Za-z0-9_-]', '_', class_data["class"])
+        entry = {"class": class_data["class"], "file": f"class_{position}_{safe_name}.json"}
+        atomicWriteJson(os.path.join(directory, entry["file"]), class_data)
+        manifest["classes"].append(entry)
+    atomicWriteJson(os.path.join(directory, MANIFEST_FILE), manifest)
+    return len(manifest["classes"])
+
+
+def join(directory='classes', classes_file=CLASSES_FILE):
+    '''
+    Rebuilds a monolithic classes.json from the shard directory.
+
+    Returns:
+        int: Number of classes written.
+    '''
+    with open(os.path.join(directory, MANIFEST_FILE), 'r') as f:
+        manifest = json.load(f)
+
+    classes = []
+    for entry in manifest["classes"]:
+        with open(os.path.join(directory, entry["file"]), 'r') as f:
+            classes.append(json.load(f))
+    atomicWriteJson(classes_file, {"classes": classes})
+    return len(classes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert between classes.json and one file per class.")
+    parser.add_argument("action", choices=["split", "join"])
+    parser.add_argument("--classes", default=CLASSES_FILE)
+    parser.add_argument("--directory", default="classes")
+    args = parser.parse_args()
+
+    if args.action == "split":
+        count = split(args.classes, args.directory)
+        print(f"Wrote {count} classes to {args.directory}")
+    else:
+        count = join(args.directory, args.classes)
+        print(f"Wrote {count} classes to {args.classes}")
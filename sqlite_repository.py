@@ -0,0 +1,349 @@
+import argparse
+import json
+import sqlite3
+import os
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+from marks_store import SUBJECTS
+from promotion import GRADUATED, planPromotion, writeArchive
+from records import SchoolClass, Student, Teacher
+from repository import Repository, CLASSES_FILE, TEACHERS_FILE
+from storage import jsonDefault
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS classes (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    class_name TEXT NOT NULL REFERENCES classes(name),
+    student_id TEXT NOT NULL,
+    roll TEXT NOT NULL,
+    name TEXT NOT NULL,
+    other_info TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS students_by_student_id ON students(student_id);
+CREATE INDEX IF NOT EXISTS students_by_class_roll ON students(class_name, roll);
+CREATE TABLE IF NOT EXISTS marks (
+    student INTEGER NOT NULL REFERENCES students(id),
+    subject TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    mark INTEGER NOT NULL,
+    PRIMARY KEY (student, subject)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS teachers (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS teacher_classes (
+    teacher_id TEXT NOT NULL REFERENCES teachers(id),
+    class_name TEXT NOT NULL,
+    PRIMARY KEY (teacher_id, class_name)
+);
+CREATE INDEX IF NOT EXISTS teacher_classes_by_class ON teacher_classes(class_name);
+"""
+
+
+class SqliteRepository(Repository):
+    '''
+    Repository backed by a SQLite database in WAL mode, with indexes on student ID,
+    (class, roll) and teacher id. Use migrate() once to copy the JSON files in.
+
+    Attributes:
+        path (str): The database file.
+        connection (sqlite3.Connection): The open connection, shared under a lock.
+
+    Methods:
+        __init__(self, path): Opens (and if needed creates) the database.
+        close(self): Closes the connection.
+        plus everything in Repository.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+    @contextmanager
+    def batch(self):
+        '''
+        Runs everything inside the block in one transaction.
+        '''
+        with self._lock:
+            if self._batch_depth == 0:
+                self.connection.execute("BEGIN IMMEDIATE")
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.connection.execute("ROLLBACK")
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.connection.execute("COMMIT")
+
+    def classNames(self):
+        with self._lock:
+            return [row[0] for row in self.connection.execute("SELECT name FROM classes ORDER BY position")]
+
+    def _students(self, where, params):
+        rows = self.connection.execute(
+            f"SELECT id, student_id, roll, name, other_info FROM students WHERE {where} ORDER BY id", params
+        ).fetchall()
+        if not rows:
+            return []
+
+        students = {}
+        for row_id, student_id, roll, name, other_info in rows:
+            # OtherInfo stays JSON text until someone reads it
+            students[row_id] = Student(name, student_id, roll, {}, other_info)
+        mark_rows = self.connection.execute(
+            f"SELECT student, subject, mark FROM marks WHERE student IN "
+            f"(SELECT id FROM students WHERE {where}) ORDER BY student, position", params
+        )
+        for row_id, subject, mark in mark_rows:
+            students[row_id].marks[subject] = mark
+        return list(students.values())
+
+    def getClass(self, class_name):
+        with self._lock:
+            if self.connection.execute("SELECT 1 FROM classes WHERE name = ?", (class_name,)).fetchone() is None:
+                return None
+            return SchoolClass(class_name, self._students("class_name = ?", (class_name,)))
+
+    def findStudent(self, student_id, class_name=None):
+        with self._lock:
+            if class_name is None:
+                row = self.connection.execute(
+                    "SELECT id FROM students WHERE student_id = ? ORDER BY id LIMIT 1", (student_id,)
+                ).fetchone()
+            else:
+                row = self.connection.execute(
+                    "SELECT id FROM students WHERE student_id = ? AND class_name = ? ORDER BY id LIMIT 1",
+                    (student_id, class_name)
+                ).fetchone()
+            if row is None:
+                return None
+            return self._students("id = ?", (row[0],))[0]
+
+    def addClass(self, class_name):
+        with self.batch():
+            try:
+                self.connection.execute(
+                    "INSERT INTO classes (name, position) VALUES (?, (SELECT COUNT(*) FROM classes))", (class_name,)
+                )
+            except sqlite3.IntegrityError:
+                return False
+        return True
+
+    def _insertStudent(self, class_name, student):
+        cursor = self.connection.execute(
+            "INSERT INTO students (class_name, student_id, roll, name, other_info) VALUES (?, ?, ?, ?, ?)",
+            (class_name, student["ID"], student["Roll"], student["Name"], json.dumps(student.get("OtherInfo", {})))
+        )
+        self.connection.executemany(
+            "INSERT INTO marks (student, subject, position, mark) VALUES (?, ?, ?, ?)",
+            [(cursor.lastrowid, subject, position, mark) for position, (subject, mark) in enumerate(student.get("Marks", {}).items())]
+        )
+
+    def addStudent(self, class_name, student):
+        with self.batch():
+            if self.connection.execute("SELECT 1 FROM classes WHERE name = ?", (class_name,)).fetchone() is None:
+                return False
+            self._insertStudent(class_name, student)
+        return True
+
+    def updateMark(self, class_name, roll, subject, mark):
+        delta = int(mark)
+        with self.batch():
+            if self.connection.execute("SELECT 1 FROM classes WHERE name = ?", (class_name,)).fetchone() is None:
+                raise ValueError(f"Class {class_name} not found")
+            row = self.connection.execute(
+                "SELECT id FROM students WHERE class_name = ? AND roll = ? ORDER BY id LIMIT 1", (class_name, roll)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Roll: {roll} not found")
+            cursor = self.connection.execute(
+                "UPDATE marks SET mark = mark + ? WHERE student = ? AND subject = ?", (delta, row[0], subject)
+            )
+            if cursor.rowcount == 0:
+                raise ValueError(f"{subject} not found\nWrite subject name in Pascal case")
+
+    def setMark(self, class_name, roll, subject, mark):
+        mark = int(mark)
+        with self.batch():
+            if self.connection.execute("SELECT 1 FROM classes WHERE name = ?", (class_name,)).fetchone() is None:
+                raise ValueError(f"Class {class_name} not found")
+            row = self.connection.execute(
+                "SELECT id FROM students WHERE class_name = ? AND roll = ? ORDER BY id LIMIT 1", (class_name, roll)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Roll: {roll} not found")
+            cursor = self.connection.execute(
+                "UPDATE marks SET mark = ? WHERE student = ? AND subject = ?", (mark, row[0], subject)
+            )
+            if cursor.rowcount == 0:
+                if subject not in SUBJECTS:
+                    raise ValueError(f"{subject} not found\nWrite subject name in Pascal case")
+                self.connection.execute(
+                    "INSERT INTO marks (student, subject, position, mark) "
+                    "VALUES (?, ?, (SELECT COUNT(*) FROM marks WHERE student = ?), ?)", (row[0], subject, row[0], mark)
+                )
+
+    def promote(self, rule, reset_marks=True, archive_file=None, dry_run=False):
+        '''
+        Moves, renumbers and resets the students with a few statements in one transaction.
+        '''
+        archived = False
+        try:
+            with self.batch():
+                classes = [self.getClass(class_name) for class_name in self.classNames()]
+                plan = planPromotion(classes, rule)
+                if dry_run:
+                    return plan.report
+
+                # getClass returns each class's students in id order, so taking the ids in
+                # the same order pairs every record with its row
+                row_ids = defaultdict(deque)
+                for row_id, class_name, student_id, roll in self.connection.execute(
+                        "SELECT id, class_name, student_id, roll FROM students ORDER BY id"):
+                    row_ids[(class_name, student_id, roll)].append(row_id)
+                leaving = []
+                moves = {}
+                for student, from_class, result, to_class, new_roll in plan.moves:
+                    row_id = row_ids[(from_class, student.id, student.roll)].popleft()
+                    if result == GRADUATED:
+                        leaving.append((row_id,))
+                    else:
+                        moves[id(student)] = (row_id, to_class, new_roll)
+                # classes list their students in id order, so the students that stay get new
+                # ids, above every old one, in the order of their new rolls
+                next_id = self.connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM students").fetchone()[0]
+                new_ids = []
+                moved = []
+                for roster in plan.rosters.values():
+                    for student in roster:
+                        row_id, to_class, new_roll = moves[id(student)]
+                        new_ids.append((next_id, row_id))
+                        moved.append((next_id, to_class, new_roll, row_id))
+                        next_id += 1
+
+                if archive_file is not None:
+                    plan.report.archived = writeArchive(archive_file, plan)
+                    archived = True
+                self.connection.executemany("DELETE FROM marks WHERE student = ?", leaving)
+                self.connection.executemany("DELETE FROM students WHERE id = ?", leaving)
+                # marks point at the new ids before the students have them; checked at COMMIT
+                self.connection.execute("PRAGMA defer_foreign_keys = ON")
+                self.connection.executemany("UPDATE marks SET student = ? WHERE student = ?", new_ids)
+                self.connection.executemany("UPDATE students SET id = ?, class_name = ?, roll = ? WHERE id = ?", moved)
+                if reset_marks:
+                    self.connection.execute("UPDATE marks SET mark = 0")
+        except Exception:
+            if archived:
+                os.remove(archive_file)
+            raise
+        plan.report.saved = True
+        return plan.report
+
+    def getTeacher(self, teacher_id):
+        with self._lock:
+            row = self.connection.execute("SELECT record FROM teachers WHERE id = ?", (teacher_id,)).fetchone()
+            return Teacher.fromDict(json.loads(row[0])) if row else None
+
+    def teachersForClass(self, class_name):
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT t.record FROM teacher_classes c JOIN teachers t ON t.id = c.teacher_id "
+                "WHERE c.class_name = ? ORDER BY t.position", (class_name,)
+            )
+            return [Teacher.fromDict(json.loads(row[0])) for row in rows]
+
+    def iterTeachers(self):
+        with self._lock:
+            rows = self.connection.execute("SELECT record FROM teachers ORDER BY position").fetchall()
+        for row in rows:
+            yield Teacher.fromDict(json.loads(row[0]))
+
+    def _insertTeacher(self, teacher):
+        self.connection.execute(
+            "INSERT INTO teachers (id, position, record) VALUES (?, (SELECT COUNT(*) FROM teachers), ?)",
+            (teacher["id"], json.dumps(teacher, default=jsonDefault))
+        )
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO teacher_classes (teacher_id, class_name) VALUES (?, ?)",
+            [(teacher["id"], class_name) for class_name in teacher.get("accessed class", [])]
+        )
+
+    def addTeacher(self, teacher):
+        with self.batch():
+            try:
+                self._insertTeacher(teacher)
+            except sqlite3.IntegrityError:
+                return False
+        return True
+
+
+def migrate(db_path, classes_file=CLASSES_FILE, teachers_file=TEACHERS_FILE):
+    '''
+    Copies classes.json and teachers.json into the database in one transaction, replacing
+    whatever it held. A missing JSON file is treated as empty.
+
+    Returns:
+        tuple: (classes, students, teachers) copied.
+    '''
+    def read(filename, key):
+        try:
+            with open(filename, 'r') as f:
+                return json.load(f).get(key, [])
+        except FileNotFoundError:
+            return []
+
+    classes = read(classes_file, "classes")
+    teachers = read(teachers_file, "teachers")
+
+    repository = SqliteRepository(db_path)
+    student_count = 0
+    try:
+        with repository.batch():
+            for table in ("marks", "students", "classes", "teacher_classes", "teachers"):
+                repository.connection.execute(f"DELETE FROM {table}")
+            for position, class_data in enumerate(classes):
+                repository.connection.execute(
+                    "INSERT INTO classes (name, position) VALUES (?, ?)", (class_data["class"], position)
+                )
+                for student in class_data["students"]:
+                    repository._insertStudent(class_data["class"], student)
+                    student_count += 1
+            for teacher in teachers:
+                repository._insertTeacher(teacher)
+    finally:
+        repository.close()
+    return len(classes), student_count, len(teachers)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copy classes.json and teachers.json into a SQLite database.")
+    parser.add_argument("database", nargs="?", default="school.db")
+    parser.add_argument("--classes", default=CLASSES_FILE)
+    parser.add_argument("--teachers", default=TEACHERS_FILE)
+    args = parser.parse_args()
+
+    class_count, student_count, teacher_count = migrate(args.database, args.classes, args.teachers)
+    print(f"Copied {class_count} classes, {student_count} students and {teacher_count} teachers into {args.database}")
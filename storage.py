@@ -0,0 +1,306 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+from settings import getSetting
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+
+def jsonDefault(value):
+    '''
+    json.dump fallback that saves records (see records.py) and mapping views (such as
+    marks_store.MarksRow) as plain objects.
+    '''
+    if hasattr(value, "toJson"):
+        return value.toJson()
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def atomicWriteJson(filename, data, indent=None):
+    '''
+    Writes data to filename so that a crash leaves either the old or the new file, never a
+    truncated one: the JSON goes to a temporary file in the same directory, is fsynced, and
+    then renamed over filename.
+
+    Args:
+        filename (str): The JSON file to write.
+        data (dict): The document to save.
+        indent (int): Spaces per indentation level. Defaults to the json_indent setting.
+    '''
+    if indent is None:
+        indent = getSetting("json_indent")
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(filename) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            # one string is quicker than json.dump's many small writes
+            f.write(json.dumps(data, indent=indent, default=jsonDefault))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filename)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsyncDirectory(directory)
+
+
+def _fsyncDirectory(directory):
+    # makes the rename itself durable; directories cannot be opened like this on Windows
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class FileLock:
+    '''
+    Reader/writer lock on a data file shared by every process on the machine, plus the
+    file's version stamp.
+
+    The lock is taken on a sidecar "<filename>.lock" (flock on POSIX; on Windows, where
+    there is no shared mode, both modes are exclusive). The same sidecar holds a counter
+    that every writer bumps, so other processes can tell that the file changed even when
+    its modification time and size did not.
+
+    Nested acquisitions by the same thread are free; asking for the writer lock while
+    holding the reader lock upgrades it for the inner block. Threads of one process take
+    turns.
+
+    Attributes:
+        path (str): The sidecar lock file.
+
+    Methods:
+        shared(self): Context manager holding the reader lock.
+        exclusive(self): Context manager holding the writer lock.
+        version(self): Returns the current version stamp.
+        bump(self): Increments the version stamp; the writer lock must be held.
+    '''
+
+    def __init__(self, filename):
+        self.path = filename + ".lock"
+        self._guard = threading.RLock()
+        self._modes = []
+        self._fd = None
+        self._pid = None
+
+    def _file(self):
+        if self._fd is None or self._pid != os.getpid():
+            # a forked child gets its own open file, or it would share the parent's lock
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._fd
+
+    def _lock(self, exclusive):
+        fd = self._file()
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        elif msvcrt is not None:
+            # lock a byte well past the stamp, so readers of the stamp are not refused
+            os.lseek(fd, 1 << 20, os.SEEK_SET)
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after 10 seconds; keep waiting
+                    continue
+
+    def _unlock(self):
+        fd = self._file()
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            os.lseek(fd, 1 << 20, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    @contextmanager
+    def _acquire(self, exclusive):
+        with self._guard:
+            # without flock the reader lock is already exclusive
+            upgrade = fcntl is not None and exclusive and self._modes and not any(self._modes)
+            if not self._modes or upgrade:
+                self._lock(exclusive)
+            self._modes.append(exclusive)
+            try:
+                yield self
+            finally:
+                self._modes.pop()
+                if not self._modes:
+                    self._unlock()
+                elif upgrade:
+                    self._lock(False)
+
+    def shared(self):
+        return self._acquire(False)
+
+    def exclusive(self):
+        return self._acquire(True)
+
+    def version(self):
+        fd = self._file()
+        os.lseek(fd, 0, os.SEEK_SET)
+        data = os.read(fd, 32).split(b"\n", 1)[0]
+        return int(data) if data.strip() else 0
+
+    def bump(self):
+        with self._guard:
+            if not any(self._modes):
+                raise RuntimeError(f"{self.path} must be held exclusively to change the version")
+            fd = self._file()
+            version = self.version() + 1
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, b"%d\n" % version)
+            return version
+
+
+class CoalescingWriter:
+    '''
+    Batches JSON writes. Writes to the same file that arrive within `window` seconds of the
+    first one are folded into a single atomic write of the latest data.
+
+    With a window of 0 every write happens immediately in the caller's thread.
+
+    A write that fails stays pending and is tried again with the next flush. flush() raises
+    the error once every pending file has been tried; if the failed flush ran on the timer
+    thread, the error is raised from the next write() or flush() call instead, so whoever
+    saves next sees it just like a failed direct save.
+
+    Attributes:
+        window (float): Seconds to wait for more writes before flushing.
+        requested (int): Number of write calls.
+        flushed (int): Number of files actually written to disk.
+
+    Methods:
+        write(self, filename, data, lock=None, on_flush=None): Schedules data to be written to filename.
+        flush(self): Writes everything that is pending now; raises the first OSError.
+        cancel(self, filename): Drops a pending write.
+        stats(self): Returns requested and flushed counts.
+    '''
+
+    def __init__(self, window=0.0):
+        self.window = window
+        self.requested = 0
+        self.flushed = 0
+        self._pending = {}
+        self._timer = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def write(self, filename, data, lock=None, on_flush=None):
+        '''
+        Args:
+            filename (str): The JSON file to write.
+            data (dict): The document. With a window it is serialized at flush time, so
+                later changes to the same object are included.
+            lock (threading.RLock): Held while data is serialized, so a flush from the
+                timer thread never sees a half-applied change.
+            on_flush (callable): Called with filename after the file is on disk.
+        '''
+        with self._lock:
+            error, self._error = self._error, None
+            if error is not None:
+                raise error
+            self.requested += 1
+            if self.window <= 0:
+                immediate = True
+            else:
+                immediate = False
+                self._pending[filename] = (data, lock, on_flush)
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self._flushLater)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+        if immediate:
+            self._writeOne(filename, data, lock, on_flush)
+
+    def flush(self):
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            error, self._error = self._error, None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        failed = {}
+        for filename, (data, lock, on_flush) in pending.items():
+            try:
+                self._writeOne(filename, data, lock, on_flush)
+            except OSError as e:
+                failed[filename] = (data, lock, on_flush)
+                error = error or e
+
+        if failed:
+            with self._lock:
+                for filename, entry in failed.items():
+                    # a write made since the flush started holds newer data
+                    self._pending.setdefault(filename, entry)
+        if error is not None:
+            raise error
+
+    def _flushLater(self):
+        try:
+            self.flush()
+        except OSError as e:
+            with self._lock:
+                self._error = e
+
+    def _writeOne(self, filename, data, lock, on_flush):
+        if lock is not None:
+            with lock:
+                atomicWriteJson(filename, data)
+        else:
+            atomicWriteJson(filename, data)
+        with self._lock:
+            self.flushed += 1
+        if on_flush is not None:
+            on_flush(filename)
+
+    def cancel(self, filename):
+        '''
+        Drops a pending write, for example before the same file is written synchronously.
+        '''
+        with self._lock:
+            self._pending.pop(filename, None)
+
+    def stats(self):
+        with self._lock:
+            return {"requested": self.requested, "flushed": self.flushed, "pending": len(self._pending)}
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def getWriter():
+    '''
+    Returns the process-wide writer, configured by the "write_coalesce_window" setting.
+    Anything still pending is flushed when the app exits.
+    '''
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = CoalescingWriter(getSetting("write_coalesce_window"))
+            atexit.register(_writer.flush)
+        return _writer
@@ -0,0 +1,259 @@
+'''
+Bulk import of students from a CSV or JSONL file, instead of one create-student form and
+one save per student.
+
+The file is read row by row. Every row is checked before anything is saved: the class
+must exist, name, ID and roll must be given, every subject in SUBJECTS needs a whole mark
+from 0 to 100, and OtherInfo may only hold Age (a whole number), Address, Phone Number and
+Guardian. An ID already used in the school or earlier in the file, or a roll already
+taken in its class, is a duplicate. The checks and the add run inside one
+repository.batch(), so the import is saved with a single write, either all of it is saved
+or none of it, and no other save can take an ID or roll between the check and the add.
+
+CSV files have a header row with the columns Class, Name, ID, Roll, one column per subject
+and Age, Address, Phone Number, Guardian. JSONL files hold one student per line, either
+with the same flat keys or in the classes.json shape plus "Class":
+    {"Class": "7", "Name": "...", "ID": "...", "Roll": "1", "Marks": {...}, "OtherInfo": {...}}
+'''
+import contextlib
+import csv
+import json
+import os
+
+from marks_store import SUBJECTS, parseMark
+from records import Student
+
+
+OTHER_INFO = ["Age", "Address", "Phone Number", "Guardian"]
+COLUMNS = ["Class", "Name", "ID", "Roll"] + SUBJECTS + OTHER_INFO
+
+# Bad rows kept in an ImportReport; the rest are only counted.
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportReport:
+    '''
+    Outcome of an import.
+
+    Attributes:
+        rows (int): Rows read from the file.
+        added (int): Students saved; 0 after a dry run or a rejected file.
+        per_class (dict): Class name -> number of valid rows for it.
+        errors (list): (line number, message) for the first MAX_REPORTED_ERRORS bad rows.
+        error_count (int): Number of bad rows, reported or not.
+        saved (bool): Whether anything was written.
+
+    Methods:
+        addError(self, line, message): Records a bad row.
+        summary(self): Returns a short text describing the outcome.
+    '''
+
+    def __init__(self):
+        self.rows = 0
+        self.added = 0
+        self.per_class = {}
+        self.errors = []
+        self.error_count = 0
+        self.saved = False
+
+    def addError(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    def summary(self):
+        text = f"{self.rows} rows read, {self.rows - self.error_count} valid, {self.error_count} rejected"
+        if self.saved:
+            text += f"; {self.added} students added"
+        else:
+            text += "; nothing saved"
+        return text
+
+
+def fileFormat(path):
+    '''Returns "csv" or "jsonl" from the file name.'''
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Can't tell the format of {path}; use a .csv or .jsonl file")
+
+
+def readRows(path, file_format=None):
+    '''
+    Yields (line number, row) for every student in the file, one at a time.
+
+    Args:
+        path (str): The CSV or JSONL file.
+        file_format (str): "csv" or "jsonl"; taken from the extension if not given.
+
+    Raises:
+        ValueError: If the CSV header has unknown or missing columns. A JSONL line that is
+            not a JSON object is yielded as its error message instead of a row.
+    '''
+    file_format = file_format or fileFormat(path)
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if file_format == "csv":
+            reader = csv.DictReader(f)
+            header = reader.fieldnames or []
+            unknown = [column for column in header if column not in COLUMNS]
+            missing = [column for column in COLUMNS if column not in header]
+            if unknown or missing:
+                raise ValueError("CSV header must be: " + ", ".join(COLUMNS)
+                                 + (f"\nUnknown: {', '.join(unknown)}" if unknown else "")
+                                 + (f"\nMissing: {', '.join(missing)}" if missing else ""))
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, f"Not JSON: {e.msg}"
+                    continue
+                yield line_number, row if isinstance(row, dict) else "Not a JSON object"
+
+
+def _text(row, key):
+    value = row.get(key)
+    return "" if value is None else str(value).strip()
+
+
+def parseStudent(row):
+    '''
+    Turns one row into (class name, Student).
+
+    Raises:
+        ValueError: Describing the first problem found in the row.
+    '''
+    if "Marks" in row or "OtherInfo" in row:
+        marks = row.get("Marks")
+        other_info = row.get("OtherInfo", {})
+        if not isinstance(marks, dict) or not isinstance(other_info, dict):
+            raise ValueError("Marks and OtherInfo must be objects")
+        unknown = [key for key in row if key not in ("Class", "Name", "ID", "Roll", "Marks", "OtherInfo")]
+    else:
+        if None in row:
+            raise ValueError("More fields than the header has columns")
+        marks = row
+        other_info = row
+        unknown = [key for key in row if key not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown field: {unknown[0]}")
+
+    class_name = _text(row, "Class")
+    name = _text(row, "Name")
+    student_id = _text(row, "ID")
+    roll = _text(row, "Roll")
+    for key, value in (("Class", class_name), ("Name", name), ("ID", student_id), ("Roll", roll)):
+        if not value:
+            raise ValueError(f"{key} is empty")
+
+    if marks is not row:
+        unknown = [subject for subject in marks if subject not in SUBJECTS]
+        if unknown:
+            raise ValueError(f"Unknown subject: {unknown[0]}")
+        unknown = [key for key in other_info if key not in OTHER_INFO]
+        if unknown:
+            raise ValueError(f"Unknown OtherInfo field: {unknown[0]}")
+    missing = [subject for subject in SUBJECTS if marks.get(subject) in (None, "")]
+    if missing:
+        raise ValueError(f"No mark for {', '.join(missing)}")
+
+    age = other_info.get("Age")
+    if isinstance(age, str) and age.strip().isdigit():
+        age = int(age)
+    if type(age) is not int:
+        raise ValueError(f"Age: {age!r} is not a whole number")
+
+    return class_name, Student(
+        name=name,
+        id=student_id,
+        roll=roll,
+        marks={subject: parseMark(marks[subject], subject) for subject in SUBJECTS},
+        other_info={
+            "Age": age,
+            "Address": _text(other_info, "Address"),
+            "Phone Number": _text(other_info, "Phone Number"),
+            "Guardian": _text(other_info, "Guardian"),
+        }
+    )
+
+
+class _TakenKeys:
+    '''
+    Every student ID in the school and every roll per class, read from the repository once
+    when the import starts and extended with each accepted row, so a row is checked with two
+    set lookups. importStudents builds it inside the batch that saves the rows.
+    '''
+
+    def __init__(self, repository):
+        self.ids = set()
+        self.rolls = {}
+        for class_name in repository.classNames():
+            students = repository.getClass(class_name).students
+            self.ids.update(student.id for student in students)
+            self.rolls[class_name] = {str(student.roll) for student in students}
+
+    def check(self, class_name, student):
+        rolls = self.rolls.get(class_name)
+        if rolls is None:
+            raise ValueError(f"Class {class_name} not found")
+        if student.id in self.ids:
+            raise ValueError(f"Duplicate ID {student.id}")
+        if student.roll in rolls:
+            raise ValueError(f"Duplicate roll {student.roll} in class {class_name}")
+
+    def add(self, class_name, student):
+        self.ids.add(student.id)
+        self.rolls[class_name].add(student.roll)
+
+
+def importStudents(repository, path, file_format=None, skip_invalid=False, dry_run=False):
+    '''
+    Reads students from path and adds them to their classes in one batch.
+
+    Args:
+        repository (Repository): Where the students are saved.
+        path (str): The CSV or JSONL file.
+        file_format (str): "csv" or "jsonl"; taken from the extension if not given.
+        skip_invalid (bool): Save the valid rows even if some rows are bad. By default a
+            single bad row means nothing is saved.
+        dry_run (bool): Check the file and report, but save nothing.
+
+    Returns:
+        ImportReport: What was read, rejected and saved.
+
+    Raises:
+        ValueError: If the file's format or CSV header is wrong.
+        FileNotFoundError: If path does not exist.
+    '''
+    report = ImportReport()
+    # a dry run saves nothing and needs no lock
+    with contextlib.nullcontext() if dry_run else repository.batch():
+        existing = _TakenKeys(repository)
+        accepted = []
+        for line_number, row in readRows(path, file_format):
+            report.rows += 1
+            try:
+                if isinstance(row, str):
+                    raise ValueError(row)
+                class_name, student = parseStudent(row)
+                existing.check(class_name, student)
+            except ValueError as e:
+                report.addError(line_number, str(e))
+                continue
+            existing.add(class_name, student)
+            accepted.append((class_name, student))
+            report.per_class[class_name] = report.per_class.get(class_name, 0) + 1
+
+        if dry_run or not accepted or (report.error_count and not skip_invalid):
+            return report
+
+        repository.addStudents(accepted)
+    report.added = len(accepted)
+    report.saved = True
+    return report
@@ -1,4 +1,10 @@
-from functions import showCopyrightClaim, showErrorMessage, uploadImage, loadProfileImage
+from functions import showCopyrightClaim, showErrorMessage, uploadImage, loadProfileImage, clearEntries
+import services
+from virtual_list import VirtualList
+from background_loader import BackgroundLoader
+from marks_chart import MarksChart
+from marks_grid import MarksSheet, MarksGrid
+from tkinter import messagebox
 import json
 
 class TeacherAccount:
@@ -11,6 +17,7 @@ class TeacherAccount:
         master (tk.Tk): The main window or parent widget.
         ctk (module): CustomTkinter module used for custom widgets.
         button_font (font): Font used for the buttons.
+        teacher (Teacher): The teacher's record.
         teacher_name (str): The name of the teacher.
         teacher_salary (str): The salary of the teacher.
         accessed_class (list): List of classes the teacher has access to.
@@ -20,26 +27,38 @@ class TeacherAccount:
         teacher_acc_frame (CTkFrame): Frame that holds teacher-specific widgets.
         profile_frame (CTkFrame): Frame for displaying the profile picture.
         profile_picture_label (CTkLabel): Label for the profile picture.
+        profile_loading (PendingPhoto): The profile picture being decoded, or None.
         upload_button (CTkButton): Button to upload a profile picture.
         back_button (CTkButton): Button to navigate back to the main menu.
         label_name (CTkLabel): Label to display the teacher's name.
         label_id (CTkLabel): Label to display the teacher's ID.
         label_salary (CTkLabel): Label to display the teacher's salary.
         label_accessed_class (CTkLabel): Label to display the classes the teacher has access to.
+        loading_label (CTkLabel): Placeholder shown while the classes load.
+        class_loader (BackgroundLoader): Reads the classes and adds their buttons.
 
     Methods:
-        __init__(self, master, ctk, button_font, teacher_name, teacher_salary, accessed_class, teacher_id): 
+        __init__(self, master, ctk, button_font, teacher): 
             Initializes the TeacherAccount class and sets up the GUI elements.
         backToMain(self): Destroys the current main frame and returns to the main menu.
-        showAccessedClass(self): Displays accessed classes from 'classes.json'.
+        showAccessedClass(self): Displays accessed classes from 'classes.json', loading them in the background.
+        onClassesError(self, error): Reports a failure to read the classes.
         addClassButton(self, class_name): Adds a button for each class in the main frame.
         openClass(self, c, filename='classes.json'): Opens a window to display and manage students in the selected class.
-        onClosing(self): Closes the student display window.
+        buildClassWindow(self, window): Creates the widgets of the class window.
+        showStudentMarks(self, student): Opens a window with a student's marks chart.
+        buildMarksWindow(self, window): Creates the marks chart window.
+        refreshStudentMarks(self, c, roll): Redraws the marks chart after a mark changes.
         evaluateStudent(self, c): Opens a window to evaluate a student in the selected class.
+        buildEvaluateWindow(self, window): Creates the widgets of the evaluate window.
         updateMark(self, c, roll, subject, mark): Updates the student's mark in the selected class.
+        enterMarks(self, c): Opens the marks grid of a class.
+        buildMarksGridWindow(self, window): Creates the widgets of the marks grid window.
+        onMarksEdited(self, error): Shows a cell's error or the number of unsaved marks.
+        saveMarks(self): Saves every mark edited in the grid in one batch.
     """
 
-    def __init__(self, master, ctk, button_font, teacher_name, teacher_salary, accessed_class, teacher_id) -> None:
+    def __init__(self, master, ctk, button_font, teacher) -> None:
 
         """
         Initialize the TeacherAccount class.
@@ -48,19 +67,17 @@ class TeacherAccount:
             master (tk.Tk): The main window or parent widget.
             ctk (module): CustomTkinter module used for custom widgets.
             button_font (font): Font used for the buttons.
-            teacher_name (str): The name of the teacher.
-            teacher_salary (str): The salary of the teacher.
-            accessed_class (list): List of classes the teacher has access to.
-            teacher_id (str): The unique ID of the teacher.
+            teacher (Teacher): The teacher's record.
         """
 
         self.master = master
         self.ctk = ctk
         self.button_font = button_font
-        self.teacher_name = teacher_name
-        self.teacher_salary = teacher_salary
-        self.accessed_class = accessed_class
-        self.teacher_id = teacher_id
+        self.teacher = teacher
+        self.teacher_name = teacher.name
+        self.teacher_salary = teacher.salary
+        self.accessed_class = teacher.accessed_class
+        self.teacher_id = teacher.id
 
         self.font = ('Arial', 20, 'bold')
 
@@ -95,6 +112,7 @@ class TeacherAccount:
         # Placeholder for profile picture
         self.profile_picture_label = self.ctk.CTkLabel(self.profile_frame, text="No Image", font=('Arial', 20, 'bold'))
         self.profile_picture_label.place(relx=0.05, rely=0.01)
+        self.profile_loading = None
 
         # Load profile image if exists
         # self.load_teacher_profile_image(self.teacher_id) 
@@ -149,30 +167,48 @@ class TeacherAccount:
 
     def backToMain(self):
         '''
-        Destroys the current window and returns to the main menu
+        Destroys the current window and the account's windows, and returns to the main menu
         '''
-        for widget in self.teacher_frame.winfo_children():
-            widget.destroy()
-
+        self.class_loader.cancel()
+        if self.profile_loading is not None:
+            self.profile_loading.cancel()
+        self.master.windows.destroyAll()
+        # the menu frame is reused now, so this frame must go or it stays on top of it
+        self.teacher_frame.destroy()
         self.master.create_main_frame()
 
     def showAccessedClass(self):
         """
         Reads the classes.json file and displays buttons for the classes
-        the teacher has access to.
+        the teacher has access to. The file is read in a background thread and a
+        placeholder is shown until the buttons are in.
         """
-        try:
-            with open("classes.json", 'r') as f:
-                _data = json.load(f)
-                class_list = _data.get("classes",[])
+        self.loading_label = self.ctk.CTkLabel(self.teacher_frame, text="Loading classes...", text_color="white", font=self.button_font)
+        self.loading_label.pack(padx=10, pady=10)
 
-                for class_data in class_list:
-                    if class_data["class"] in self.accessed_class:
-                        self.addClassButton(class_data["class"])
-        except FileNotFoundError:
+        self.class_loader = BackgroundLoader(
+            self.master,
+            lambda: services.accessibleClasses(self.teacher),
+            self.addClassButton,
+            on_done=self.loading_label.destroy,
+            on_error=self.onClassesError
+        )
+        self.class_loader.start()
+
+    def onClassesError(self, error):
+        """
+        Reports a failure to read the classes and removes the placeholder.
+
+        Args:
+            error (Exception): The exception raised while reading the classes.
+        """
+        self.loading_label.destroy()
+        if isinstance(error, FileNotFoundError):
             showErrorMessage(message="Fatal Error!\nFile not found\nPerhaps it was deleted or restart the app")
-        except json.JSONDecodeError:
+        elif isinstance(error, json.JSONDecodeError):
             showErrorMessage(message="Error decoding classes\nRestart the app or pc")
+        else:
+            raise error
 
     def addClassButton(self, class_name):
         """
@@ -195,7 +231,8 @@ class TeacherAccount:
     
     def openClass(self, c, filename='classes.json'):
         """
-        Opens a window to display and see students in the selected class.
+        Opens a window to display and see students in the selected class. The window is
+        built once and shows whichever class was opened last.
 
         Args:
             c (str): The name of the class.
@@ -203,52 +240,24 @@ class TeacherAccount:
         """
         self.width = 1200
         self.height = 750
-
-        self.window = self.ctk.CTk()
-        self.window.resizable(False, False)
-        self.window.geometry(f"{self.width}x{self.height}")
-        self.window.title(f"Class : {c}")
-
-        # Display copyright claim
-        showCopyrightClaim(self.ctk, self.window)
-
-        self.display_frame = self.ctk.CTkScrollableFrame(
-            self.window,
-            width=1000,
-            height=600,
-            border_width=2,
-            border_color="white",
-            orientation='vertical'
+        self.open_class = c
+
+        self.master.windows.open(
+            "class",
+            self.buildClassWindow,
+            title=f"Class : {c}",
+            geometry=f"{self.width}x{self.height}",
+            resizable=False
         )
-        self.display_frame.place(relx=0.5, rely=0.5, anchor='center')
 
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-
-            class_data = None
-            for cls in data['classes']:
-                if cls['class'] == c:
-                    class_data = cls
-                    break
-            
+            class_data = services.getClass(c)
             if not class_data:
+                self.display_frame.setItems([])
                 raise ValueError("Class not found")
 
-            for student in class_data["students"]:
-                student_info = f"{student['Name']}      Roll: {student['Roll']}     ID:{student["ID"]}"
-                show_student = self.ctk.CTkButton(
-                    self.display_frame,
-                    width=950,
-                    height=50,
-                    text=student_info,
-                    font=self.button_font,
-                    fg_color='black',
-                    border_width=2,
-                    border_color='white'
-                )
-                show_student.pack(padx=10, pady=10)
-                                        
+            self.display_frame.setItems(class_data.students)
+
         except FileNotFoundError:
             showErrorMessage(message="classes.json not found.")
         except json.JSONDecodeError:
@@ -256,18 +265,80 @@ class TeacherAccount:
         except KeyError as e:
             showErrorMessage(message=f"Missing key in JSON data: {e}")
 
-        
+    def buildClassWindow(self, window):
+        """
+        Creates the widgets of the class window: the student list and the evaluate button.
+
+        Args:
+            window (CTkToplevel): The window to fill.
+        """
+        # Display copyright claim
+        showCopyrightClaim(self.ctk, window)
+
+        # only the rows in view exist; they are reused as the list scrolls
+        self.display_frame = VirtualList(
+            window,
+            self.ctk,
+            [],
+            lambda student: f"{student.name}      Roll: {student.roll}     ID:{student.id}",
+            self.button_font,
+            width=1000,
+            height=600,
+            command=self.showStudentMarks
+        )
+        self.display_frame.place(relx=0.5, rely=0.5, anchor='center')
+
          # give marks to student
-        self.mark_button = self.ctk.CTkButton(self.window, font=self.button_font, text="Evaluate", width=150, height=35, text_color='white', command = lambda: self.evaluateStudent(c))
-        self.mark_button.pack(side='bottom', pady=10)
+        self.mark_button = self.ctk.CTkButton(window, font=self.button_font, text="Evaluate", width=150, height=35, text_color='white', command = lambda: self.evaluateStudent(self.open_class))
+        self.mark_button.place(relx=0.4, rely=0.95, anchor='center')
+
+        # every student's marks at once
+        self.marks_grid_button = self.ctk.CTkButton(window, font=self.button_font, text="Enter Marks", width=150, height=35, text_color='white', command=lambda: self.enterMarks(self.open_class))
+        self.marks_grid_button.place(relx=0.6, rely=0.95, anchor='center')
 
-        # Bind the closing event to the on_closing function
-        self.window.protocol("WM_DELETE_WINDOW", self.onClosing)
-        self.window.mainloop()
 
-    def onClosing(self):
-        self.display_frame.destroy()
-        self.window.destroy()
+    def showStudentMarks(self, student):
+        """
+        Opens a window with the marks chart of a student clicked in the class window. The
+        window and its chart are reused; the bars are redrawn for each student.
+
+        Args:
+            student (Student): The student's record.
+        """
+        self.marks_student = student
+        self.master.windows.open(
+            "marks",
+            self.buildMarksWindow,
+            refresh=lambda window: self.marks_chart.setMarks(student.marks),
+            title=f"{student.name}  Roll: {student.roll}",
+            geometry="740x500",
+            resizable=False
+        )
+
+    def buildMarksWindow(self, window):
+        """
+        Creates the marks chart window.
+
+        Args:
+            window (CTkToplevel): The window to fill.
+        """
+        self.marks_chart = MarksChart(window, self.ctk, self.marks_student.marks, font=self.font, width=718, height=480)
+        self.marks_chart.place(relx=0.5, rely=0.5, anchor='center')
+
+    def refreshStudentMarks(self, c, roll):
+        """
+        Redraws the open marks chart if it shows the student whose mark was just changed.
+
+        Args:
+            c (str): The name of the class.
+            roll (str): The roll number of the student.
+        """
+        if not self.master.windows.isOpen("marks") or self.open_class != c or str(self.marks_student.roll) != str(roll):
+            return
+        student = services.findStudent(self.marks_student.id, c)
+        if student:
+            self.marks_student = student
+            self.marks_chart.setMarks(student.marks)
 
 
     def evaluateStudent(self, c):
@@ -279,30 +350,40 @@ class TeacherAccount:
         """
         _width = 450
         _height = 300
+        self.evaluated_class = c
+
+        self.master.windows.open(
+            "evaluate",
+            self.buildEvaluateWindow,
+            refresh=lambda window: clearEntries(self.roll_entry, self.subject_entry, self.mark_entry),
+            title=f"Evaluate for class{c}",
+            geometry=f"{_width}x{_height}"
+        )
 
-        self.screen = self.ctk.CTk()
-        self.screen.geometry(f"{_width}x{_height}")
-        self.screen.title(f"Evaluate for class{c}")
+    def buildEvaluateWindow(self, window):
+        """
+        Creates the widgets of the evaluate window.
 
-        _roll_label = self.ctk.CTkLabel(self.screen, text="Roll:  ", font=self.font, text_color="white")
+        Args:
+            window (CTkToplevel): The window to fill.
+        """
+        _roll_label = self.ctk.CTkLabel(window, text="Roll:  ", font=self.font, text_color="white")
         _roll_label.place(relx=0.1, rely=0.1)
-        _subject_label = self.ctk.CTkLabel(self.screen, text="Subject: ", font=self.font, text_color="white") 
+        _subject_label = self.ctk.CTkLabel(window, text="Subject: ", font=self.font, text_color="white") 
         _subject_label.place(relx=0.1, rely=0.3)
-        _mark_label = self.ctk.CTkLabel(self.screen, text="Mark: ", font=self.font, text_color="white")
+        _mark_label = self.ctk.CTkLabel(window, text="Mark: ", font=self.font, text_color="white")
         _mark_label.place(relx=0.1, rely=0.5)
 
-        _roll_entry = self.ctk.CTkEntry(self.screen, width=250, font=self.button_font, placeholder_text = "Enter student's roll")
-        _roll_entry.place(relx=0.3, rely=0.1)
-        _subject_entry = self.ctk.CTkEntry(self.screen, width=250, font=self.button_font, placeholder_text = "Enter Subject Name")
-        _subject_entry.place(relx=0.3, rely=0.3)
-        _mark_entry = self.ctk.CTkEntry(self.screen, width=250, font=self.button_font, placeholder_text = "Give appropriate marks")
-        _mark_entry.place(relx=0.3, rely=0.5)
+        self.roll_entry = self.ctk.CTkEntry(window, width=250, font=self.button_font, placeholder_text = "Enter student's roll")
+        self.roll_entry.place(relx=0.3, rely=0.1)
+        self.subject_entry = self.ctk.CTkEntry(window, width=250, font=self.button_font, placeholder_text = "Enter Subject Name")
+        self.subject_entry.place(relx=0.3, rely=0.3)
+        self.mark_entry = self.ctk.CTkEntry(window, width=250, font=self.button_font, placeholder_text = "Give appropriate marks")
+        self.mark_entry.place(relx=0.3, rely=0.5)
 
-        _confirm_button = self.ctk.CTkButton(self.screen, font=self.button_font, text="Confirm", width=150, height=35, text_color='white', command=lambda: self.updateMark(c=c, roll=_roll_entry.get(), subject=_subject_entry.get(), mark=_mark_entry.get()))
+        _confirm_button = self.ctk.CTkButton(window, font=self.button_font, text="Confirm", width=150, height=35, text_color='white', command=lambda: self.updateMark(c=self.evaluated_class, roll=self.roll_entry.get(), subject=self.subject_entry.get(), mark=self.mark_entry.get()))
         _confirm_button.place(relx=0.5, rely=0.7, anchor='center')
 
-        self.screen.mainloop()
-
     def updateMark(self, c, roll, subject, mark):
         """
         Updates the student's mark in the selected class.
@@ -313,37 +394,116 @@ class TeacherAccount:
             subject (str): The subject for which the mark is being updated.
             mark (str): The mark to be updated.
         """
-        _filename = "classes.json"
         try:
-            with open(_filename , 'r') as f:
-                data = json.load(f)
-
-            _class = next((cls for cls in data['classes'] if cls['class'] == c), None)
-            if not _class:
-                showErrorMessage(message=f"Class {c} not found")
-                raise ValueError(f"Class {c} not found")
-
-            _student = next((student for student in _class['students'] if student['Roll'] == roll), None)
-            if not _student:
-                showErrorMessage(message=f"Roll: {roll} not found")
-                raise ValueError(f"Roll: {roll} not found")
-
-            if subject not in _student['Marks']:
-                showErrorMessage(message=f"{subject} not found\nWrite subject name in Pascal case")
-                raise ValueError(f"{subject} not found")
-                
-            # increment marks of specific subject
-            _student['Marks'][subject] += int(mark)
-
-            # save the updated data back to the file 
-            with open(_filename, 'w') as f:
-                json.dump(data, f, indent=4)
-            self.screen.destroy()
+            services.updateMark(c, roll, subject, mark)
+            self.master.windows.close("evaluate")
+            self.refreshStudentMarks(c, roll)
+
+        except ValueError as e:
+            showErrorMessage(message=f"{e}")
+            self.master.windows.close("evaluate")
 
         except Exception as e:
             showErrorMessage(message=f"something went wrong\n{e}")
-            self.screen.destroy()
+            self.master.windows.close("evaluate")
 
 
         
 
+
+    def enterMarks(self, c):
+        """
+        Opens the marks grid of a class: a row per student and a column per subject, saved
+        together with one write. The window is built once; unsaved marks of the class shown
+        are kept when it is closed and opened again.
+
+        Args:
+            c (str): The name of the class.
+        """
+        self.marks_sheet_class = c
+        self.master.windows.open(
+            "marks_grid",
+            self.buildMarksGridWindow,
+            title=f"Marks : {c}",
+            geometry="1150x700",
+            resizable=False
+        )
+
+        sheet = self.marks_grid.sheet
+        if sheet.class_name == c and sheet.dirtyCount():
+            self.marks_grid.focusCell(self.marks_grid.row, self.marks_grid.column, commit=False)
+            return
+        if sheet.dirtyCount() and not messagebox.askyesno("Unsaved marks", f"Discard {sheet.dirtyCount()} unsaved marks of class {sheet.class_name}?"):
+            # keep showing the class whose marks are not saved yet
+            self.marks_sheet_class = sheet.class_name
+            self.master.windows.get("marks_grid").title(f"Marks : {sheet.class_name}")
+            return
+
+        try:
+            self.marks_grid.setSheet(MarksSheet(c, services.classStudents(c)))
+            self.onMarksEdited(None)
+        except FileNotFoundError:
+            showErrorMessage(message="classes.json not found.")
+        except json.JSONDecodeError:
+            showErrorMessage(message="Error decoding JSON from classes.json.")
+        except ValueError as e:
+            showErrorMessage(message=f"{e}")
+
+    def buildMarksGridWindow(self, window):
+        """
+        Creates the widgets of the marks grid window.
+
+        Args:
+            window (CTkToplevel): The window to fill.
+        """
+        self.marks_grid = MarksGrid(
+            window,
+            self.ctk,
+            MarksSheet(self.marks_sheet_class, []),
+            ('Arial', 16),
+            width=1100,
+            height=580,
+            on_change=self.onMarksEdited,
+            on_save=self.saveMarks
+        )
+        self.marks_grid.place(relx=0.5, rely=0.44, anchor='center')
+
+        self.marks_status = self.ctk.CTkLabel(window, text="", font=('Arial', 14), text_color="white")
+        self.marks_status.place(relx=0.05, rely=0.9)
+        _save_button = self.ctk.CTkButton(window, font=self.button_font, text="Save", width=150, height=35, text_color='white', command=self.saveMarks)
+        _save_button.place(relx=0.85, rely=0.93, anchor='center')
+
+    def onMarksEdited(self, error):
+        """
+        Shows the error of the cell just edited, or else how many marks are unsaved.
+
+        Args:
+            error (str): The cell's error message, or None.
+        """
+        sheet = self.marks_grid.sheet
+        if error:
+            self.marks_status.configure(text=error, text_color="red")
+        elif sheet.errors:
+            self.marks_status.configure(text=f"{len(sheet.errors)} marks to fix before saving", text_color="red")
+        else:
+            self.marks_status.configure(text=f"{sheet.dirtyCount()} unsaved marks    Enter: next student   Tab: next subject   Ctrl+S: save", text_color="white")
+
+    def saveMarks(self):
+        """
+        Saves every mark edited in the grid in one batch and redraws an open marks chart.
+        """
+        self.marks_grid.commitEditor()
+        sheet = self.marks_grid.sheet
+        try:
+            saved = sheet.save()
+        except FileNotFoundError:
+            showErrorMessage(message="classes.json not found.")
+            return
+        except ValueError as e:
+            self.marks_status.configure(text=f"{e}".replace("\n", " "), text_color="red")
+            return
+
+        self.marks_grid.redraw()
+        self.marks_status.configure(text=f"Saved {saved} marks", text_color="white")
+        if self.master.windows.isOpen("marks") and self.open_class == sheet.class_name:
+            self.refreshStudentMarks(sheet.class_name, self.marks_student.roll)
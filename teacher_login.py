@@ -1,13 +1,14 @@
 from functions import showCopyrightClaim, showErrorMessage
 import json
-from teacher_account import TeacherAccount
+import services
+from screen_manager import Screen
 
-class TeacherLogin:
+class TeacherLogin(Screen):
 
     '''
     The StudentLogin class handles the creation and management of the student login interface.
     It provides fucntinalities for teachers to log in by providing their teaher's id and navigate
-    back to the menu using back button
+    back to the menu using back button. The App's ScreenManager shows and hides it.
 
     Attributes:
         master(tk.Tk): The main window or parent widget.
@@ -23,7 +24,7 @@ class TeacherLogin:
 
     Methods:
         __init__(self, master, ctk, buttonFont): Initializes the TeacherLogin class and sets up the gui elements.
-        backToMain(self): Destroys the current window and returns to the main frame.
+        backToMain(self): Hides the login frame and returns to the main frame.
 
     '''
 
@@ -42,7 +43,6 @@ class TeacherLogin:
 
         # Create login frame
         self.login_frame = self.ctk.CTkFrame(self.master, width=800, height=500, border_width=2, border_color="white")
-        self.login_frame.place(relx=0.5, rely=0.5, anchor="center")
 
         # copyright claim 
         showCopyrightClaim(self.ctk, self.login_frame)
@@ -100,48 +100,39 @@ class TeacherLogin:
         )
         self.login_button.place(relx=0.6, rely=0.6)
 
+        super().__init__(self.login_frame, (self.id_entry,))
 
 
     def backToMain(self):
         '''
-        Destroys the current window and returns to the main menu
+        Hides the login frame and returns to the main menu
         '''
-        self.login_frame.destroy()
         self.master.create_main_frame()
 
-    def openTeacherAccount(self, teacher_name, teacher_salary, accessed_class, teacher_id):
-        self.teacher_name = teacher_name
-        self.teacher_salary = teacher_salary
-        self.accessed_class = accessed_class
-        self.teacher_id = teacher_id
+    def openTeacherAccount(self, teacher):
+        from teacher_account import TeacherAccount
 
-        self.login_frame.destroy()
-        TeacherAccount(self.master, self.ctk, self.button_font, self.teacher_name, self.teacher_salary, self.accessed_class, self.teacher_id)
+        self.teacher = teacher
+
+        self.master.screens.hideCurrent()
+        TeacherAccount(self.master, self.ctk, self.button_font, teacher)
 
 
     def authenticateTeacherLogin(self):
         teacher_id = self.id_entry.get()
 
         try:
-            with open("teachers.json", 'r') as f:
-                data = json.load(f)
-
-            # find teacher id 
-            teacher_data = next((teacher for teacher in data["teachers"] if teacher["id"] == teacher_id), None)
-            if not teacher_data:
-                showErrorMessage(f"ID {teacher_id} not found")
-                return
-            
-            # extract teahcer data 
-            teacher_name = teacher_data["Name"]
-            teacher_salary = teacher_data["Salary"]
-            accessed_class = teacher_data["accessed class"]
-
-            self.openTeacherAccount(teacher_name, teacher_salary, accessed_class, teacher_id)
-
+            teacher_data = services.loginTeacher(teacher_id)
         except FileNotFoundError:
             showErrorMessage("File doesn't exist")
+            return
         except json.JSONDecodeError:
             showErrorMessage("Error reading the json file")
+            return
+        except ValueError as e:
+            showErrorMessage(f"{e}")
+            return
+
+        self.openTeacherAccount(teacher_data)
 
 
@@ -0,0 +1,293 @@
+'''
+Profile picture thumbnails.
+
+Account screens show profile pictures at 200x200. Decoding a multi-megabyte photo and
+resizing it with LANCZOS every time a screen opens is most of the screen's open time, so
+the resized picture is saved once as a small PNG under thumbnail_directory and the
+PhotoImages built from those are kept in a small in-memory LRU.
+
+Decoding and resizing run in a small thread pool (Pillow releases the GIL while it
+works), and only the final PhotoImage is built on the Tk thread. Many pictures are
+thumbnailed at once by makeThumbnails, in a process pool with one worker per core; the
+`python -m cli thumbnails` command runs it.
+'''
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from glob import escape, glob
+
+from PIL import Image, ImageTk
+
+from settings import getSetting
+
+
+PROFILE_SIZE = (200, 200)
+
+
+class ThumbnailCache:
+    '''
+    Two-level cache of resized pictures.
+
+    A thumbnail file is named after the source's path, and its modification time and size,
+    so replacing a photo with a new one at the same path makes a new thumbnail; the stale
+    one is deleted when the new one is written.
+
+    Attributes:
+        directory (str): Where thumbnail files are kept.
+        capacity (int): Most PhotoImages kept in memory.
+        memory_hits (int): Pictures served from memory.
+        disk_hits (int): Pictures read from a thumbnail file, without touching the original.
+        misses (int): Pictures decoded from the original, resized and saved.
+
+    Methods:
+        photo(self, path, size=PROFILE_SIZE): Returns a PhotoImage of the picture at path.
+        photoAsync(self, widget, path, callback, size=PROFILE_SIZE): Builds the PhotoImage off the Tk thread and calls callback with it.
+        pixels(self, path, size=PROFILE_SIZE): Returns the thumbnail's (mode, size, bytes).
+        thumbnailPath(self, path, size=PROFILE_SIZE): Returns the thumbnail file for path, creating it if needed.
+        clear(self): Drops the in-memory images.
+        stats(self): Returns hit and miss counts.
+    '''
+
+    def __init__(self, directory, capacity=16, workers=2):
+        self.directory = directory
+        self.capacity = max(1, capacity)
+        self.workers = workers
+        self._pool = None
+        self._photos = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _names(self, path, size):
+        '''Returns (prefix shared by every thumbnail of path at size, this version's file name).'''
+        stat = os.stat(path)
+        digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:20]
+        prefix = f"{digest}-{size[0]}x{size[1]}-"
+        return prefix, f"{prefix}{stat.st_mtime_ns}-{stat.st_size}.png"
+
+    def thumbnailPath(self, path, size=PROFILE_SIZE):
+        '''
+        Returns the thumbnail file of the picture at path, resizing the original only if
+        there is no thumbnail of its current version yet.
+
+        Raises:
+            FileNotFoundError: If the picture does not exist.
+        '''
+        prefix, name = self._names(path, size)
+        thumbnail = os.path.join(self.directory, name)
+        if os.path.exists(thumbnail):
+            with self._lock:
+                self.disk_hits += 1
+            return thumbnail
+
+        with self._lock:
+            self.misses += 1
+        with Image.open(path) as original:
+            image = original.resize(size, Image.Resampling.LANCZOS)
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                image.save(f, format="PNG")
+            os.replace(temp_path, thumbnail)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        # thumbnails of earlier versions of the same picture
+        for stale in glob(os.path.join(escape(self.directory), escape(prefix) + "*.png")):
+            if stale != thumbnail:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+        return thumbnail
+
+    def photo(self, path, size=PROFILE_SIZE):
+        '''
+        Returns a PhotoImage of the picture at path, resized to size. Must be called from
+        the Tk thread, after the App window exists.
+
+        Raises:
+            FileNotFoundError: If the picture does not exist.
+        '''
+        _prefix, name = self._names(path, size)
+        with self._lock:
+            photo = self._photos.get(name)
+            if photo is not None:
+                self._photos.move_to_end(name)
+                self.memory_hits += 1
+                return photo
+
+        thumbnail = self.thumbnailPath(path, size)
+        with Image.open(thumbnail) as image:
+            photo = ImageTk.PhotoImage(image)
+        self._remember(name, photo)
+        return photo
+
+    def _remember(self, name, photo):
+        with self._lock:
+            self._photos[name] = photo
+            while len(self._photos) > self.capacity:
+                self._photos.popitem(last=False)
+
+    def pixels(self, path, size=PROFILE_SIZE):
+        '''
+        Returns the decoded thumbnail of the picture at path as (mode, size, bytes), making
+        the thumbnail first if needed. Safe to call from any thread.
+        '''
+        with Image.open(self.thumbnailPath(path, size)) as image:
+            image.load()
+            return image.mode, image.size, image.tobytes()
+
+    def photoAsync(self, widget, path, callback, size=PROFILE_SIZE):
+        '''
+        Like photo(), but decoding and resizing run in the cache's thread pool so the Tk
+        thread never waits on them. The pool's result is collected with widget.after() and
+        callback(photo) runs on the Tk thread. A picture already in memory is passed to
+        callback at once.
+
+        Args:
+            widget (tk.Misc): Widget whose after() polls for the result; the App window is safest.
+            path (str): The picture.
+            callback (callable): Called with the PhotoImage on the Tk thread.
+            size (tuple): Thumbnail size.
+
+        Returns:
+            PendingPhoto: Cancel it when the screen that asked for the picture goes away.
+        '''
+        pending = PendingPhoto(widget)
+        try:
+            _prefix, name = self._names(path, size)
+        except OSError as e:
+            print(f"Cannot read {path}: {e}")
+            return pending
+        with self._lock:
+            photo = self._photos.get(name)
+            if photo is not None:
+                self._photos.move_to_end(name)
+                self.memory_hits += 1
+        if photo is not None:
+            callback(photo)
+            return pending
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumbnails")
+            future = self._pool.submit(self.pixels, path, size)
+
+        def finish():
+            try:
+                mode, image_size, data = future.result()
+            except (OSError, ValueError) as e:
+                print(f"Cannot read {path}: {e}")
+                return
+            photo = ImageTk.PhotoImage(Image.frombytes(mode, image_size, data))
+            self._remember(name, photo)
+            callback(photo)
+
+        pending.wait(future, finish)
+        return pending
+
+    def clear(self):
+        with self._lock:
+            self._photos.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"memory_hits": self.memory_hits, "disk_hits": self.disk_hits, "misses": self.misses, "in_memory": len(self._photos)}
+
+
+class PendingPhoto:
+    '''
+    A picture being decoded for the Tk thread by ThumbnailCache.photoAsync.
+
+    Methods:
+        cancel(self): Drops the picture; its callback will not run.
+    '''
+
+    POLL_INTERVAL = 16
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.cancelled = False
+        self._future = None
+        self._after_id = None
+
+    def wait(self, future, finish):
+        self._future = future
+        self._finish = finish
+        self._after_id = self.widget.after(self.POLL_INTERVAL, self._poll)
+
+    def _poll(self):
+        self._after_id = None
+        if self.cancelled:
+            return
+        if not self._future.done():
+            self._after_id = self.widget.after(self.POLL_INTERVAL, self._poll)
+            return
+        self._finish()
+
+    def cancel(self):
+        self.cancelled = True
+        if self._future is not None:
+            self._future.cancel()
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+
+def _makeThumbnail(directory, path, size):
+    '''Process pool entry point of makeThumbnails.'''
+    return ThumbnailCache(directory).thumbnailPath(path, size)
+
+
+def makeThumbnails(paths, size=PROFILE_SIZE, directory=None, processes=None):
+    '''
+    Thumbnails many pictures at once, e.g. a folder of student photos, with one worker
+    process per core. Pictures that already have a current thumbnail are not decoded.
+
+    Args:
+        paths (iterable): The pictures.
+        size (tuple): Thumbnail size.
+        directory (str): Where to put the thumbnails. Defaults to the thumbnail_directory setting.
+        processes (int): Worker processes. Defaults to the number of cores.
+
+    Returns:
+        tuple: ({path: thumbnail file}, {path: error message}) for the pictures that worked and the ones that did not.
+    '''
+    directory = directory if directory is not None else getSetting("thumbnail_directory")
+    paths = list(dict.fromkeys(paths))
+    thumbnails, errors = {}, {}
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [(path, pool.submit(_makeThumbnail, directory, path, size)) for path in paths]
+        for path, future in futures:
+            try:
+                thumbnails[path] = future.result()
+            except (OSError, ValueError) as e:
+                errors[path] = str(e)
+    return thumbnails, errors
+
+
+_thumbnails = None
+_thumbnails_lock = threading.Lock()
+
+
+def getThumbnailCache():
+    '''
+    Returns the process-wide thumbnail cache, set up from the "thumbnail_directory" and
+    "thumbnail_memory_cache" settings.
+    '''
+    global _thumbnails
+    with _thumbnails_lock:
+        if _thumbnails is None:
+            _thumbnails = ThumbnailCache(getSetting("thumbnail_directory"), getSetting("thumbnail_memory_cache"))
+        return _thumbnails
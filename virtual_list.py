@@ -0,0 +1,196 @@
+import math
+
+
+class VirtualList:
+    '''
+    A scrolling list of buttons, one per item, that only creates the buttons which fit in
+    the viewport plus a few spare ones. Scrolling moves those buttons and gives a button
+    that left the viewport the text of the item coming into it, so opening a class of
+    2,000 students creates as many widgets as opening a class of 20.
+
+    The rows look like the buttons the class windows used to pack into a
+    CTkScrollableFrame: row_width x row_height with spacing above and below.
+
+    Attributes:
+        ctk (module): CustomTkinter module used for custom widgets.
+        items (list): The items shown, in order.
+        format_row (callable): Returns the text of an item's row.
+        command (callable): Called with the item whose row was clicked, or None.
+        offset (int): Pixels scrolled from the top.
+        frame (CTkFrame): Outer frame; place it like any widget.
+        viewport (CTkFrame): Frame the rows are placed in; it clips rows scrolled half out.
+        scrollbar (CTkScrollbar): The vertical scrollbar.
+        rows (list): The pooled CTkButtons.
+
+    Methods:
+        place(self, **kwargs): Places the list in its master.
+        destroy(self): Destroys the list and its rows.
+        setItems(self, items): Shows a new list of items and scrolls back to the top.
+        scrollTo(self, index): Scrolls so the item at index is the first one shown.
+        visibleRange(self): Returns the range of item indexes that have a row on screen.
+    '''
+
+    SCROLLBAR_WIDTH = 16
+    BORDER_WIDTH = 2
+
+    def __init__(self, master, ctk, items, format_row, font, width=1000, height=600, row_width=950, row_height=50,
+                 spacing=10, buffer=2, command=None, scroll_step=35):
+        '''
+        Args:
+            master (widget): The parent widget.
+            ctk (module): CustomTkinter module used for custom widgets.
+            items (list): The items to show.
+            format_row (callable): Returns the text of an item's row.
+            font (font): Font used for the rows.
+            width (int): Width of the list, scrollbar included.
+            height (int): Height of the list.
+            row_width (int): Width of each row.
+            row_height (int): Height of each row.
+            spacing (int): Space above and below each row.
+            buffer (int): Rows kept beyond the ones that fit in the viewport.
+            command (callable): Called with the clicked row's item.
+            scroll_step (int): Pixels scrolled per mouse wheel notch or scrollbar unit.
+        '''
+        self.ctk = ctk
+        self.items = list(items)
+        self.format_row = format_row
+        self.command = command
+        self.font = font
+        self.row_width = row_width
+        self.row_height = row_height
+        self.spacing = spacing
+        self.stride = row_height + 2 * spacing
+        self.scroll_step = scroll_step
+        self.offset = 0
+
+        self.frame = self.ctk.CTkFrame(master, width=width, height=height, border_width=self.BORDER_WIDTH, border_color="white")
+
+        self.view_width = width - 2 * self.BORDER_WIDTH - self.SCROLLBAR_WIDTH
+        self.view_height = height - 2 * self.BORDER_WIDTH
+        self.viewport = self.ctk.CTkFrame(self.frame, width=self.view_width, height=self.view_height, corner_radius=0, fg_color="transparent")
+        self.viewport.place(x=self.BORDER_WIDTH, y=self.BORDER_WIDTH)
+
+        self.scrollbar = self.ctk.CTkScrollbar(self.frame, height=self.view_height, command=self.onScrollbar)
+        self.scrollbar.place(x=self.BORDER_WIDTH + self.view_width, y=self.BORDER_WIDTH)
+
+        # a row partly scrolled out at the top and one partly in at the bottom, plus the buffer
+        self.pool_size = math.ceil(self.view_height / self.stride) + 1 + buffer
+        self.rows = []
+        self.row_items = []  # index of the item each pooled row shows, or None
+
+        for widget in (self.frame, self.viewport):
+            self._bindWheel(widget)
+
+        self._render()
+
+    def _bindWheel(self, widget):
+        widget.bind("<MouseWheel>", self.onMouseWheel)
+        # X11 reports the wheel as buttons 4 and 5
+        widget.bind("<Button-4>", self.onMouseWheel)
+        widget.bind("<Button-5>", self.onMouseWheel)
+
+    def place(self, **kwargs):
+        self.frame.place(**kwargs)
+
+    def destroy(self):
+        self.frame.destroy()
+        self.rows = []
+        self.row_items = []
+
+    def setItems(self, items):
+        self.items = list(items)
+        self.offset = 0
+        # -1: still placed, but showing an item of the old list
+        self.row_items = [-1 if index is not None else None for index in self.row_items]
+        self._render()
+
+    def scrollTo(self, index):
+        self._scrollToOffset(index * self.stride)
+
+    def _totalHeight(self):
+        return len(self.items) * self.stride
+
+    def _scrollToOffset(self, offset):
+        offset = max(0, min(int(offset), self._totalHeight() - self.view_height))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def visibleRange(self):
+        first = self.offset // self.stride
+        last = min(len(self.items), first + self.pool_size)
+        return range(first, last)
+
+    def _row(self, slot):
+        while len(self.rows) <= slot:
+            row = self.ctk.CTkButton(
+                self.viewport,
+                width=self.row_width,
+                height=self.row_height,
+                text="",
+                font=self.font,
+                fg_color='black',
+                border_width=2,
+                border_color='white',
+                command=lambda slot=len(self.rows): self._onRowClicked(slot)
+            )
+            self._bindWheel(row)
+            self.rows.append(row)
+            self.row_items.append(None)
+        return self.rows[slot]
+
+    def _render(self):
+        '''
+        Puts item i in pooled row i % pool_size. Scrolling by one row therefore changes the
+        text of a single button; the others only move.
+        '''
+        shown = set()
+        x = (self.view_width - self.row_width) // 2
+        for index in self.visibleRange():
+            slot = index % self.pool_size
+            row = self._row(slot)
+            if self.row_items[slot] != index:
+                row.configure(text=self.format_row(self.items[index]))
+                self.row_items[slot] = index
+            row.place(x=x, y=index * self.stride + self.spacing - self.offset)
+            shown.add(slot)
+
+        for slot, row in enumerate(self.rows):
+            if slot not in shown and self.row_items[slot] is not None:
+                row.place_forget()
+                self.row_items[slot] = None
+
+        total = self._totalHeight()
+        if total <= self.view_height:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.view_height) / total)
+
+    def _onRowClicked(self, slot):
+        index = self.row_items[slot]
+        if self.command is not None and index is not None:
+            self.command(self.items[index])
+
+    def onScrollbar(self, action, value, unit=None):
+        '''
+        Scrollbar callback, with the arguments of a tkinter yscrollcommand:
+        ("moveto", fraction) or ("scroll", count, "units" or "pages").
+        '''
+        if action == "moveto":
+            self._scrollToOffset(float(value) * self._totalHeight())
+        elif action == "scroll":
+            step = self.view_height if unit == "pages" else self.scroll_step
+            self._scrollToOffset(self.offset + int(value) * step)
+
+    def onMouseWheel(self, event):
+        if event.num == 4:
+            notches = -1
+        elif event.num == 5:
+            notches = 1
+        elif abs(event.delta) >= 120:
+            # Windows: multiples of 120 per notch
+            notches = -event.delta // 120
+        else:
+            # macOS: small deltas
+            notches = -event.delta
+        self._scrollToOffset(self.offset + notches * self.scroll_step)
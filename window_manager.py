@@ -0,0 +1,128 @@
+class WindowManager:
+    '''
+    Opens the app's dialogs (create class, create teacher, class list, evaluate) as
+    CTkToplevel windows of the one App root, instead of a new CTk root with its own Tcl
+    interpreter and mainloop per dialog.
+
+    A dialog is built the first time it is opened. Closing it only withdraws the window;
+    opening it again calls its refresh callback and shows the same window, so opening and
+    closing a dialog a hundred times builds its widgets once.
+
+    Attributes:
+        root (tk.Tk): The App window every dialog belongs to.
+        ctk (module): CustomTkinter module used for custom widgets.
+
+    Methods:
+        open(self, key, build, refresh=None, title="", geometry=None, resizable=True): Shows a dialog, building it on first use.
+        close(self, key): Withdraws a dialog so it can be opened again.
+        get(self, key): Returns the dialog's window if it is built, else None.
+        isOpen(self, key): True if the dialog is on screen.
+        destroy(self, key): Destroys a dialog.
+        destroyAll(self): Destroys every dialog, e.g. when the account that built them logs out.
+        openCount(self): Number of dialogs on screen.
+        widgetCount(self): Number of widgets alive under the root, dialogs included.
+        stats(self): Returns window and widget counts.
+    '''
+
+    def __init__(self, root, ctk):
+        '''
+        Args:
+            root (tk.Tk): The App window.
+            ctk (module): CustomTkinter module used for custom widgets.
+        '''
+        self.root = root
+        self.ctk = ctk
+        self._windows = {}
+        self._created = 0
+        self._reused = 0
+
+    def open(self, key, build, refresh=None, title="", geometry=None, resizable=True):
+        '''
+        Shows the dialog called key. The first time, a CTkToplevel is created and build(window)
+        fills it; afterwards refresh(window), if given, brings the kept widgets up to date.
+
+        Args:
+            key (str): The dialog's name.
+            build (callable): Creates the dialog's widgets in the window it is given.
+            refresh (callable): Called with the window each time a kept dialog is opened again.
+            title (str): Window title, set on every open.
+            geometry (str): Window size, e.g. "400x500".
+            resizable (bool): Whether the user can resize the window.
+
+        Returns:
+            CTkToplevel: The dialog's window.
+        '''
+        window = self.get(key)
+        if window is None:
+            window = self.ctk.CTkToplevel(self.root)
+            if geometry:
+                window.geometry(geometry)
+            window.resizable(resizable, resizable)
+            window.protocol("WM_DELETE_WINDOW", lambda: self.close(key))
+            self._windows[key] = window
+            self._created += 1
+            window.title(title)
+            build(window)
+        else:
+            self._reused += 1
+            window.title(title)
+            if refresh is not None:
+                refresh(window)
+            window.deiconify()
+        window.lift()
+        window.focus()
+        return window
+
+    def close(self, key):
+        window = self.get(key)
+        if window is not None:
+            window.withdraw()
+
+    def get(self, key):
+        window = self._windows.get(key)
+        if window is not None and not window.winfo_exists():
+            # destroyed behind our back, e.g. with its parent
+            del self._windows[key]
+            return None
+        return window
+
+    def destroy(self, key):
+        window = self._windows.pop(key, None)
+        if window is not None and window.winfo_exists():
+            window.destroy()
+
+    def destroyAll(self):
+        for key in list(self._windows):
+            self.destroy(key)
+
+    def isOpen(self, key):
+        window = self.get(key)
+        return window is not None and window.state() != "withdrawn"
+
+    def openCount(self):
+        return sum(1 for key in list(self._windows) if self.isOpen(key))
+
+    def widgetCount(self):
+        count = 0
+        pending = [self.root]
+        while pending:
+            widget = pending.pop()
+            count += 1
+            pending.extend(widget.winfo_children())
+        return count
+
+    def stats(self):
+        '''
+        Returns:
+            dict: "open" (dialogs on screen), "kept" (dialogs built, shown or withdrawn),
+            "created" and "reused" (opens that built a dialog or showed a kept one), and
+            "widgets" (widgets alive under the root).
+        '''
+        kept = sum(1 for key in list(self._windows) if self.get(key) is not None)
+        return {
+            "open": self.openCount(),
+            "kept": kept,
+            "created": self._created,
+            "reused": self._reused,
+            "widgets": self.widgetCount(),
+        }